@@ -72,3 +72,21 @@ class GRULegacy(nn.Module):
         out = self.classes(out)
         out = self.relu(out)
         return out, h_t1
+
+
+def load_model(model_path, device=None):
+    """加载 model.pt 并返回可直接推理的模型
+
+    model.pt 是整体 pickle 的模块，类名为 GRU 但属性沿用旧名（lstm/relu/classes），
+    直接调用 GRU.forward 会找不到属性，因此这里按属性名迁移到 GRULegacy。
+    """
+    model = torch.load(model_path, map_location='cpu', weights_only=False)
+    if isinstance(model, GRU) and 'lstm' in model._modules:
+        legacy = GRULegacy(model.in_dim, model.hidden_dim, model.num_layer,
+                           model.classes[0].out_features)
+        legacy.load_state_dict(model.state_dict())
+        model = legacy
+    model.eval()
+    if device is not None:
+        model = model.to(device)
+    return model
@@ -1,3 +1,4 @@
+import os
 import sys
 
 from PyQt5.QtWidgets import QApplication
@@ -5,6 +6,8 @@ from PyQt5.QtWidgets import QApplication
 from interface import Window
 from process import Identify
 from client import Client
+from metrics import MetricsServer
+from startup import Startup
 
 
 class App:
@@ -13,10 +16,19 @@ class App:
         self.win = Window(self)
         self.win.show()
         self.identify = Identify(self.win)
+        self.win.init_power_menu(self.identify.governor)
+        # 窗口显示后在后台并行加载模型与手部检测器，进度显示在状态栏
+        self.startup = Startup(self.identify, self.win.progress.emit)
         self.client = Client(self)
+        # 本机指标端点，METRICS_PORT=0 时关闭
+        port = int(os.getenv("METRICS_PORT", "9108"))
+        self.metrics_server = MetricsServer(self.identify.metrics, port=port) if port else None
 
     def run(self):
+        self.startup.start()
         self.client.start()
+        if self.metrics_server:
+            self.metrics_server.start()
         sys.exit(self.qapp.exec_())
 
     def cleanup(self):
@@ -0,0 +1,326 @@
+"""基于 asyncio 的会议服务端
+
+所有连接在同一个事件循环中处理，不再为每个连接创建线程：每个连接只是一个
+asyncio.Protocol 对象，收到数据时按行拆分并处理，发送通过 transport 写缓冲区完成。
+协议与 server_offline.py 相同：
+- 握手：第一行 receiver / controller，第二行用户名；
+- command <手势>：控制者的指令，转发给所有接收者；
+- exchange_control / switch_control：获取或交出控制权、开始或暂停控制；
+- ping：回复 pong；
+- protocol 2：协商改用 protocol.py 的二进制帧，回复 protocol 消息后向该连接发送二进制帧。
+消息统一由 protocol.MessageBuffer 解析为 Message，文本行与二进制帧可以混合出现。
+已加入的连接由 members.Members 按用户名与角色索引，查找与控制权交接不遍历全部成员。
+
+发送：每个连接有一个有界的发送队列，由该连接自己的写出逻辑排空。transport 写缓冲超过
+高水位时事件循环调用 pause_writing()，消息暂存在队列中，resume_writing() 后继续写出，
+网络差的接收者只会积压自己的队列，不会拖慢其他人的指令。广播按文本 / 二进制各编码一次，
+同一份 bytes 按引用放入所有接收者的队列。队列中较旧的 member_list 会被新的取代；
+队列仍满时按 overflow 策略处理：evict 断开该客户端；drop_oldest 丢弃最旧的一条可丢弃消息
+（DROPPABLE，如 pong），指令与控制权变更从不丢弃，队列里全是这类消息时同样断开该客户端。
+stats() 汇总每个连接的队列深度与丢弃数。
+独立运行的 server.py 与 client.Client.start_server 启动的本机服务端都使用它。
+"""
+import asyncio
+import os
+import threading
+from collections import deque
+
+from linereader import LineTooLong
+from members import Members
+from protocol import VERSION, MessageBuffer, encode
+
+SERVER_HOST = '0.0.0.0'
+SERVER_PORT = 12345
+BACKLOG = int(os.getenv("SERVER_BACKLOG", "1024"))  # listen 等待队列长度，大型会议同时加入时需要足够大
+QUEUE_SIZE = int(os.getenv("SERVER_QUEUE_SIZE", "256"))  # 每个连接最多积压的消息数
+WRITE_BUFFER_HIGH = 64 * 1024  # transport 写缓冲的高水位，超过后消息留在发送队列中
+OVERFLOW_POLICIES = ('evict', 'drop_oldest')
+REPLACEABLE = frozenset(['member_list'])  # 新消息携带完整状态，可取代队列中未发出的旧消息
+DROPPABLE = frozenset(['pong'])  # 丢失后客户端不受影响，drop_oldest 策略下队列满时只丢弃这类消息
+
+
+class ClientProtocol(asyncio.Protocol):
+    """一个客户端连接"""
+
+    def __init__(self, server):
+        self.server = server
+        self.transport = None
+        self.addr = None
+        self.type = 'unknown'
+        self.name = ''
+        self.controlling = False
+        self.joined = False
+        self.binary = False  # 是否已协商为二进制帧
+        self.state = 'role'  # 握手进度：role -> name -> joined
+        self.buffer = MessageBuffer()
+        self.queue = deque()  # 待写出的 (kind, bytes)
+        self.paused = False  # transport 写缓冲超过高水位
+        self.max_depth = 0
+        self.dropped = 0  # 队列满时丢弃的消息数
+        self.replaced = 0  # 被新 member_list 取代的消息数
+
+    def connection_made(self, transport):
+        self.transport = transport
+        transport.set_write_buffer_limits(high=WRITE_BUFFER_HIGH)
+        self.addr = transport.get_extra_info('peername')
+        print('client connected', self.addr)
+
+    def data_received(self, data):
+        try:
+            for message in self.buffer.feed(data):
+                self.handle(message)
+                if self.transport.is_closing():
+                    break
+        except (LineTooLong, ValueError) as e:
+            print(f"处理客户端时出错: {e}")
+            self.transport.close()
+
+    def pause_writing(self):
+        self.paused = True
+
+    def resume_writing(self):
+        self.paused = False
+        self.flush()
+
+    def connection_lost(self, exc):
+        self.queue.clear()
+        if exc:
+            print(f"连接断开: {self.name or self.addr} - {exc}")
+        if self.joined:
+            self.server.leave(self)
+        print("已关闭链接：" + (self.name or str(self.addr)))
+
+    def handle(self, message):
+        if self.state == 'role':
+            if message.text == "receiver":
+                self.type = 'receiver'
+                print("接收者接入")
+            elif message.text == "controller":
+                self.type = 'controller'
+                self.controlling = True
+                print("控制者接入")
+            else:
+                self.transport.write(b'Who are you?\n')
+                self.transport.close()
+                return
+            self.state = 'name'
+        elif self.state == 'name':
+            if message.text is None:
+                self.transport.close()  # 握手阶段只接受文本
+                return
+            self.name = message.text
+            if not self.server.is_name_useable(self.name):
+                self.try_send('duplicate_name')
+                print("拒绝重名用户加入：", self.name)
+                self.transport.close()
+                return
+            print(self.name, "已加入会议")
+            self.state = 'joined'
+            self.server.join(self)
+        else:
+            print(self.addr, message.text or message)
+            kind = message.kind
+            if kind == 'command':
+                if self.type == 'receiver' or not self.controlling:
+                    return
+                self.server.send_to_receiver(*message.args)
+            elif kind == 'exchange_control':
+                self.server.exchange_control(self)
+            elif kind == 'switch_control':
+                self.server.switch_control(self)
+            elif kind == 'ping':
+                self.try_send('pong')
+            elif kind == 'protocol' and message.args[:1] == (str(VERSION),):
+                self.try_send('protocol', str(VERSION))  # 回复仍可被旧格式解析，之后改用二进制帧
+                self.binary = True
+                self.try_send('member_list', *self.server.members.names)  # 含空格的成员名按帧重发
+            else:
+                print('Unknown message:', message.text or message)
+
+    def send(self, kind, *args):
+        self.enqueue(kind, encode(kind, *args, binary=self.binary, seq=self.server.next_seq()))
+
+    def enqueue(self, kind, data):
+        """放入发送队列并尽量写出；data 可被多个连接共享，不会被修改"""
+        if self.transport.is_closing():
+            return
+        queue = self.queue
+        if queue and kind in REPLACEABLE:
+            kept = [item for item in queue if item[0] != kind]
+            if len(kept) < len(queue):
+                self.replaced += len(queue) - len(kept)
+                queue.clear()
+                queue.extend(kept)
+        if len(queue) >= self.server.queue_size:
+            oldest = None
+            if self.server.overflow == 'drop_oldest':
+                oldest = next((i for i, item in enumerate(queue) if item[0] in DROPPABLE), None)
+            if oldest is None:
+                print(f"发送队列已满，断开客户端: {self.name or self.addr}")
+                self.server.evicted += 1
+                self.transport.abort()
+                return
+            del queue[oldest]
+            self.dropped += 1
+        queue.append((kind, data))
+        if len(queue) > self.max_depth:
+            self.max_depth = len(queue)
+        self.flush()
+
+    def flush(self):
+        """写缓冲未超过高水位时把队列中的消息交给 transport"""
+        queue = self.queue
+        while queue and not self.paused and not self.transport.is_closing():
+            self.transport.write(queue.popleft()[1])
+
+    def stats(self):
+        return dict(depth=len(self.queue), max_depth=self.max_depth, dropped=self.dropped, replaced=self.replaced,
+                    buffered=self.transport.get_write_buffer_size() if self.transport else 0)
+
+    def try_send(self, kind, *args):
+        try:
+            self.send(kind, *args)
+        except Exception as e:
+            print(f"尝试发送时发生错误: {e}")
+
+
+class AsyncServer:
+    """会议状态与事件循环；run() 阻塞运行，start() 在后台线程中运行"""
+
+    def __init__(self, host=SERVER_HOST, port=SERVER_PORT, backlog=BACKLOG, queue_size=QUEUE_SIZE,
+                 overflow='evict', stats_interval=None):
+        if queue_size < 1:
+            raise ValueError("queue_size 必须为正整数")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"未知的队列溢出策略: {overflow}，可选 {', '.join(OVERFLOW_POLICIES)}")
+        self.HOST = host
+        self.PORT = port
+        self.backlog = backlog
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.stats_interval = stats_interval  # 定期打印发送队列统计的间隔（秒），None 不打印
+        self.evicted = 0  # 因队列已满被断开的客户端数
+        self.members = Members()  # 已加入会议的连接，按用户名与角色索引，含控制者栈
+        self.seq = 0  # 服务端发出消息的序号
+        self.loop = None
+        self.server = None
+        self.ready = threading.Event()  # 开始监听后置位
+        self.thread = None
+
+    async def serve(self):
+        self.loop = asyncio.get_running_loop()
+        self.server = await self.loop.create_server(lambda: ClientProtocol(self), self.HOST, self.PORT,
+                                                    backlog=self.backlog, reuse_address=True)
+        print("服务端已启动")
+        self.ready.set()
+        if self.stats_interval:
+            self.loop.create_task(self.report())
+        async with self.server:
+            try:
+                await self.server.serve_forever()
+            except asyncio.CancelledError:
+                pass
+
+    def run(self):
+        asyncio.run(self.serve())
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run_thread, daemon=True)
+        self.thread.start()
+        return self
+
+    def _run_thread(self):
+        try:
+            self.run()
+        except Exception as e:
+            print(f"服务端启动失败: {e}")
+        finally:
+            self.ready.set()  # 启动失败时也不让等待方一直阻塞
+
+    def stop(self):
+        if self.loop and self.server:
+            self.loop.call_soon_threadsafe(self.server.close)
+        if self.thread:
+            self.thread.join(5)
+            self.thread = None
+
+    async def report(self):
+        while True:
+            await asyncio.sleep(self.stats_interval)
+            stats = self.stats()
+            print(f"发送队列: {stats['clients']} 个连接, 积压 {stats['queued']} 条, 最深 {stats['max_depth']}, "
+                  f"丢弃 {stats['dropped']}, 取代 {stats['replaced']}, 断开 {stats['evicted']}")
+
+    # 以下方法都在事件循环线程中调用，无需加锁
+
+    def next_seq(self):
+        self.seq += 1
+        return self.seq
+
+    def stats(self):
+        """发送队列统计：总计与每个连接（按用户名）的队列深度、丢弃数"""
+        per_client = {c.name: c.stats() for c in self.members}
+        return dict(clients=len(per_client), queued=sum(s['depth'] for s in per_client.values()),
+                    max_depth=max((s['max_depth'] for s in per_client.values()), default=0),
+                    dropped=sum(s['dropped'] for s in per_client.values()),
+                    replaced=sum(s['replaced'] for s in per_client.values()),
+                    evicted=self.evicted, per_client=per_client)
+
+    def broadcast(self, clients, kind, *args):
+        """向 clients 发送同一条消息：文本与二进制各最多编码一次，共用一个序号"""
+        seq = self.next_seq()
+        frames = {}
+        for c in clients:
+            data = frames.get(c.binary)
+            if data is None:
+                data = frames[c.binary] = encode(kind, *args, binary=c.binary, seq=seq)
+            c.enqueue(kind, data)
+
+    def join(self, client):
+        client.joined = True
+        self.members.add(client)
+        self.get_list()
+
+    def leave(self, client):
+        if client.controlling:
+            self.members.pop()
+        self.members.remove(client)
+        self.get_list()
+
+    def is_name_useable(self, name):
+        return name not in self.members
+
+    def get_list(self):
+        self.broadcast(self.members, 'member_list', *self.members.names)
+
+    def top(self):
+        self.broadcast(self.members, 'change_controller', self.members.top())
+
+    def exchange_control(self, client):
+        members = self.members
+        if client.type == 'receiver':
+            print("接收者入栈")
+            members.push(client.name)
+            for c in list(members.controllers):
+                members.set_type(c, 'receiver')
+            members.set_type(client, 'controller')
+            client.controlling = True
+        elif client.type == 'controller':
+            print("控制者出栈")
+            members.pop()
+            members.set_type(client, 'receiver')
+            client.controlling = False
+            c = members.get(members.top())
+            if c is not None:
+                members.set_type(c, 'controller')
+                c.controlling = True
+        self.top()
+        print(members.stack)
+
+    def switch_control(self, client):
+        if client.type == 'controller':
+            self.broadcast(self.members, 'control_switched', client.name)
+
+    def send_to_receiver(self, *args):
+        print("搜索并发送给接收者...")
+        self.broadcast(self.members.receivers, 'command', *args)
@@ -0,0 +1,161 @@
+"""慢速接收者对指令广播的影响：每连接发送队列与阻塞发送对比
+
+服务端在子进程中运行（threaded 为 server_offline 的线程实现，async 为 async_server，
+分别使用 evict / drop_oldest 策略，后者只丢弃 pong，队列里全是指令时同样断开）。
+会议中有一个控制者、若干正常接收者和一个
+“网络很差”的接收者：它把接收缓冲区设得很小并且从不读取。控制者按固定速率发送指令，
+指令带发送时间与填充字段（让慢速接收者的缓冲区尽快塞满）。统计：
+- 正常接收者收到的指令比例与延迟（p50 / p99 / 最大）；
+- 慢速接收者是否被断开，服务端常驻内存。
+
+用法:
+    python -m benchmarks.bench_backpressure
+    python -m benchmarks.bench_backpressure --commands 10000 --receivers 20 --servers async-evict
+"""
+import argparse
+import asyncio
+import socket
+import subprocess
+import sys
+import time
+
+from benchmarks.bench_server import ROOT, free_port, process_status, wait_listening
+from benchmarks.common import environment, percentiles, write_json
+from linereader import LineBuffer
+
+SERVERS = ('threaded', 'async-evict', 'async-drop_oldest')
+
+
+def serve(kind, port, queue_size):
+    """子进程入口：运行指定实现的服务端"""
+    if kind == 'threaded':
+        from server_offline import ServerSocket
+        ServerSocket('127.0.0.1', port, 1024).run()
+    else:
+        from async_server import AsyncServer
+        AsyncServer('127.0.0.1', port, 1024, queue_size, kind.split('-', 1)[1]).run()
+
+
+async def receiver(port, name, latencies, expected):
+    """正常接收者：记录每条指令从发出到收到的延迟，收满 expected 条后返回"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    buffer = LineBuffer(limit=1024 * 1024)
+    try:
+        writer.write(f"receiver\n{name}\n".encode('utf8'))
+        while len(latencies) < expected:
+            data = await reader.read(64 * 1024)
+            if not data:
+                break
+            now = time.perf_counter()
+            for line in buffer.feed(data):
+                if line.startswith('command '):
+                    latencies.append(now - float(line.split(' ')[2]))
+    finally:
+        writer.close()
+
+
+def slow_receiver(port):
+    """慢速接收者：很小的接收缓冲区，握手后不再读取"""
+    sock = socket.socket()
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    sock.connect(('127.0.0.1', port))
+    sock.sendall("receiver\nslow\n".encode('utf8'))
+    return sock
+
+
+def evicted(sock, timeout=2.0):
+    """读空慢速接收者的缓冲区，读到 EOF 说明已被服务端断开"""
+    sock.settimeout(timeout)
+    try:
+        while sock.recv(1024 * 1024):
+            pass
+        return True
+    except socket.timeout:
+        return False
+    except OSError:
+        return True
+
+
+async def controller(port, commands, rate, padding):
+    """控制者：按 rate 条/秒发送 commands 条指令，同时读取并丢弃推送"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    drain = asyncio.ensure_future(reader.read(-1))
+    writer.write("controller\nhost\n".encode('utf8'))
+    await asyncio.sleep(0.2)
+    start = time.perf_counter()
+    for i in range(commands):
+        delay = start + i / rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        writer.write(f"command {i} {time.perf_counter():.6f} {padding}\n".encode('utf8'))
+    await writer.drain()
+    return writer, drain
+
+
+async def meeting(port, args, sample):
+    latencies = [[] for _ in range(args.receivers)]
+    tasks = [asyncio.ensure_future(receiver(port, f"r{i}", latencies[i], args.commands))
+             for i in range(args.receivers)]
+    slow = slow_receiver(port)
+    await asyncio.sleep(0.3)
+    writer, drain = await controller(port, args.commands, args.rate, 'x' * args.padding)
+    done, pending = await asyncio.wait(tasks, timeout=args.timeout)
+    status = sample()
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    drain.cancel()
+    writer.close()
+    gone = await asyncio.get_running_loop().run_in_executor(None, evicted, slow)
+    slow.close()
+    return latencies, gone, status
+
+
+def run(kind, args):
+    port = free_port()
+    server = subprocess.Popen([sys.executable, '-m', 'benchmarks.bench_backpressure', '--serve', kind,
+                               '--port', str(port), '--queue-size', str(args.queue_size)], cwd=ROOT,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        if not wait_listening(port):
+            raise RuntimeError(f"{kind} 服务端未能启动")
+        latencies, gone, (rss, threads) = asyncio.run(meeting(port, args, lambda: process_status(server.pid)))
+    finally:
+        server.terminate()
+        server.wait()
+    samples = [x for received in latencies for x in received]
+    return dict(delivered=round(len(samples) / (args.commands * args.receivers), 4), latency_ms=percentiles(samples),
+                slow_evicted=gone, rss_mb=rss)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="慢速接收者对指令广播的影响")
+    parser.add_argument('--commands', type=int, default=5000, help="控制者发送的指令数")
+    parser.add_argument('--rate', type=float, default=2000.0, help="每秒发送的指令数")
+    parser.add_argument('--receivers', type=int, default=10, help="正常接收者数量")
+    parser.add_argument('--padding', type=int, default=1024, help="每条指令的填充字节数")
+    parser.add_argument('--queue-size', type=int, default=256, help="async 服务端每连接的发送队列长度")
+    parser.add_argument('--servers', nargs='+', default=list(SERVERS), choices=SERVERS, help="对比的服务端实现")
+    parser.add_argument('--timeout', type=float, default=20.0, help="发送完毕后等待接收的最长时间（秒）")
+    parser.add_argument('-o', '--output', help="JSON 输出路径")
+    parser.add_argument('--serve', choices=SERVERS, help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        serve(args.serve, args.port, args.queue_size)
+        return
+
+    result = dict(environment=environment(), commands=args.commands, rate=args.rate, receivers=args.receivers,
+                  padding=args.padding, queue_size=args.queue_size, runs=[])
+    print(f"{'实现':<20}{'送达率':>8}{'p50(ms)':>10}{'p99(ms)':>10}{'最大(ms)':>10}{'慢速被断开':>10}{'内存(MB)':>10}")
+    for kind in args.servers:
+        stats = dict(server=kind, **run(kind, args))
+        result['runs'].append(stats)
+        latency = stats['latency_ms']
+        print(f"{kind:<20}{stats['delivered']:>8.1%}{latency.get('p50', '-')!s:>10}{latency.get('p99', '-')!s:>10}"
+              f"{latency.get('max', '-')!s:>10}{stats['slow_evicted']!s:>10}{stats['rss_mb']!s:>10}")
+    write_json('backpressure', result, args.output)
+
+
+if __name__ == '__main__':
+    main()
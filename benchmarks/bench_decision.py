@@ -0,0 +1,89 @@
+"""手势判定逻辑的检测延迟基准
+
+在录制的关键点上回放各个判定逻辑（decision.DECISIONS），以视频文件名作为
+期望手势，统计：
+- 检测延迟：从第一次出现手到第一次发出正确手势的时间；
+- 误触发：发出的其他手势个数；
+- 重复触发：正确手势发出的次数。
+关键点缓存见 recording.py，首次运行需要 MediaPipe 录制。
+
+用法:
+    python -m benchmarks.bench_decision                    # 默认使用 videos/*.mkv
+    python -m benchmarks.bench_decision --votes 2 4 --refractory 0.3
+"""
+import argparse
+import glob
+import os
+
+import numpy as np
+
+from benchmarks.common import environment, write_json
+from decision import DECISIONS
+from GRU import load_model
+from inference import InferenceEngine
+from recording import load_or_record, replay
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def evaluate(recording, events, label):
+    present = np.flatnonzero(np.asarray(recording.num_hands) > 0)
+    onset = float(recording.timestamps[present[0]]) if len(present) else float(recording.timestamps[0])
+    hits = [now for _, now, gesture in events if gesture == label]
+    return dict(
+        events=[gesture for _, _, gesture in events],
+        time_to_detect_ms=round((hits[0] - onset) * 1e3, 1) if hits else None,
+        correct=len(hits),
+        false=len(events) - len(hits),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="手势判定逻辑的检测延迟基准")
+    parser.add_argument('clips', nargs='*', help="视频文件，默认 videos/*.mkv，文件名即期望手势")
+    parser.add_argument('--votes', type=int, nargs=2, default=(3, 5), metavar=('K', 'N'), help="streaming 的 k-of-n 投票")
+    parser.add_argument('--debounce-ms', type=float, default=0, help="streaming 的去抖时间（毫秒）")
+    parser.add_argument('--refractory', type=float, default=0.6, help="streaming 的默认不应期（秒）")
+    parser.add_argument('--lockout', type=float, default=2.0, help="lockout 的锁定时间（秒）")
+    parser.add_argument('-o', '--output', help="JSON 输出路径")
+    args = parser.parse_args()
+
+    clips = args.clips or sorted(glob.glob(os.path.join(ROOT, 'videos', '*.mkv')))
+    engine = InferenceEngine(load_model(os.path.join(ROOT, 'model.pt')))
+    options = dict(
+        streaming=dict(votes=tuple(args.votes), debounce_ms=args.debounce_ms, default_refractory=args.refractory),
+        lockout=dict(lockout=args.lockout),
+    )
+
+    result = dict(environment=environment(), options=options, clips={})
+    for clip in clips:
+        label = os.path.splitext(os.path.basename(clip))[0]
+        recording = load_or_record(clip)
+        result['clips'][label] = {name: evaluate(recording, replay(recording, engine, DECISIONS[name](**options[name])), label)
+                                  for name in DECISIONS}
+
+    print(f"\n{'手势':<8}" + ''.join(f"{name + ' 延迟(ms)':>20}{'正确/误触发':>12}" for name in DECISIONS))
+    for label, scores in result['clips'].items():
+        row = f"{label:<8}"
+        for name in DECISIONS:
+            ttd = scores[name]['time_to_detect_ms']
+            row += f"{'-' if ttd is None else ttd:>20}{scores[name]['correct']:>8}/{scores[name]['false']:<3}"
+        print(row)
+
+    summary = {}
+    for name in DECISIONS:
+        ttds = [scores[name]['time_to_detect_ms'] for scores in result['clips'].values()]
+        detected = [t for t in ttds if t is not None]
+        summary[name] = dict(
+            detected=len(detected), clips=len(ttds),
+            median_ttd_ms=round(float(np.median(detected)), 1) if detected else None,
+            false=sum(scores[name]['false'] for scores in result['clips'].values()),
+        )
+        print(f"{name}: 检出 {len(detected)}/{len(ttds)}，延迟中位数 {summary[name]['median_ttd_ms']} ms，"
+              f"误触发 {summary[name]['false']}")
+    result['summary'] = summary
+    write_json('decision', result, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""特征构建微基准：对比旧的逐个 append 写法与 FeatureBuilder 的单帧耗时
+
+用法: python -m benchmarks.bench_features [帧数]
+"""
+import random
+import sys
+import time
+
+import numpy as np
+import torch
+
+from features import FeatureBuilder
+
+
+class _Landmark:
+    def __init__(self):
+        self.x, self.y, self.z = random.random(), random.random(), random.random() - 0.5
+
+
+class _Hand:
+    def __init__(self):
+        self.landmark = [_Landmark() for _ in range(21)]
+
+
+class _Classification:
+    def __init__(self, index):
+        self.index = index
+
+
+class _Handedness:
+    def __init__(self, index):
+        self.classification = [_Classification(index)]
+
+
+class _Results:
+    """模拟 hands.process 的返回值"""
+
+    def __init__(self, indices):
+        self.multi_hand_landmarks = [_Hand() for _ in indices] or None
+        self.multi_handedness = [_Handedness(i) for i in indices] or None
+
+
+def legacy_features(results):
+    """Identify.run 原先的写法（含每帧的张量分配与类型转换）"""
+    in_dim = torch.zeros(126)
+    if results.multi_hand_landmarks:
+        handedness = results.multi_handedness
+        if len(handedness) == 1 and handedness[0].classification[0].index == 1:
+            index_1 = []
+            for hand_landmarks in results.multi_hand_landmarks:
+                for k in range(0, 21):
+                    index_1.append(hand_landmarks.landmark[k].x)
+                    index_1.append(hand_landmarks.landmark[k].y)
+                    index_1.append(hand_landmarks.landmark[k].z)
+                for k_1 in range(0, 63):
+                    index_1.append(0)
+            in_dim = torch.from_numpy(np.array(index_1))
+        elif len(handedness) == 1:
+            index_0 = []
+            for hand_landmarks in results.multi_hand_landmarks:
+                for k_1 in range(0, 63):
+                    index_0.append(0)
+                for k in range(0, 21):
+                    index_0.append(hand_landmarks.landmark[k].x)
+                    index_0.append(hand_landmarks.landmark[k].y)
+                    index_0.append(hand_landmarks.landmark[k].z)
+            in_dim = torch.from_numpy(np.array(index_0))
+        else:
+            hands = list(results.multi_hand_landmarks)
+            if handedness[0].classification[0].index == 0:
+                hands.reverse()
+            index = []
+            for hand_landmarks in hands:
+                for k in range(0, 21):
+                    index.append(hand_landmarks.landmark[k].x)
+                    index.append(hand_landmarks.landmark[k].y)
+                    index.append(hand_landmarks.landmark[k].z)
+            in_dim = torch.from_numpy(np.array(index))
+    in_dim = in_dim.unsqueeze(dim=0)
+    in_dim = in_dim.unsqueeze(dim=0)
+    return in_dim.to(torch.float32).to('cpu')
+
+
+def builder_features(builder, x, results):
+    """FeatureBuilder 写入预分配缓冲区，再原地拷贝进常驻的模型输入"""
+    x[0, 0].copy_(torch.from_numpy(builder.build(results)))
+    return x
+
+
+def bench(fn, frames):
+    start = time.perf_counter()
+    for results in frames:
+        fn(results)
+    return (time.perf_counter() - start) / len(frames) * 1e6
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    cases = {'无手': [], '单手(右)': [1], '单手(左)': [0], '双手': [1, 0], '双手(反序)': [0, 1]}
+    builder = FeatureBuilder()
+    x = torch.zeros(1, 1, 126)
+    print(f"{'场景':<10}{'旧写法 us/帧':>14}{'FeatureBuilder us/帧':>22}{'加速比':>8}")
+    for name, indices in cases.items():
+        frames = [_Results(indices) for _ in range(64)] * (n // 64)
+        for results in frames[:64]:  # 两种写法结果必须一致
+            assert torch.equal(legacy_features(results), builder_features(builder, x, results).clone())
+        old = bench(legacy_features, frames)
+        new = bench(lambda r: builder_features(builder, x, r), frames)
+        print(f"{name:<10}{old:>14.2f}{new:>22.2f}{old / new:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
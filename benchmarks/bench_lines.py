@@ -0,0 +1,101 @@
+"""按行读取的吞吐量（消息/秒）
+
+用 socketpair 模拟一条连接，另一个线程持续写入典型消息（command、ping、
+member_list），对比：
+- recv1：旧实现，每个字节一次 recv(1)，bytes += 拼接；
+- reader：linereader.LineReader，大块 recv_into 复用缓冲区；
+- feed：linereader.LineBuffer.feed，asyncio 服务端在 data_received 中的用法（不含 socket）。
+
+用法:
+    python -m benchmarks.bench_lines
+    python -m benchmarks.bench_lines --messages 200000 --members 500
+"""
+import argparse
+import socket
+import threading
+import time
+
+from benchmarks.common import environment, write_json
+from linereader import LineBuffer, LineReader
+
+
+def legacy_readline(sock, size=32 * 1024):
+    """旧的逐字节读取，与改动前 ClientServer.readline 相同"""
+    buf = b''
+    while len(buf) < size:
+        data = sock.recv(1)
+        if not data:
+            raise ConnectionError("连接已断开")
+        buf += data
+        if buf[-1] == 10:
+            break
+    return buf[:-1].decode('utf8')
+
+
+def make_payload(messages, members):
+    """按 command / ping / member_list 8:1:1 的比例生成消息，返回 (编码后的数据, 消息数)"""
+    member_list = 'member_list ' + ' '.join(f"用户{i}" for i in range(members))
+    lines = []
+    for i in range(messages):
+        lines.append(member_list if i % 10 == 0 else 'ping' if i % 10 == 5 else 'command 放大')
+    return ('\n'.join(lines) + '\n').encode('utf8'), len(lines)
+
+
+def run_socket(payload, count, readline):
+    """一个线程写入 payload，当前线程读出 count 行，返回每秒消息数"""
+    writer, reader = socket.socketpair()
+    thread = threading.Thread(target=writer.sendall, args=(payload,), daemon=True)
+    try:
+        start = time.perf_counter()
+        thread.start()
+        read = readline(reader)
+        for _ in range(count):
+            read()
+        seconds = time.perf_counter() - start
+    finally:
+        thread.join()
+        writer.close()
+        reader.close()
+    return count / seconds
+
+
+def run_feed(payload, count, chunk_size=64 * 1024):
+    """按 asyncio 传输层每次最多给出的块大小喂入 LineBuffer，返回每秒消息数"""
+    buffer = LineBuffer()
+    chunks = [payload[i:i + chunk_size] for i in range(0, len(payload), chunk_size)]
+    start = time.perf_counter()
+    lines = 0
+    for chunk in chunks:
+        for _ in buffer.feed(chunk):
+            lines += 1
+    seconds = time.perf_counter() - start
+    assert lines == count
+    return count / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="按行读取的吞吐量")
+    parser.add_argument('--messages', type=int, default=50000, help="消息数")
+    parser.add_argument('--members', type=int, default=100, help="member_list 中的成员数")
+    parser.add_argument('--legacy-messages', type=int, default=5000, help="旧实现只读这么多条，避免耗时过长")
+    parser.add_argument('-o', '--output', help="JSON 输出路径")
+    args = parser.parse_args()
+
+    payload, count = make_payload(args.messages, args.members)
+    legacy_payload, legacy_count = make_payload(args.legacy_messages, args.members)
+    result = dict(environment=environment(), messages=count, members=args.members, bytes=len(payload),
+                  messages_per_second={})
+    rates = result['messages_per_second']
+    rates['recv1'] = run_socket(legacy_payload, legacy_count, lambda sock: lambda: legacy_readline(sock))
+    rates['reader'] = run_socket(payload, count, lambda sock: LineReader(sock).readline)
+    rates['feed'] = run_feed(payload, count)
+
+    print(f"{'实现':<10}{'消息/秒':>14}{'相对 recv1':>12}")
+    for name, rate in rates.items():
+        rates[name] = round(rate, 1)
+        print(f"{name:<10}{rate:>14,.0f}{rate / rates['recv1']:>11.1f}x")
+    write_json('lines', result, args.output)
+
+
+if __name__ == '__main__':
+    main()
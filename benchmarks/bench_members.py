@@ -0,0 +1,206 @@
+"""会议成员管理的单次操作耗时随成员数的变化：列表遍历与 members.Members 对比
+
+不含网络与编码，只测服务端维护成员状态的开销（微秒/次）：
+- join：检查重名并加入；
+- leave：控制者离开时出栈并移除，按随机顺序离开全部成员；
+- exchange：接收者获取控制权、再交还（入栈 + 角色切换 + 出栈 + 交接）；
+- broadcast：找出全部接收者并逐个“发送”，按每个接收者计；
+- pop：一半成员依次获取控制权，离开时名字留在栈中，再出栈一次，需要跳过全部离开的人，
+  按跳过的每个成员计（即均摊到每次离开的出栈开销）。
+list 为改动前 AsyncServer 的写法（成员列表与在循环中重建的名字列表）。
+
+用法:
+    python -m benchmarks.bench_members
+    python -m benchmarks.bench_members --members 100 1000 5000
+"""
+import argparse
+import random
+import time
+
+from benchmarks.common import environment, write_json
+from members import Members
+
+
+class Client:
+    def __init__(self, name, type='receiver'):
+        self.name = name
+        self.type = type
+        self.controlling = type == 'controller'
+
+
+class ListMembers:
+    """改动前的写法：成员列表 + 控制者栈，每次操作遍历列表"""
+
+    def __init__(self):
+        self.clients = []
+        self.controller_stack = []
+
+    def join(self, client):
+        for c in self.clients:
+            if c.name == client.name:
+                return False
+        self.clients.append(client)
+        return True
+
+    def leave(self, client):
+        if client.controlling:
+            self.pop()
+        if client in self.clients:
+            self.clients.remove(client)
+
+    def push(self, name):
+        if name in [c.name for c in self.clients]:
+            if (not self.controller_stack) or self.controller_stack[-1] != name:
+                self.controller_stack.append(name)
+
+    def pop(self):
+        while len(self.controller_stack) > 1:
+            self.controller_stack.pop()
+            if self.controller_stack[-1] in [c.name for c in self.clients]:
+                return
+        self.controller_stack.clear()
+
+    def exchange_control(self, client):
+        if client.type == 'receiver':
+            self.push(client.name)
+            for c in self.clients:
+                if c.type == 'controller':
+                    c.type = 'receiver'
+            client.type = 'controller'
+            client.controlling = True
+        elif client.type == 'controller':
+            self.pop()
+            client.type = 'receiver'
+            client.controlling = False
+            if self.controller_stack:
+                for c in self.clients:
+                    if c.name == self.controller_stack[-1]:
+                        c.type = 'controller'
+                        c.controlling = True
+
+    def receivers(self):
+        return [c for c in self.clients if c.type == 'receiver']
+
+
+class IndexedMembers:
+    """members.Members，与 AsyncServer 中的用法相同"""
+
+    def __init__(self):
+        self.members = Members()
+
+    def join(self, client):
+        if client.name in self.members:
+            return False
+        self.members.add(client)
+        return True
+
+    def leave(self, client):
+        if client.controlling:
+            self.members.pop()
+        self.members.remove(client)
+
+    def pop(self):
+        self.members.pop()
+
+    def exchange_control(self, client):
+        members = self.members
+        if client.type == 'receiver':
+            members.push(client.name)
+            for c in list(members.controllers):
+                members.set_type(c, 'receiver')
+            members.set_type(client, 'controller')
+            client.controlling = True
+        elif client.type == 'controller':
+            members.pop()
+            members.set_type(client, 'receiver')
+            client.controlling = False
+            c = members.get(members.top())
+            if c is not None:
+                members.set_type(c, 'controller')
+                c.controlling = True
+
+    def receivers(self):
+        return self.members.receivers
+
+
+IMPLEMENTATIONS = dict(list=ListMembers, indexed=IndexedMembers)
+
+
+def meeting(impl, count):
+    """count 个成员的会议，第一个是控制者"""
+    registry = IMPLEMENTATIONS[impl]()
+    clients = [Client(f"u{i:06d}", 'controller' if i == 0 else 'receiver') for i in range(count)]
+    return registry, clients
+
+
+def per_op(seconds, ops):
+    return round(seconds / ops * 1e6, 3)
+
+
+def run(impl, count, exchanges, broadcasts, seed):
+    rng = random.Random(seed)
+    result = {}
+
+    registry, clients = meeting(impl, count)
+    start = time.perf_counter()
+    for c in clients:
+        registry.join(c)
+    result['join'] = per_op(time.perf_counter() - start, count)
+
+    chosen = [rng.choice(clients[1:]) for _ in range(exchanges)]
+    start = time.perf_counter()
+    for c in chosen:
+        registry.exchange_control(c)
+        registry.exchange_control(c)
+    result['exchange'] = per_op(time.perf_counter() - start, exchanges)
+
+    sent = 0
+    start = time.perf_counter()
+    for _ in range(broadcasts):
+        for c in registry.receivers():
+            sent += 1
+    result['broadcast'] = per_op(time.perf_counter() - start, sent)
+
+    leaving = clients[1:count // 2]
+    for c in leaving:
+        registry.exchange_control(c)
+    for c in leaving:
+        c.controlling = False  # 离开时不出栈，名字留在栈中
+        registry.leave(c)
+    start = time.perf_counter()
+    registry.pop()
+    result['pop'] = per_op(time.perf_counter() - start, len(leaving))
+
+    registry, clients = meeting(impl, count)
+    for c in clients:
+        registry.join(c)
+    rng.shuffle(clients)
+    start = time.perf_counter()
+    for c in clients:
+        registry.leave(c)
+    result['leave'] = per_op(time.perf_counter() - start, count)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="会议成员管理的单次操作耗时")
+    parser.add_argument('--members', type=int, nargs='+', default=[100, 1000, 5000], help="会议成员数")
+    parser.add_argument('--exchanges', type=int, default=200, help="控制权交接次数")
+    parser.add_argument('--broadcasts', type=int, default=20, help="指令广播次数")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', help="JSON 输出路径")
+    args = parser.parse_args()
+
+    operations = ('join', 'leave', 'exchange', 'broadcast', 'pop')
+    result = dict(environment=environment(), unit='us_per_op', runs=[])
+    print(f"{'实现':<10}{'成员数':>8}" + ''.join(f"{name:>12}" for name in operations))
+    for count in args.members:
+        for impl in IMPLEMENTATIONS:
+            stats = run(impl, count, args.exchanges, args.broadcasts, args.seed)
+            result['runs'].append(dict(impl=impl, members=count, **stats))
+            print(f"{impl:<10}{count:>8}" + ''.join(f"{stats[name]:>12.3f}" for name in operations))
+    write_json('members', result, args.output)
+
+
+if __name__ == '__main__':
+    main()
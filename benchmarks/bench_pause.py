@@ -0,0 +1,86 @@
+"""暂停 / 恢复基准
+
+用按原始帧率循环播放的视频加独立采集线程模拟摄像头，依次：
+1. 运行 --warm 秒；
+2. 短暂停（小于 --release-after），恢复并记录恢复到首帧的耗时；
+3. 长暂停（超过 --release-after，摄像头与检测器被释放），记录暂停期间的常驻内存，
+   恢复并记录恢复到首帧的耗时（含重新打开来源与重建检测器）。
+
+用法:
+    python -m benchmarks.bench_pause
+    python -m benchmarks.bench_pause videos/点击.mkv --release-after 2
+"""
+import argparse
+import os
+import threading
+import time
+
+from benchmarks.common import current_rss_mb, environment, write_json
+from capture import CaptureThread
+from process import HeadlessWin, Identify
+from sources import VideoFileSource
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class PauseWin(HeadlessWin):
+    def set_gesture(self, msg: str):
+        self.gestures.append(msg)
+
+
+def wait_resume(identify, timeout=10.0):
+    """等待恢复后的首帧，返回 resume_seconds 指标"""
+    deadline = time.perf_counter() + timeout
+    while identify.resumed_at is not None or identify.metrics.gauges.get('resume_seconds') is None:
+        if time.perf_counter() > deadline:
+            return None
+        time.sleep(0.01)
+    return identify.metrics.gauges['resume_seconds']
+
+
+def pause(identify, seconds):
+    """暂停 seconds 秒后恢复，返回 (暂停期间的常驻内存, 恢复到首帧的耗时)"""
+    identify.win.eventRunning.clear()
+    time.sleep(seconds)
+    rss = current_rss_mb()
+    identify.metrics.gauges.pop('resume_seconds', None)
+    identify.win.eventRunning.set()
+    return rss, wait_resume(identify)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="暂停 / 恢复基准")
+    parser.add_argument('clip', nargs='?', default=os.path.join(ROOT, 'videos', '点击.mkv'))
+    parser.add_argument('--release-after', type=float, default=1.0, help="暂停多久后释放摄像头与检测器（秒）")
+    parser.add_argument('--warm', type=float, default=3.0, help="每次暂停前运行的秒数")
+    parser.add_argument('-o', '--output', help="JSON 输出路径")
+    args = parser.parse_args()
+
+    source = CaptureThread(VideoFileSource(args.clip, realtime=True, loop=True))
+    identify = Identify(PauseWin(), source=source, release_after=args.release_after)
+    thread = threading.Thread(target=identify.run, daemon=True)
+    thread.start()
+    time.sleep(args.warm)
+    while identify.hands is None:  # 等待首次加载完成
+        time.sleep(0.1)
+    time.sleep(args.warm)
+
+    result = dict(environment=environment(), clip=os.path.basename(args.clip), release_after=args.release_after)
+    result['running_rss_mb'] = current_rss_mb()
+    result['short_pause_rss_mb'], result['short_resume_seconds'] = pause(identify, args.release_after / 2)
+    time.sleep(args.warm)
+    result['long_pause_rss_mb'], result['long_resume_seconds'] = pause(identify, args.release_after + 2.0)
+    time.sleep(args.warm)
+    result['pause_releases'] = identify.metrics.counters['pause_releases']
+    identify.break_loop()
+    thread.join(5)
+
+    print(f"运行中常驻内存        {result['running_rss_mb']} MB")
+    print(f"短暂停: 常驻内存 {result['short_pause_rss_mb']} MB，恢复到首帧 {result['short_resume_seconds']}s")
+    print(f"长暂停: 常驻内存 {result['long_pause_rss_mb']} MB，恢复到首帧 {result['long_resume_seconds']}s"
+          f"（释放 {result['pause_releases']} 次）")
+    write_json('pause', result, args.output)
+
+
+if __name__ == '__main__':
+    main()
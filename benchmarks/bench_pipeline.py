@@ -0,0 +1,156 @@
+"""识别流水线分阶段延迟基准
+
+在录制的视频上无界面运行 Identify，统计每个阶段的 p50/p95/p99 延迟、帧率与
+峰值内存，并写出 JSON 以便跨提交、跨机器比较。
+
+默认关闭各项自适应优化（检测分辨率与帧间隔预算、运动门控、空闲降频、零输入跳过 GRU），
+每帧都按原分辨率完整处理，不同提交之间的结果可以直接对比；--adaptive 使用应用的默认设置。
+整帧耗时取自每帧的 start()..end_frame()，被跳过的阶段不会错位相加。
+
+用法:
+    python -m benchmarks.bench_pipeline                      # 默认使用 videos/*.mkv
+    python -m benchmarks.bench_pipeline a.mkv b.mkv -o out.json
+    python -m benchmarks.bench_pipeline --compare old.json   # 与之前的结果对比
+    python -m benchmarks.bench_pipeline --adaptive           # 开启自适应优化
+"""
+import argparse
+import glob
+import json
+import os
+import time
+
+import cv2
+import torch
+
+from benchmarks.common import environment, peak_rss_mb, percentiles, write_json
+from budget import WIDTH_LADDER, FrameBudget
+from GRU import load_model
+from governor import IdleGovernor
+from inference import InferenceEngine
+from metrics import STAGES, PipelineMetrics
+from motion import MotionGate
+from process import HeadlessWin, Identify
+from roi import HandRoiTracker
+from sources import VideoFileSource
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class BenchWin(HeadlessWin):
+    """flash_img 做与 Window.flash_img 相同的缩放和颜色转换，只是不交给 Qt"""
+
+    def __init__(self, label_width=640):
+        super().__init__()
+        self.label_width = label_width
+
+    def flash_img(self, image, ratio):
+        size = (self.label_width, int(self.label_width * ratio))
+        shrink = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(shrink, cv2.COLOR_BGR2RGB)
+
+    def set_gesture(self, msg: str):
+        self.gestures.append(msg)
+
+
+def fixed_settings():
+    """关闭自适应优化：原分辨率检测、不限帧间隔、不做运动门控、不降频"""
+    full = WIDTH_LADDER[0]
+    return dict(budget=FrameBudget(start_width=full, max_width=full, min_width=full),
+                gate=MotionGate(enabled=False), governor=IdleGovernor('performance'))
+
+
+def run_clip(path, engine, realtime=False, label_width=640, roi=False, adaptive=False):
+    timer = PipelineMetrics(keep_samples=True)
+    win = BenchWin(label_width)
+    identify = Identify(win, engine=engine, source=VideoFileSource(path, realtime=realtime), metrics=timer,
+                        roi=HandRoiTracker(enabled=roi), **({} if adaptive else fixed_settings()))
+    start = time.perf_counter()
+    identify.run()
+    elapsed = time.perf_counter() - start
+    return timer, elapsed, win.gestures
+
+
+def summarize(timer, elapsed):
+    return dict(
+        frames=timer.frames,
+        seconds=round(elapsed, 3),
+        fps=round(timer.frames / elapsed, 2) if elapsed > 0 else 0,
+        stages_ms={stage: percentiles(timer.samples[stage]) for stage in STAGES},
+        frame_ms=percentiles(timer.frame_samples),
+    )
+
+
+def print_summary(name, summary):
+    print(f"\n== {name}: {summary['frames']} 帧, {summary['seconds']}s, {summary['fps']} FPS")
+    counters = summary.get('counters', {})
+    if counters.get('roi_hits') or counters.get('roi_misses'):
+        hits, misses = counters.get('roi_hits', 0), counters.get('roi_misses', 0)
+        print(f"裁剪检测命中 {hits}，跟丢 {misses}，命中率 {hits / (hits + misses):.1%}")
+    print(f"{'阶段':<12}{'p50':>10}{'p95':>10}{'p99':>10}{'mean':>10}   (ms)")
+    for stage, stats in list(summary['stages_ms'].items()) + [('total', summary['frame_ms'])]:
+        if stats['count']:
+            print(f"{stage:<12}{stats['p50']:>10.3f}{stats['p95']:>10.3f}{stats['p99']:>10.3f}{stats['mean']:>10.3f}")
+
+
+def compare(old_path, result):
+    with open(old_path, encoding='utf8') as f:
+        old = json.load(f)
+    print(f"\n== 对比 {old['environment']['commit']} -> {result['environment']['commit']} (p50 ms)")
+    if old.get('adaptive', False) != result['adaptive']:
+        print("注意：两次结果的 --adaptive 设置不同，耗时不可直接比较")
+    before, after = old['overall'], result['overall']
+    for stage in STAGES:
+        a, b = before['stages_ms'][stage].get('p50'), after['stages_ms'][stage].get('p50')
+        if a and b:
+            print(f"{stage:<12}{a:>10.3f}{b:>10.3f}{(b - a) / a * 100:>+9.1f}%")
+    print(f"{'fps':<12}{before['fps']:>10.2f}{after['fps']:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="识别流水线分阶段延迟基准")
+    parser.add_argument('clips', nargs='*', help="视频文件，默认 videos/*.mkv")
+    parser.add_argument('--realtime', action='store_true', help="按原始帧率播放而不是尽快播放")
+    parser.add_argument('--label-width', type=int, default=640, help="模拟预览窗口宽度")
+    parser.add_argument('--roi', action='store_true', help="开启手部区域裁剪检测并统计命中率")
+    parser.add_argument('--adaptive', action='store_true',
+                        help="开启检测预算、运动门控、空闲降频与零输入跳过（默认关闭，便于跨提交对比）")
+    parser.add_argument('-o', '--output', help="JSON 输出路径")
+    parser.add_argument('--compare', help="与之前的 JSON 结果对比")
+    args = parser.parse_args()
+
+    clips = args.clips or sorted(glob.glob(os.path.join(ROOT, 'videos', '*.mkv')))
+    device = torch.device('cuda:0' if torch.cuda.is_available() else 'cpu')
+    engine = InferenceEngine(load_model(os.path.join(ROOT, 'model.pt')), device,
+                             **({} if args.adaptive else dict(zero_tolerance=None)))
+
+    result = dict(environment=environment(), device=str(device), realtime=args.realtime, roi=args.roi,
+                  adaptive=args.adaptive, clips={})
+    overall = PipelineMetrics(keep_samples=True)
+    overall_elapsed = 0.0
+    for clip in clips:
+        timer, elapsed, gestures = run_clip(clip, engine, args.realtime, args.label_width, args.roi, args.adaptive)
+        summary = summarize(timer, elapsed)
+        summary['gestures'] = gestures
+        summary['counters'] = timer.counters
+        for name, value in timer.counters.items():
+            overall.counters[name] = overall.counters.get(name, 0) + value
+        result['clips'][os.path.basename(clip)] = summary
+        print_summary(os.path.basename(clip), summary)
+        for stage in STAGES:
+            overall.samples[stage].extend(timer.samples[stage])
+        overall.frame_samples.extend(timer.frame_samples)
+        overall.frames += timer.frames
+        overall_elapsed += elapsed
+
+    result['overall'] = summarize(overall, overall_elapsed)
+    result['overall']['counters'] = overall.counters
+    result['peak_rss_mb'] = peak_rss_mb()
+    print_summary('overall', result['overall'])
+    print(f"峰值内存: {result['peak_rss_mb']} MB")
+    write_json('pipeline', result, args.output)
+    if args.compare:
+        compare(args.compare, result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""空闲降频基准
+
+1. 空闲功耗：用按帧率输出、没有手的合成画面模拟无人时的摄像头，每个功耗档位
+   运行 --seconds 秒，统计进程 CPU 占用（单核百分比）与实际处理帧率；
+2. 唤醒：以降频状态开始播放带手的视频，记录检测到手之后下一帧到来的间隔，
+   应当回到摄像头帧间隔（约 33ms）而不是降频后的间隔。
+
+用法:
+    python -m benchmarks.bench_power
+    python -m benchmarks.bench_power --seconds 20 --clip videos/抓取.mkv
+"""
+import argparse
+import os
+import threading
+import time
+
+from benchmarks.common import environment, write_json
+from capture import CaptureThread
+from governor import PROFILES, IdleGovernor
+from process import HeadlessWin, Identify
+from sources import SyntheticSource, VideoFileSource
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class QuietWin(HeadlessWin):
+    def set_gesture(self, msg: str):
+        self.gestures.append(msg)
+
+
+class RecordingGovernor(IdleGovernor):
+    """记录每次 update 的时间与结果"""
+
+    def __init__(self, profile, idle=False):
+        super().__init__(profile)
+        self.updates = []
+        if idle:
+            self.idle = True
+            self.last_hand = float('-inf')
+
+    def update(self, has_hand, now):
+        changed = super().update(has_hand, now)
+        self.updates.append((now, has_hand, changed))
+        return changed
+
+
+def run(source, governor, seconds):
+    """运行 seconds 秒，返回 (Identify, 进程 CPU 秒数)"""
+    identify = Identify(QuietWin(), source=CaptureThread(source), governor=governor)
+    identify.prepare_model()
+    identify.prepare_detector()
+    thread = threading.Thread(target=identify.run, daemon=True)
+    cpu = time.process_time()
+    thread.start()
+    time.sleep(seconds)
+    cpu = time.process_time() - cpu
+    identify.break_loop()
+    thread.join(5)
+    return identify, cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description="空闲降频基准")
+    parser.add_argument('--seconds', type=float, default=15.0, help="每个功耗档位的运行时间")
+    parser.add_argument('--clip', default=os.path.join(ROOT, 'videos', '点击.mkv'), help="唤醒测试使用的视频")
+    parser.add_argument('-o', '--output', help="JSON 输出路径")
+    args = parser.parse_args()
+
+    result = dict(environment=environment(), seconds=args.seconds, profiles={})
+    print(f"{'档位':<14}{'CPU(单核)':>10}{'处理帧率':>10}{'降频帧':>8}{'补推步数':>10}")
+    for profile in PROFILES:
+        source = SyntheticSource(frames=None, realtime=True)
+        identify, cpu = run(source, IdleGovernor(profile), args.seconds)
+        counters = identify.metrics.counters
+        stats = dict(cpu_percent=round(100 * cpu / args.seconds, 1),
+                     fps=round(counters['frames_total'] / args.seconds, 1),
+                     frames_idle=counters['frames_idle'], catchup_steps=counters['idle_catchup_steps'])
+        result['profiles'][profile] = stats
+        print(f"{profile:<14}{stats['cpu_percent']:>9.1f}%{stats['fps']:>10.1f}"
+              f"{stats['frames_idle']:>8}{stats['catchup_steps']:>10}")
+
+    governor = RecordingGovernor('eco', idle=True)
+    run(VideoFileSource(args.clip, realtime=True, loop=True), governor, 3.0)
+    wakes = [i for i, (_, has_hand, changed) in enumerate(governor.updates) if changed and has_hand]
+    if wakes and wakes[0] + 1 < len(governor.updates):
+        i = wakes[0]
+        gap = governor.updates[i + 1][0] - governor.updates[i][0]
+        result['wake'] = dict(clip=os.path.basename(args.clip), idle_interval=round(1.0 / PROFILES['eco']['idle_fps'], 4),
+                              next_frame_seconds=round(gap, 4))
+        print(f"\n唤醒: 检测到手后下一帧间隔 {gap * 1000:.1f}ms（降频间隔 {1000 / PROFILES['eco']['idle_fps']:.0f}ms）")
+    else:
+        result['wake'] = None
+        print("\n唤醒: 视频中未检测到手")
+    write_json('power', result, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""文本行协议与二进制帧协议的编解码开销
+
+对典型消息（command、change_controller、含 --members 个成员的 member_list）分别统计
+每条消息的编码、解码耗时（微秒）与编码后的字节数。解码按 64 KiB 一块喂入
+protocol.MessageBuffer，与服务端 data_received 的用法一致；text-split 为改动前
+LineBuffer 取行后 split(' ') 的写法。
+
+用法:
+    python -m benchmarks.bench_protocol
+    python -m benchmarks.bench_protocol --members 500 --count 20000
+"""
+import argparse
+import time
+
+from benchmarks.common import environment, write_json
+from linereader import LineBuffer
+from protocol import MessageBuffer, encode_frame, encode_text
+
+
+def per_message_us(fn, count):
+    start = time.perf_counter()
+    fn()
+    return round((time.perf_counter() - start) / count * 1e6, 3)
+
+
+def decode_all(buffer, payload, chunk_size=64 * 1024):
+    for i in range(0, len(payload), chunk_size):
+        for _ in buffer.feed(payload[i:i + chunk_size]):
+            pass
+
+
+def split_all(payload, chunk_size=64 * 1024):
+    buffer = LineBuffer()
+    for i in range(0, len(payload), chunk_size):
+        for line in buffer.feed(payload[i:i + chunk_size]):
+            line.split(' ')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="文本行协议与二进制帧协议的编解码开销")
+    parser.add_argument('--members', type=int, default=100, help="member_list 中的成员数")
+    parser.add_argument('--count', type=int, default=20000, help="每种消息的条数")
+    parser.add_argument('-o', '--output', help="JSON 输出路径")
+    args = parser.parse_args()
+
+    messages = {
+        'command': ('command', '放大'),
+        'change_controller': ('change_controller', '用户1'),
+        'member_list': ('member_list',) + tuple(f"用户{i}" for i in range(args.members)),
+    }
+    result = dict(environment=environment(), members=args.members, count=args.count, messages={})
+    print(f"{'消息':<20}{'格式':<12}{'字节':>8}{'编码(us)':>10}{'解码(us)':>10}")
+    for name, (kind, *fields) in messages.items():
+        rows = {}
+        text = encode_text(kind, *fields)
+        frame = encode_frame(kind, *fields)
+        text_payload = text * args.count
+        frame_payload = frame * args.count
+        rows['text-split'] = dict(bytes=len(text),
+                                  encode_us=per_message_us(lambda: [encode_text(kind, *fields)
+                                                                    for _ in range(args.count)], args.count),
+                                  decode_us=per_message_us(lambda: split_all(text_payload), args.count))
+        rows['text'] = dict(bytes=len(text), encode_us=rows['text-split']['encode_us'],
+                            decode_us=per_message_us(lambda: decode_all(MessageBuffer(), text_payload), args.count))
+        rows['binary'] = dict(bytes=len(frame),
+                              encode_us=per_message_us(lambda: [encode_frame(kind, *fields, seq=i)
+                                                                for i in range(args.count)], args.count),
+                              decode_us=per_message_us(lambda: decode_all(MessageBuffer(), frame_payload), args.count))
+        result['messages'][name] = rows
+        for fmt, stats in rows.items():
+            print(f"{name:<20}{fmt:<12}{stats['bytes']:>8}{stats['encode_us']:>10.3f}{stats['decode_us']:>10.3f}")
+    write_json('protocol', result, args.output)
+
+
+if __name__ == '__main__':
+    main()
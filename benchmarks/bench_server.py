@@ -0,0 +1,156 @@
+"""会议服务端的并发连接基准：asyncio 实现与每连接一个线程的实现对比
+
+服务端在子进程中运行，基准进程用 asyncio 同时发起 N 个接收者连接（模拟大型会议
+集中加入），每个连接完成握手并持续读取、丢弃服务端推送的消息。统计：
+- 在超时内成功加入（收到第一条 member_list）的连接数与全部加入的耗时；
+- 服务端常驻内存增量与每个连接平均占用的内存、线程数。
+
+用法:
+    python -m benchmarks.bench_server
+    python -m benchmarks.bench_server --clients 100 500 --servers async
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from benchmarks.common import environment, write_json
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVERS = ('threaded', 'async')
+
+
+def serve(kind, port, backlog):
+    """子进程入口：运行指定实现的服务端"""
+    if kind == 'async':
+        from async_server import AsyncServer
+        AsyncServer('127.0.0.1', port, backlog).run()
+    else:
+        from server_offline import ServerSocket
+        ServerSocket('127.0.0.1', port, backlog).run()
+
+
+def process_status(pid):
+    """读取 /proc/<pid>/status，返回 (常驻内存 MB, 线程数)，无法获取时为 None"""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            fields = dict(line.split(':', 1) for line in f if ':' in line)
+        return round(int(fields['VmRSS'].split()[0]) / 1024, 2), int(fields['Threads'])
+    except (OSError, KeyError, ValueError):
+        pass
+    try:
+        import psutil
+        process = psutil.Process(pid)
+        return round(process.memory_info().rss / (1024 * 1024), 2), process.num_threads()
+    except ImportError:
+        return None, None
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_listening(port, timeout=10.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), 0.5).close()
+            return True
+        except OSError:
+            time.sleep(0.05)
+    return False
+
+
+async def member(port, name, joined, stop):
+    """一个接收者：握手后持续读取并丢弃推送，首次收到数据时记录加入时间"""
+    try:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    except OSError:
+        return
+    try:
+        writer.write(f"receiver\n{name}\n".encode('utf8'))
+        while not stop.is_set():
+            data = await reader.read(64 * 1024)
+            if not data:
+                break
+            if name not in joined:
+                joined[name] = time.perf_counter()
+    except OSError:
+        pass
+    finally:
+        writer.close()
+
+
+async def storm(port, count, timeout, settle, sample):
+    """同时发起 count 个连接，全部加入或超时后等待 settle 秒再采样服务端状态"""
+    joined, stop = {}, asyncio.Event()
+    start = time.perf_counter()
+    tasks = [asyncio.ensure_future(member(port, f"u{i:05d}", joined, stop)) for i in range(count)]
+    deadline = start + timeout
+    while len(joined) < count and time.perf_counter() < deadline:
+        await asyncio.sleep(0.02)
+    join_seconds = max(joined.values()) - start if joined else None
+    await asyncio.sleep(settle)
+    status = sample()
+    stop.set()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return len(joined), join_seconds, status
+
+
+def run(kind, count, args):
+    port = free_port()
+    server = subprocess.Popen([sys.executable, '-m', 'benchmarks.bench_server', '--serve', kind, '--port', str(port),
+                               '--backlog', str(args.backlog)], cwd=ROOT,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        if not wait_listening(port):
+            raise RuntimeError(f"{kind} 服务端未能启动")
+        time.sleep(0.5)
+        rss_before, threads_before = process_status(server.pid)
+        joined, join_seconds, (rss, threads) = asyncio.run(
+            storm(port, count, args.timeout, args.settle, lambda: process_status(server.pid)))
+    finally:
+        server.terminate()
+        server.wait()
+    per_client = round((rss - rss_before) * 1024 / joined, 1) if joined and rss is not None else None
+    return dict(clients=count, joined=joined, join_seconds=None if join_seconds is None else round(join_seconds, 3),
+                rss_before_mb=rss_before, rss_mb=rss, kb_per_client=per_client,
+                threads_before=threads_before, threads=threads)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="会议服务端的并发连接基准")
+    parser.add_argument('--clients', type=int, nargs='+', default=[100, 300], help="同时加入的接收者数量")
+    parser.add_argument('--servers', nargs='+', default=list(SERVERS), choices=SERVERS, help="对比的服务端实现")
+    parser.add_argument('--backlog', type=int, default=1024, help="两种实现使用的 listen 等待队列长度")
+    parser.add_argument('--timeout', type=float, default=30.0, help="等待全部加入的最长时间（秒）")
+    parser.add_argument('--settle', type=float, default=1.0, help="全部加入后等待多久再采样内存（秒）")
+    parser.add_argument('-o', '--output', help="JSON 输出路径")
+    parser.add_argument('--serve', choices=SERVERS, help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        serve(args.serve, args.port, args.backlog)
+        return
+
+    result = dict(environment=environment(), backlog=args.backlog, runs=[])
+    print(f"{'实现':<10}{'连接数':>8}{'加入数':>8}{'加入耗时(s)':>12}{'内存(MB)':>10}{'KB/连接':>10}{'线程数':>8}")
+    for count in args.clients:
+        for kind in args.servers:
+            stats = dict(server=kind, **run(kind, count, args))
+            result['runs'].append(stats)
+            join = '-' if stats['join_seconds'] is None else f"{stats['join_seconds']:.3f}"
+            print(f"{kind:<10}{count:>8}{stats['joined']:>8}{join:>12}{stats['rss_mb']:>10}"
+                  f"{stats['kb_per_client']:>10}{stats['threads']:>8}")
+    write_json('server', result, args.output)
+
+
+if __name__ == '__main__':
+    main()
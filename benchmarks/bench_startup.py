@@ -0,0 +1,120 @@
+"""启动耗时基准
+
+每次在新的子进程中测量：
+- 导入耗时：窗口显示前必须导入的模块（process、registry 等）各自的导入时间，
+  以及 python -X importtime 中累计耗时最长的模块；
+- 就绪耗时：startup.Startup 在后台并行加载模型与手部检测器直到全部就绪的时间。
+超过 --import-target / --target 时以非零状态退出，可放进 CI 守住启动时间。
+
+用法:
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --backend numpy --target 2.0
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from benchmarks.common import environment, write_json
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ('process', 'registry', 'interface', 'app')
+
+IMPORT_SCRIPT = """
+import time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+READY_SCRIPT = """
+import json, time
+start = time.perf_counter()
+from process import HeadlessWin, Identify
+from startup import Startup
+imported = time.perf_counter() - start
+startup = Startup(Identify(HeadlessWin(), backend={backend!r}), progress=lambda msg: None).start()
+startup.wait()
+print(json.dumps(dict(import_seconds=imported, ready_seconds=time.perf_counter() - start,
+                      tasks=startup.seconds, errors={{k: str(v) for k, v in startup.errors.items()}})))
+"""
+
+
+def run_python(code, *options):
+    result = subprocess.run([sys.executable, *options, '-c', code], cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "子进程失败")
+    return result
+
+
+def import_seconds(module):
+    return float(run_python(IMPORT_SCRIPT.format(module=module)).stdout.strip().splitlines()[-1])
+
+
+def top_imports(module, count=10):
+    """python -X importtime 中累计耗时最长的模块，返回 [(模块, 毫秒)]"""
+    stderr = run_python(f"import {module}", '-X', 'importtime').stderr
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        entries.append((name.strip(), int(cumulative) / 1e3))
+    return sorted(entries, key=lambda item: -item[1])[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="启动耗时基准")
+    parser.add_argument('--backend', default='torch', help="推理后端，见 registry.BACKENDS")
+    parser.add_argument('--repeat', type=int, default=3, help="重复次数，取中位数")
+    parser.add_argument('--import-target', type=float, default=1.0, help="导入 process 的耗时上限（秒）")
+    parser.add_argument('--target', type=float, default=5.0, help="后台加载全部就绪的耗时上限（秒）")
+    parser.add_argument('-o', '--output', help="JSON 输出路径")
+    args = parser.parse_args()
+
+    result = dict(environment=environment(), backend=args.backend, imports={}, top_imports={})
+    print(f"{'模块':<12}{'导入耗时(s)':>12}")
+    for module in MODULES:
+        try:
+            seconds = float(np.median([import_seconds(module) for _ in range(args.repeat)]))
+        except RuntimeError as e:
+            print(f"{module:<12}{'-':>12}  无法导入: {e}")
+            continue
+        result['imports'][module] = round(seconds, 4)
+        print(f"{module:<12}{seconds:>12.3f}")
+
+    result['top_imports']['process'] = top_imports('process')
+    print("\nprocess 导入中累计耗时最长的模块 (ms):")
+    for name, ms in result['top_imports']['process']:
+        print(f"  {name:<40}{ms:>10.1f}")
+
+    runs = [json.loads(run_python(READY_SCRIPT.format(backend=args.backend)).stdout.strip().splitlines()[-1])
+            for _ in range(args.repeat)]
+    result['ready'] = dict(
+        import_seconds=round(float(np.median([r['import_seconds'] for r in runs])), 4),
+        ready_seconds=round(float(np.median([r['ready_seconds'] for r in runs])), 4),
+        tasks={name: round(float(np.median([r['tasks'][name] for r in runs])), 4) for name in runs[0]['tasks']},
+        errors=runs[-1]['errors'],
+    )
+    ready = result['ready']
+    print(f"\n导入 process: {ready['import_seconds']:.3f}s，全部就绪: {ready['ready_seconds']:.3f}s，"
+          f"各任务: {', '.join(f'{k} {v:.3f}s' for k, v in ready['tasks'].items())}")
+    if ready['errors']:
+        print(f"加载失败: {ready['errors']}")
+
+    failed = []
+    if ready['import_seconds'] > args.import_target:
+        failed.append(f"导入耗时 {ready['import_seconds']:.3f}s 超过目标 {args.import_target}s")
+    if ready['ready_seconds'] > args.target:
+        failed.append(f"就绪耗时 {ready['ready_seconds']:.3f}s 超过目标 {args.target}s")
+    result['passed'] = not failed and not ready['errors']
+    write_json('startup', result, args.output)
+    if failed:
+        raise SystemExit('；'.join(failed))
+
+
+if __name__ == '__main__':
+    main()
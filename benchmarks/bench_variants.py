@@ -0,0 +1,108 @@
+"""模型变体的精度与单步延迟对比
+
+以 eager 模型为基准，在录制的关键点上逐帧推理各个后端（script、int8、numpy），统计：
+- 输出与 eager 的最大绝对误差、argmax 一致率；
+- 回放判定逻辑得到的手势序列是否与 eager 完全一致；
+- 单步推理延迟 p50/p95/p99。
+最后推荐判定完全一致、argmax 一致率不低于 --agreement 的最快后端。
+录制关键点的模型输出大多集中在"无"，另外用随机输入补充一组 argmax 对比。
+
+用法:
+    python -m benchmarks.bench_variants                  # 默认使用 videos/*.mkv
+    python -m benchmarks.bench_variants --decision lockout
+"""
+import argparse
+import glob
+import os
+import time
+
+import numpy as np
+
+from benchmarks.common import environment, percentiles, write_json
+from decision import DECISIONS, make_decision
+from features import FeatureBuilder
+from registry import BACKENDS, create_engine
+from recording import load_or_record, replay
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_sequences(engine, sequences):
+    """逐帧推理每段特征序列，返回 (各段输出, 单步耗时列表)"""
+    outputs, timings = [], []
+    for features in sequences:
+        stream = engine.add_stream()
+        rows = []
+        for x in features:
+            start = time.perf_counter()
+            out = stream.infer(x)
+            timings.append(time.perf_counter() - start)
+            rows.append(np.asarray(out, dtype=np.float32))
+        stream.close()
+        outputs.append(np.stack(rows))
+    return outputs, timings
+
+
+def recording_features(recording):
+    builder = FeatureBuilder()
+    return np.stack([builder.build_from_array(*recording.frame(i)).copy() for i in range(len(recording))])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="模型变体的精度与单步延迟对比")
+    parser.add_argument('clips', nargs='*', help="视频文件，默认 videos/*.mkv")
+    parser.add_argument('--decision', default='streaming', choices=sorted(DECISIONS), help="回放使用的判定逻辑")
+    parser.add_argument('--random', type=int, default=1000, help="随机输入的帧数，0 表示不测")
+    parser.add_argument('--agreement', type=float, default=0.999, help="推荐变体所需的 argmax 一致率")
+    parser.add_argument('-o', '--output', help="JSON 输出路径")
+    args = parser.parse_args()
+
+    clips = args.clips or sorted(glob.glob(os.path.join(ROOT, 'videos', '*.mkv')))
+    recordings = {os.path.basename(clip): load_or_record(clip) for clip in clips}
+    sequences = [recording_features(rec) for rec in recordings.values()]
+    if args.random:
+        rng = np.random.default_rng(0)
+        sequences.append(rng.normal(0, 0.5, (args.random, sequences[0].shape[1] if sequences else 126))
+                         .astype(np.float32))
+
+    engines = {backend: create_engine(backend) for backend in BACKENDS}
+    reference, _ = run_sequences(engines['torch'], sequences)
+    reference_events = {name: replay(rec, engines['torch'], make_decision(args.decision))
+                        for name, rec in recordings.items()}
+
+    result = dict(environment=environment(), decision=args.decision, frames=sum(len(s) for s in sequences),
+                  variants={})
+    for backend, engine in engines.items():
+        run_sequences(engine, sequences[:1])  # 预热
+        outputs, timings = run_sequences(engine, sequences)
+        error = max(float(np.abs(a - b).max()) for a, b in zip(outputs, reference))
+        agree = np.concatenate([a.argmax(1) == b.argmax(1) for a, b in zip(outputs, reference)])
+        random_agree = float(agree[-args.random:].mean()) if args.random else None
+        mismatched = [name for name, rec in recordings.items()
+                      if [(i, g) for i, _, g in replay(rec, engine, make_decision(args.decision))]
+                      != [(i, g) for i, _, g in reference_events[name]]]
+        result['variants'][backend] = dict(
+            max_abs_error=round(error, 6),
+            argmax_agreement=round(float(agree.mean()), 6),
+            random_argmax_agreement=None if random_agree is None else round(random_agree, 6),
+            decisions_match=not mismatched,
+            mismatched_clips=mismatched,
+            step_ms=percentiles(timings),
+        )
+
+    print(f"\n{'后端':<8}{'最大误差':>12}{'argmax一致':>12}{'随机输入':>10}{'判定一致':>10}{'p50':>9}{'p95':>9}{'p99':>9}  (ms)")
+    for backend, stats in result['variants'].items():
+        random_agree = stats['random_argmax_agreement']
+        print(f"{backend:<8}{stats['max_abs_error']:>12.2e}{stats['argmax_agreement']:>12.2%}"
+              f"{'-' if random_agree is None else f'{random_agree:.2%}':>10}{str(stats['decisions_match']):>10}"
+              f"{stats['step_ms']['p50']:>9.3f}{stats['step_ms']['p95']:>9.3f}{stats['step_ms']['p99']:>9.3f}")
+
+    candidates = [backend for backend, stats in result['variants'].items()
+                  if stats['decisions_match'] and stats['argmax_agreement'] >= args.agreement]
+    result['recommended'] = min(candidates, key=lambda b: result['variants'][b]['step_ms']['p50'])
+    print(f"推荐后端: {result['recommended']}")
+    write_json('variants', result, args.output)
+
+
+if __name__ == '__main__':
+    main()
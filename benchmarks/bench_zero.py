@@ -0,0 +1,124 @@
+"""零输入快速路径的正确性与收益
+
+把录制的关键点按"长时间无手 + 一段手势"拼接成一条时间线（无手间隔 --gap 帧，
+足以让隐藏状态收敛），分别关闭快速路径和使用各个收敛容差回放，统计：
+- 手势序列是否与关闭快速路径时完全一致，有手帧输出的最大绝对误差与 argmax 一致率；
+- 跳过模型调用的比例与总推理耗时。
+默认容差 batching.ZERO_TOLERANCE 下判定不一致、有手帧误差超过 --max-error 或 argmax
+一致率低于 100% 时以非零状态退出（streaming 判定可能一个手势都不出，只比较判定并不够）。
+
+用法:
+    python -m benchmarks.bench_zero
+    python -m benchmarks.bench_zero --tolerance 1e-3 1e-4 --backend numpy --decision lockout
+"""
+import argparse
+import glob
+import os
+import time
+
+import numpy as np
+
+from batching import ZERO_TOLERANCE
+from benchmarks.common import environment, write_json
+from decision import DECISIONS, make_decision
+from features import FeatureBuilder
+from recording import load_or_record
+from registry import BACKENDS, create_engine
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def timeline(recordings, gap, fps=30.0):
+    """拼接为 [(时间戳, 特征, 是否有手)]，每段录制前插入 gap 帧无手画面"""
+    builder = FeatureBuilder()
+    frames, now = [], 0.0
+    for recording in recordings:
+        for _ in range(gap):
+            now += 1.0 / fps
+            frames.append((now, None, False))
+        for i in range(len(recording)):
+            now += 1.0 / fps
+            has_hand = bool(recording.num_hands[i])
+            frames.append((now, builder.build_from_array(*recording.frame(i)).copy() if has_hand else None, has_hand))
+    return frames
+
+
+def replay(frames, engine, decision):
+    """回放时间线，返回 (手势事件, 有手帧输出, 跳过模型调用的帧数, 推理耗时)"""
+    zeros = np.zeros(engine.in_dim, dtype=np.float32)
+    stream = engine.add_stream()
+    events, outputs, cached, seconds = [], [], 0, 0.0
+    decision.reset(0.0)
+    try:
+        for i, (now, features, has_hand) in enumerate(frames):
+            x = zeros if features is None or decision.blocked(now) else features
+            start = time.perf_counter()
+            out = stream.infer(x)
+            seconds += time.perf_counter() - start
+            cached += stream.cached
+            if has_hand:
+                outputs.append(np.asarray(out, dtype=np.float32))
+            gesture = decision.update(out, now, has_hand)
+            if gesture:
+                if decision.reset_hidden:
+                    stream.reset()
+                events.append((i, gesture))
+    finally:
+        stream.close()
+    return events, np.stack(outputs), cached, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="零输入快速路径的正确性与收益")
+    parser.add_argument('clips', nargs='*', help="视频文件，默认 videos/*.mkv")
+    parser.add_argument('--tolerance', type=float, nargs='+', default=[1e-3, ZERO_TOLERANCE, 5e-5],
+                        help="要验证的收敛容差")
+    parser.add_argument('--gap', type=int, default=9000, help="每段手势前的无手帧数（默认 5 分钟）")
+    parser.add_argument('--backend', nargs='+', default=['torch', 'numpy'], help="推理后端，见 registry.BACKENDS")
+    parser.add_argument('--max-error', type=float, default=5e-3, help="默认容差下有手帧输出允许的最大绝对误差")
+    parser.add_argument('--decision', default='streaming', choices=sorted(DECISIONS), help="回放使用的判定逻辑")
+    parser.add_argument('-o', '--output', help="JSON 输出路径")
+    args = parser.parse_args()
+
+    unknown = set(args.backend) - set(BACKENDS)
+    if unknown:
+        parser.error(f"未知的后端: {', '.join(sorted(unknown))}")
+    clips = args.clips or sorted(glob.glob(os.path.join(ROOT, 'videos', '*.mkv')))
+    frames = timeline([load_or_record(clip) for clip in clips], args.gap)
+    result = dict(environment=environment(), decision=args.decision, frames=len(frames), gap=args.gap, backends={})
+
+    print(f"\n{'后端':<8}{'容差':>10}{'手势数':>8}{'判定一致':>10}{'有手帧误差':>12}{'argmax一致':>12}"
+          f"{'跳过比例':>10}{'推理耗时(s)':>12}")
+    failed = []
+    for backend in args.backend:
+        engine = create_engine(backend)
+        engine.zero_tolerance = None
+        reference, reference_out, _, reference_seconds = replay(frames, engine, make_decision(args.decision))
+        rows = {'off': dict(events=len(reference), decisions_match=True, max_abs_error=0.0, argmax_agreement=1.0,
+                            skip_ratio=0.0, seconds=round(reference_seconds, 3))}
+        for tolerance in args.tolerance:
+            engine.zero_tolerance = tolerance
+            events, outputs, cached, seconds = replay(frames, engine, make_decision(args.decision))
+            rows[f'{tolerance:g}'] = dict(events=len(events), decisions_match=events == reference,
+                                          max_abs_error=round(float(np.abs(outputs - reference_out).max()), 6),
+                                          argmax_agreement=round(float((outputs.argmax(1) == reference_out.argmax(1))
+                                                                       .mean()), 6),
+                                          skip_ratio=round(cached / len(frames), 4), seconds=round(seconds, 3))
+            stats = rows[f'{tolerance:g}']
+            if tolerance == ZERO_TOLERANCE and (not stats['decisions_match'] or stats['argmax_agreement'] < 1.0
+                                                or stats['max_abs_error'] > args.max_error):
+                failed.append(backend)
+        result['backends'][backend] = rows
+        for name, stats in rows.items():
+            print(f"{backend:<8}{name:>10}{stats['events']:>8}{str(stats['decisions_match']):>10}"
+                  f"{stats['max_abs_error']:>12.2e}{stats['argmax_agreement']:>12.2%}"
+                  f"{stats['skip_ratio']:>10.1%}{stats['seconds']:>12.3f}")
+
+    write_json('zero', result, args.output)
+    if failed:
+        raise SystemExit(f"默认容差 {ZERO_TOLERANCE:g} 下结果与关闭快速路径不一致（判定、argmax 或误差超过 "
+                         f"{args.max_error:g}）: {', '.join(failed)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""基准脚本共用的统计与结果输出"""
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+
+import numpy as np
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+def percentiles(samples, scale=1e3):
+    """返回 p50/p95/p99/mean/max，默认把秒换算为毫秒"""
+    if len(samples) == 0:
+        return dict(count=0)
+    values = np.asarray(samples, dtype=np.float64) * scale
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return dict(count=len(values), p50=round(p50, 4), p95=round(p95, 4), p99=round(p99, 4),
+                mean=round(float(values.mean()), 4), max=round(float(values.max()), 4))
+
+
+def peak_rss_mb():
+    """进程峰值常驻内存（MB），无法获取时返回 None"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux 单位为 KB，macOS 为字节
+        return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 2)
+    except ImportError:
+        pass
+    try:
+        import psutil
+        return round(psutil.Process().memory_info().peak_wset / (1024 * 1024), 2)
+    except (ImportError, AttributeError):
+        return None
+
+
+def current_rss_mb():
+    """进程当前常驻内存（MB），无法获取时返回 None"""
+    try:
+        with open('/proc/self/statm') as f:
+            return round(int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024), 2)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return round(psutil.Process().memory_info().rss / (1024 * 1024), 2)
+    except ImportError:
+        return None
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(RESULTS_DIR)).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def environment():
+    """记录提交与机器信息，便于跨提交、跨机器比较结果"""
+    return dict(
+        commit=git_commit(),
+        time=datetime.datetime.now().isoformat(timespec='seconds'),
+        host=platform.node(),
+        platform=platform.platform(),
+        machine=platform.machine(),
+        processor=platform.processor(),
+        cpu_count=os.cpu_count(),
+        python=platform.python_version(),
+    )
+
+
+def write_json(name, result, path=None):
+    """写出机器可读的结果，默认为 benchmarks/results/<name>-<commit>.json"""
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{name}-{result['environment']['commit']}.json")
+    with open(path, 'w', encoding='utf8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"结果已写入 {path}")
+    return path
@@ -0,0 +1,63 @@
+import numpy as np
+
+# 检测输入宽度档位（像素），按从大到小排列
+WIDTH_LADDER = (1920, 1280, 960, 640, 480, 320)
+
+
+class FrameBudget:
+    """按延迟 / CPU 预算自动选择检测分辨率与帧间隔
+
+    - 检测分辨率：hands.process 的 p95 耗时超过 detect_ms 时降一档，
+      长期低于一半预算时升一档；只等比缩小，关键点仍是归一化坐标，GRU 输入不变。
+    - 帧间隔：单帧处理耗时 / cpu 即为满足 CPU 占用上限所需的间隔，
+      例如每帧 30ms、cpu=0.5 时间隔为 60ms。
+    每 check_every 帧调整一次，只使用本周期内的样本。
+    """
+
+    def __init__(self, detect_ms=20.0, cpu=1.0, start_width=640, max_width=1280, min_width=320,
+                 min_interval=0.0, max_interval=0.5, check_every=30):
+        self.detect_ms = detect_ms
+        self.cpu = cpu
+        self.widths = [w for w in WIDTH_LADDER if min_width <= w <= max_width]
+        self.level = min(range(len(self.widths)), key=lambda i: abs(self.widths[i] - start_width))
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval  # 目标帧间隔（秒），代替原来固定为 0 的 S
+        self.check_every = check_every
+        self.detect_samples = []
+        self.frame_samples = []
+
+    @property
+    def width(self):
+        return self.widths[self.level]
+
+    def detect_size(self, width, height):
+        """返回送入检测器的 (宽, 高)，无需缩放时返回 None"""
+        if width <= self.width:
+            return None
+        return self.width, max(int(round(height * self.width / width)), 1)
+
+    def observe(self, detect_seconds, frame_seconds):
+        """记录一帧的检测耗时与处理总耗时（不含等待），返回本次是否做了调整"""
+        self.detect_samples.append(detect_seconds)
+        self.frame_samples.append(frame_seconds)
+        if len(self.detect_samples) < self.check_every:
+            return False
+        changed = self._adjust(np.percentile(self.detect_samples, 95) * 1e3,
+                               float(np.mean(self.frame_samples)))
+        self.detect_samples.clear()
+        self.frame_samples.clear()
+        return changed
+
+    def _adjust(self, detect_p95_ms, frame_cost):
+        level = self.level
+        if detect_p95_ms > self.detect_ms and self.level < len(self.widths) - 1:
+            self.level += 1
+        elif detect_p95_ms < self.detect_ms * 0.5 and self.level > 0:
+            self.level -= 1
+        interval = self.interval
+        if 0 < self.cpu < 1:
+            self.interval = float(np.clip(frame_cost / self.cpu, self.min_interval, self.max_interval))
+        if level != self.level:
+            print(f"检测分辨率调整为宽 {self.width}px（检测 p95 {detect_p95_ms:.1f}ms，预算 {self.detect_ms}ms）")
+        return level != self.level or abs(interval - self.interval) > 1e-3
@@ -0,0 +1,77 @@
+import threading
+import time
+from collections import deque
+
+from sources import FrameSource
+
+
+class CaptureThread(FrameSource):
+    """独立采集线程，包装任意 FrameSource
+
+    后台线程持续读帧，放入只保留最新 size 帧的环形缓冲区并记录采集时间。
+    识别循环 read() 时总是拿到最新一帧，更旧的帧直接丢弃，skipped 为本次
+    跳过的帧数，capture_time 为该帧的采集时间（time.perf_counter）。
+    """
+
+    def __init__(self, source, size=2, timeout=1.0):
+        self.source = source
+        self.frames = deque(maxlen=size)  # (序号, 采集时间, 图像)
+        self.timeout = timeout
+        self.cond = threading.Condition()
+        self.thread = None
+        self.running = False
+        self.seq = 0
+        self.consumed = 0
+
+    def open(self):
+        if not self.source.open():
+            return False
+        self.frames.clear()
+        self.seq = self.consumed = 0
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return True
+
+    def _run(self):
+        while self.running and self.source.isOpened():
+            success, frame = self.source.read()
+            now = time.perf_counter()
+            if not success or frame is None:
+                time.sleep(0.01)
+                continue
+            with self.cond:
+                self.seq += 1
+                self.frames.append((self.seq, now, frame))
+                self.cond.notify_all()
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+
+    def _has_new(self):
+        return bool(self.frames) and self.frames[-1][0] > self.consumed
+
+    def read(self):
+        with self.cond:
+            self.cond.wait_for(lambda: self._has_new() or not self.running, self.timeout)
+            if not self._has_new():
+                return False, None
+            seq, self.capture_time, frame = self.frames[-1]
+            self.skipped = seq - self.consumed - 1
+            self.consumed = seq
+            self.frames.clear()  # 比最新帧更旧的都已过期
+            return True, frame
+
+    def isOpened(self):
+        with self.cond:
+            return self.running or self._has_new()
+
+    def release(self):
+        self.running = False
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(self.timeout)
+        self.thread = None
+        self.source.release()
+
+    def size(self):
+        return self.source.size()
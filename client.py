@@ -2,7 +2,9 @@ import socket
 import threading
 import time
 
-from server_offline import ServerSocket
+from async_server import AsyncServer
+from linereader import LineReader
+from protocol import VERSION, MessageBuffer, encode
 
 
 class Client:
@@ -10,6 +12,9 @@ class Client:
         self.app = app
         self.type = 'receiver'
         self.client = None
+        self.reader = None
+        self.binary = False  # 服务端确认后改用二进制帧发送
+        self.seq = 0
         self.host = socket.gethostbyname(socket.gethostname())
         self.pingTimes = 0
         self.isPing = True
@@ -29,6 +34,8 @@ class Client:
                 pass
         self.client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.client.settimeout(5)  # 设置超时时间
+        self.reader = LineReader(self.client, buffer=MessageBuffer())
+        self.binary = False
 
     def run(self):
         max_retries = 3
@@ -65,8 +72,7 @@ class Client:
         # 如果都失败，启动本地服务器
         if not self.connected:
             print("正在启动本机服务端...")
-            self.start_server()
-            time.sleep(1)  # 等待服务器启动
+            self.start_server().ready.wait(5)  # 等待服务器开始监听
             
             for i in range(max_retries):
                 try:
@@ -91,9 +97,12 @@ class Client:
             while self.connected:
                 if self.app.win.type == 'receiver':
                     try:
-                        data = self.readline()
-                        if data:
-                            self.app.win.received.emit(data)
+                        message = self.receive()
+                        if message.kind == 'protocol':
+                            self.binary = True
+                            print("已改用二进制帧协议")
+                        elif message.kind:
+                            self.app.win.received.emit(message)
                     except Exception as e:
                         print(f"接收数据出错: {e}")
                         break
@@ -107,22 +116,13 @@ class Client:
                 except:
                     pass
 
-    def readline(self, size: int = 32 * 1024):
-        buf = b''
-        while len(buf) < size:
+    def receive(self):
+        """读取下一条消息（文本行或二进制帧），返回 protocol.Message"""
+        while True:
             try:
-                recv = self.client.recv(1)
-                if len(recv) == 0:
-                    raise Exception("连接已断开")
-                buf += recv
-                if buf[-1] == 10:
-                    break
+                return self.reader.readline()
             except socket.timeout:
-                continue
-            except Exception as e:
-                raise e
-        buf = buf[:-1]
-        return buf.decode('utf8')
+                continue  # 已读入的部分保留在缓冲区中
 
     def send(self, data):
         if not self.connected and self.client is None:
@@ -134,14 +134,23 @@ class Client:
         except Exception as e:
             print(f"发送数据失败: {e}")
 
+    def send_message(self, kind, *args):
+        """发送一条协议消息，协商成功后为二进制帧，否则为文本行"""
+        self.seq += 1
+        self.send(encode(kind, *args, binary=self.binary, seq=self.seq))
+
+    def join(self, name):
+        """发送用户名加入会议，并请求改用二进制帧（旧服务端会忽略）"""
+        self.send(name)
+        self.send(f"protocol {VERSION}")
+
     def start_server(self):
-        server = ServerSocket(self.host, 12345)
-        server.start()
+        return AsyncServer(self.host, 12345).start()
 
     def send_ping(self):
         if self.isPing and self.connected:
             print('ping')
-            self.send('ping')
+            self.send_message('ping')
             self.timer = threading.Timer(self.pingInterval, self.send_ping)
             self.timer.start()
 
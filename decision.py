@@ -0,0 +1,128 @@
+from collections import Counter, deque
+
+import numpy as np
+
+MOVEMENT = {0: "点击", 1: "平移", 2: "缩放", 3: "抓取", 4: "旋转", 5: "无", 6: "截图", 7: '放大'}
+CLASS_INDEX = {name: index for index, name in MOVEMENT.items()}
+# 各手势的置信度阈值
+CONFIDENCE = {'点击': 0.90, '平移': 0.90, '缩放': 0.99, '抓取': 0.985, '旋转': 0.99, '无': 0, '截图': 0.99, '放大': 0.9}
+# 各手势触发后的不应期（秒），抓取用于切换控制权，间隔更长
+REFRACTORY = {'抓取': 1.5}
+
+
+def sigmoid(out):
+    return 1.0 / (1.0 + np.exp(-np.asarray(out, dtype=np.float32)))
+
+
+class LockoutDecision:
+    """原有的判定逻辑
+
+    置信度超过该类阈值、且与上一次结果不同时触发手势；触发后 lockout 秒内
+    输入置零，期间不再触发。时间由调用方传入，回放录制数据时使用帧时间戳。
+    """
+
+    reset_hidden = True  # 触发后清零 GRU 隐藏状态
+
+    def __init__(self, lockout=2.0):
+        self.lockout = lockout
+        self.last_gesture = '无'
+        self.prin_time = 0.0
+
+    def reset(self, now):
+        self.last_gesture = '无'
+        self.prin_time = now
+
+    def blocked(self, now):
+        """是否处于触发后的锁定期，锁定期内模型输入应置零"""
+        return now - self.prin_time < self.lockout
+
+    def update(self, out, now, has_hand=True):
+        """输入一帧模型输出，返回触发的手势名，未触发返回 None"""
+        scores = sigmoid(out)
+        rel = int(scores.argmax())
+        gesture = MOVEMENT[rel]
+        if scores[rel] > CONFIDENCE[gesture]:
+            now_gesture = self.last_gesture
+            self.last_gesture = gesture
+            if not (now_gesture == gesture):
+                if now - self.prin_time > self.lockout:
+                    self.prin_time = now
+                    return gesture
+        return None
+
+
+class StreamingDecision:
+    """低延迟的流式判定
+
+    - 滞回：置信度超过该类阈值才计票，触发后要等置信度低于"阈值 - hysteresis"
+      才算松开，松开前同一手势不会重复触发；
+    - k-of-n 投票：最近 n 帧中某手势得票不少于 k 才成为候选；
+    - 去抖：候选需持续 debounce_frames 帧且 debounce_ms 毫秒；
+    - 不应期：每类手势触发后 refractory 秒内不再触发，其他手势不受影响。
+    不再把输入置零；"无"与无手帧只用于松开和占票，不会作为手势发出
+    （全零输入下模型也可能给出高置信度）。
+    """
+
+    reset_hidden = True
+
+    def __init__(self, thresholds=None, hysteresis=0.05, votes=(3, 5), debounce_frames=0, debounce_ms=0,
+                 refractory=None, default_refractory=0.6, idle='无'):
+        self.on = dict(CONFIDENCE, **(thresholds or {}))
+        self.off = {name: max(value - hysteresis, 0) for name, value in self.on.items()}
+        self.k, self.n = votes
+        self.debounce_frames = debounce_frames
+        self.debounce_ms = debounce_ms
+        self.refractory = dict(REFRACTORY, **(refractory or {}))
+        self.default_refractory = default_refractory
+        self.idle = idle
+        self.window = deque(maxlen=self.n)
+        self.reset(0.0)
+
+    def reset(self, now):
+        self.window.clear()
+        self.active = None  # 已触发、尚未松开的手势
+        self.candidate = None
+        self.candidate_since = now
+        self.candidate_frames = 0
+        self.last_fired = {}
+
+    def blocked(self, now):
+        return False
+
+    def update(self, out, now, has_hand=True):
+        scores = sigmoid(out)
+        rel = int(scores.argmax())
+        gesture = MOVEMENT[rel]
+
+        if self.active is not None and scores[CLASS_INDEX[self.active]] < self.off[self.active]:
+            self.active = None
+
+        vote = has_hand and gesture != self.idle and scores[rel] > self.on[gesture]
+        self.window.append(gesture if vote else None)
+        votes = Counter(label for label in self.window if label is not None).most_common(1)
+        winner = votes[0][0] if votes and votes[0][1] >= self.k else None
+        if winner != self.candidate:
+            self.candidate = winner
+            self.candidate_since = now
+            self.candidate_frames = 0
+        if winner is None:
+            return None
+        self.candidate_frames += 1
+        if self.candidate_frames < self.debounce_frames or (now - self.candidate_since) * 1000 < self.debounce_ms:
+            return None
+        if winner == self.active:
+            return None
+        if now - self.last_fired.get(winner, float('-inf')) < self.refractory.get(winner, self.default_refractory):
+            return None
+        self.active = winner
+        self.last_fired[winner] = now
+        self.window.clear()
+        return winner
+
+
+DECISIONS = {'streaming': StreamingDecision, 'lockout': LockoutDecision}
+
+
+def make_decision(name='streaming', **options):
+    """按名称创建判定逻辑：streaming（默认）或 lockout（原有的 2 秒锁定）"""
+    return DECISIONS[name](**options)
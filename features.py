@@ -0,0 +1,64 @@
+import numpy as np
+
+NUM_LANDMARKS = 21
+HAND_DIM = NUM_LANDMARKS * 3  # 每只手 21 个关键点 × (x, y, z)
+FEATURE_DIM = HAND_DIM * 2  # 两只手共 126 维
+
+# MediaPipe Hands 的检测参数，识别与录制共用
+HANDS_OPTIONS = dict(
+    static_image_mode=False,
+    max_num_hands=2,
+    min_detection_confidence=0.65,
+    min_tracking_confidence=0.5,
+)
+
+
+class FeatureBuilder:
+    """把 MediaPipe 的关键点结果写入预分配的 126 维 float32 缓冲区
+
+    布局与训练时一致：前 63 维放 index == 1 的手，后 63 维放 index == 0 的手；
+    两只手时以第一只手的 handedness 决定整体顺序。每帧复用同一块内存，
+    返回的 buffer 可直接用 torch.from_numpy 共享给模型输入。
+    """
+
+    def __init__(self):
+        self.buffer = np.zeros(FEATURE_DIM, dtype=np.float32)
+        self.slots = self.buffer.reshape(2, HAND_DIM)  # 两个槽位的视图，不复制数据
+        self.zeros = np.zeros(FEATURE_DIM, dtype=np.float32)  # 无手/锁定时的输入
+        self.has_hand = False
+
+    @staticmethod
+    def slot_order(first_index):
+        """第一只手 index == 1 时按原顺序放入槽位，否则反转"""
+        return (0, 1) if first_index == 1 else (1, 0)
+
+    def build(self, results):
+        """从 hands.process 的结果构建特征，无手时返回全零"""
+        hands = results.multi_hand_landmarks
+        if not hands:
+            return self.clear()
+        first_index = results.multi_handedness[0].classification[0].index
+        order = self.slot_order(first_index)
+        if len(hands) == 1:
+            self.slots[order[1]].fill(0)
+        for hand_landmarks, slot in zip(hands, order):
+            self.slots[slot] = [v for lm in hand_landmarks.landmark for v in (lm.x, lm.y, lm.z)]
+        self.has_hand = True
+        return self.buffer
+
+    def build_from_array(self, landmarks, first_index):
+        """从 (n, 21, 3) 的关键点数组构建特征，n 为 0、1 或 2"""
+        n = len(landmarks)
+        if n == 0:
+            return self.clear()
+        order = self.slot_order(first_index)
+        self.slots[list(order[:n])] = np.reshape(landmarks, (n, HAND_DIM))
+        if n == 1:
+            self.slots[order[1]].fill(0)
+        self.has_hand = True
+        return self.buffer
+
+    def clear(self):
+        self.buffer.fill(0)
+        self.has_hand = False
+        return self.buffer
@@ -0,0 +1,53 @@
+import time
+
+# 功耗档位：idle_after 秒内没有检测到手即进入空闲，空闲时按 idle_fps 处理画面
+PROFILES = {
+    'performance': dict(idle_after=None, idle_fps=None),
+    'balanced': dict(idle_after=10.0, idle_fps=10.0),
+    'eco': dict(idle_after=3.0, idle_fps=5.0),
+}
+
+
+class IdleGovernor:
+    """没有手时降低处理帧率的空闲调节器
+
+    连续 idle_after 秒没有检测到手后，帧间隔放宽到 1 / idle_fps；一旦检测到手，
+    下一帧立即恢复全速。降频期间被跳过的帧里没有手，输入本来就是全零，
+    catchup() 给出需要补推的零输入步数，让 GRU 的隐藏状态按帧数推进、与全速
+    运行时保持一致（模型按摄像头帧率的时间步训练），切回全速时无需重置。
+    """
+
+    def __init__(self, profile='balanced', max_catchup=30):
+        self.max_catchup = max_catchup  # 单帧最多补推的零输入步数
+        self.last_hand = time.perf_counter()
+        self.idle = False
+        self.set_profile(profile)
+
+    def set_profile(self, profile):
+        """切换功耗档位，可在运行中由界面调用"""
+        if profile not in PROFILES:
+            raise ValueError(f"未知的功耗档位: {profile}")
+        self.profile = profile
+        self.idle_after = PROFILES[profile]['idle_after']
+        self.idle_fps = PROFILES[profile]['idle_fps']
+        if self.idle_after is None:
+            self.idle = False
+
+    @property
+    def interval(self):
+        """空闲时的目标帧间隔（秒），非空闲为 0"""
+        return 1.0 / self.idle_fps if self.idle else 0.0
+
+    def catchup(self, skipped):
+        """本帧之前因降频被来源跳过的 skipped 帧中，需要以零输入补推的步数"""
+        return min(skipped, self.max_catchup) if self.idle else 0
+
+    def update(self, has_hand, now):
+        """反馈本帧是否检测到手，返回空闲状态是否发生变化"""
+        idle = self.idle
+        if has_hand:
+            self.last_hand = now
+            self.idle = False
+        elif self.idle_after is not None and now - self.last_hand >= self.idle_after:
+            self.idle = True
+        return idle != self.idle
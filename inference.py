@@ -0,0 +1,46 @@
+import torch
+
+from batching import ZERO_TOLERANCE, BatchEngine
+
+
+class InferenceEngine(BatchEngine):
+    """PyTorch 后端的批量推理引擎，批处理与线程逻辑见 batching.BatchEngine"""
+
+    def __init__(self, model, device=None, batch_window=0.002, zero_tolerance=ZERO_TOLERANCE):
+        self.device = device or torch.device('cpu')
+        super().__init__(model.to(self.device), batch_window, zero_tolerance)
+        # 隐藏状态与输入都按槽位常驻，每帧只做原地拷贝
+        self.h_t = torch.zeros(self.num_layers, 0, self.hidden_dim, device=self.device)
+        self.x = torch.zeros(0, 1, self.in_dim, device=self.device)
+
+    def _grow(self):
+        grow = torch.zeros(self.num_layers, 1, self.hidden_dim, device=self.device)
+        self.h_t = torch.cat((self.h_t, grow), dim=1)
+        self.x = torch.cat((self.x, torch.zeros(1, 1, self.in_dim, device=self.device)))
+
+    def _zero(self, slot):
+        self.h_t[:, slot].zero_()
+
+    def _write(self, slot, features):
+        self.x[slot, 0].copy_(torch.as_tensor(features), non_blocking=True)
+
+    def _hidden(self, slot):
+        return self.h_t[:, slot].cpu().numpy().copy()
+
+    def _run(self, x, h):
+        with torch.no_grad():
+            out, h_t = self.model((torch.as_tensor(x, device=self.device), torch.as_tensor(h, device=self.device)))
+        return out.cpu().numpy(), h_t.cpu().numpy()
+
+    def _forward(self, slots):
+        with torch.no_grad():
+            if len(slots) == self.h_t.shape[1]:
+                # 所有槽位都在本批次内（单路时总是如此），直接使用常驻张量
+                out, h_t = self.model((self.x, self.h_t))
+                self.h_t.copy_(h_t)
+                out = out[slots]
+            else:
+                index = torch.tensor(slots, device=self.device)
+                out, h_t = self.model((self.x.index_select(0, index), self.h_t.index_select(1, index)))
+                self.h_t.index_copy_(1, index, h_t)
+        return out.cpu()
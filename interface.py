@@ -3,8 +3,9 @@ import cv2
 
 from PyQt5 import QtGui
 from PyQt5.QtCore import QStringListModel, pyqtSignal
-from PyQt5.QtWidgets import QMainWindow, QMessageBox
+from PyQt5.QtWidgets import QAction, QActionGroup, QFileDialog, QMainWindow, QMessageBox
 
+from governor import PROFILES
 from ui import Ui_MainWindow
 from threading import Event
 from reaction import Reaction
@@ -13,7 +14,8 @@ from helpWin import HelpWin
 
 
 class Window(QMainWindow, Ui_MainWindow):
-    received = pyqtSignal(str)
+    received = pyqtSignal(object)  # 服务端消息，protocol.Message
+    progress = pyqtSignal(str)  # 后台启动任务的进度
 
     def __init__(self, app, parent=None):
         super(Window, self).__init__(parent)
@@ -26,6 +28,7 @@ class Window(QMainWindow, Ui_MainWindow):
         self._list_view_connected = False  # 防止重复绑定信号
 
         self.received.connect(self.get_data)
+        self.progress.connect(self.show_progress)
         self.isLogin = False
         self.isTarget = False
         self.isController = False
@@ -42,6 +45,15 @@ class Window(QMainWindow, Ui_MainWindow):
         self.action_tutorials.triggered.connect(self.show_tutorials_win)
         self.action_help.triggered.connect(self.show_help_win)
 
+        # 性能指标菜单
+        self.menu_metrics = self.menuBar.addMenu("性能")
+        self.action_metrics = QAction("查看性能指标", self)
+        self.action_metrics.triggered.connect(self.show_metrics)
+        self.menu_metrics.addAction(self.action_metrics)
+        self.action_dump_metrics = QAction("导出性能指标...", self)
+        self.action_dump_metrics.triggered.connect(self.dump_metrics)
+        self.menu_metrics.addAction(self.action_dump_metrics)
+
     def closeEvent(self, a0: QtGui.QCloseEvent) -> None:
         """窗口关闭事件，清理资源"""
         # 停止识别线程
@@ -54,7 +66,7 @@ class Window(QMainWindow, Ui_MainWindow):
     def join(self):
         self.name = self.lineEdit.text()
         if self.name != '':
-            self.app.client.send(self.name)  # 发送用户名
+            self.app.client.join(self.name)  # 发送用户名
             self.btn_join.setEnabled(False)
             self.lineEdit.setEnabled(False)
             self.btn_join.setText("已加入会议")
@@ -67,11 +79,11 @@ class Window(QMainWindow, Ui_MainWindow):
     def get_ctrl(self):
         if self.isLogin:
             if self.isController:
-                self.app.client.send("exchange_control")
+                self.app.client.send_message("exchange_control")
                 self.btn_get_ctrl.setText("获取控制")
                 self.btn_pause.setText("开始控制")
             else:
-                self.app.client.send("exchange_control")
+                self.app.client.send_message("exchange_control")
                 self.isController = True
                 self.btn_get_ctrl.setText("退出控制")
                 self.btn_pause.setText("开始控制")
@@ -81,7 +93,7 @@ class Window(QMainWindow, Ui_MainWindow):
 
     def switch_ctrl(self):
         if self.isController:
-            self.app.client.send("switch_control")
+            self.app.client.send_message("switch_control")
             self.btn_pause.setText("暂停控制" if self.btn_pause.text() == "开始控制" else "开始控制")
         else:
             self.show_error("未获得控制权")
@@ -89,26 +101,24 @@ class Window(QMainWindow, Ui_MainWindow):
     def switch_target(self):
         self.isTarget = self.checkBox.isChecked()
 
-    def get_data(self, data: str):
-        if data == 'pong':
+    def get_data(self, message):
+        """处理服务端消息，文本行与二进制帧都已由 protocol 解析为 Message"""
+        kind, args = message.kind, message.args
+        if kind == 'pong':
             return
-        elif data == 'ping':
+        elif kind == 'ping':
             self.app.client.timer.start()
             return
-        
-        splits = data.split(' ')
-        if not splits:
-            return
-            
-        if splits[0] == 'command':
-            if len(splits) > 1:
-                self.set_log("控制者发出指令：" + splits[1])
+
+        if kind == 'command':
+            if args:
+                self.set_log("控制者发出指令：" + args[0])
                 if self.isTarget:
-                    self.reaction.react(splits[1])
+                    self.reaction.react(args[0])
 
-        elif splits[0] == 'change_controller':
+        elif kind == 'change_controller':
             self.isControlling = False
-            controller_name = splits[1] if len(splits) > 1 else ''
+            controller_name = args[0] if args else ''
             self.label_controller.setText(
                 ("正在控制：" if self.isControlling else "控制已暂停：") + controller_name
             )
@@ -119,18 +129,18 @@ class Window(QMainWindow, Ui_MainWindow):
                 self.isController = False
                 self.btn_get_ctrl.setText("获取控制")
                 
-        elif splits[0] == 'control_switched':
+        elif kind == 'control_switched':
             self.isControlling = not self.isControlling
-            controller_name = splits[1] if len(splits) > 1 else ''
+            controller_name = args[0] if args else ''
             self.label_controller.setText(
                 ("正在控制：" if self.isControlling else "控制已暂停：") + controller_name
             )
             
-        elif splits[0] == 'member_list':
-            self.member_list = splits[1:]
+        elif kind == 'member_list':
+            self.member_list = list(args)
             self.init_list_view()
-            
-        elif splits[0] == 'duplicate_name':
+
+        elif kind == 'duplicate_name':
             self.show_error("用户名已存在，请修改")
             self.lineEdit.setEnabled(True)
             self.lineEdit.setFocus()
@@ -156,13 +166,17 @@ class Window(QMainWindow, Ui_MainWindow):
                 return
             if self.isController:
                 self.set_log("你发出了指令：" + msg)
-                self.app.client.send("command " + msg)
+                self.app.client.send_message("command", msg)
                 return
 
     def set_log(self, msg):
         self.textBrowser.append(time.strftime("(%H:%M:%S)", time.localtime()) + ' ' + msg)
         self.textBrowser.moveCursor(self.textBrowser.textCursor().End)
 
+    def show_progress(self, msg):
+        self.statusBar().showMessage(msg)
+        self.set_log(msg)
+
     def flash_img(self, image, ratio):
         """更新摄像头画面"""
         try:
@@ -212,3 +226,48 @@ class Window(QMainWindow, Ui_MainWindow):
 
     def show_help_win(self):
         HelpWin().exec_()
+
+    def show_metrics(self):
+        snapshot = self.app.identify.metrics.snapshot()
+        counters = snapshot['counters']
+        lines = [f"当前帧率: {snapshot['fps']} FPS",
+                 f"已处理帧: {counters['frames_total']}  丢帧: {counters['frames_dropped']}  "
+                 f"无手帧: {counters['frames_no_hand']}",
+                 f"静止跳过检测: {counters['frames_gated']} 帧（{snapshot['gauges'].get('gate_skip_ratio', 0):.0%}），"
+                 f"约节省 {counters['detect_seconds_saved']:.1f}s",
+                 "触发手势: " + (', '.join(f"{k}×{v}" for k, v in snapshot['gestures'].items()) or "无"),
+                 "", "各阶段耗时 p50 / p95 / p99 (ms):"]
+        for stage, stats in snapshot['stages_ms'].items():
+            lines.append(f"{stage}: {stats['p50']} / {stats['p95']} / {stats['p99']}")
+        QMessageBox.information(self, "性能指标", '\n'.join(lines))
+
+    def init_power_menu(self, governor):
+        """功耗档位菜单，长时间无手时降低识别帧率；识别对象创建后由 App 调用"""
+        self.menu_power = self.menuBar.addMenu("功耗")
+        self.power_group = QActionGroup(self)
+        for profile in PROFILES:
+            action = QAction(self.power_label(profile), self, checkable=True)
+            action.setChecked(profile == governor.profile)
+            action.triggered.connect(lambda checked, profile=profile: self.set_power(profile))
+            self.power_group.addAction(action)
+            self.menu_power.addAction(action)
+
+    @staticmethod
+    def power_label(profile):
+        options = PROFILES[profile]
+        if options['idle_after'] is None:
+            return f"{profile}（始终全速）"
+        return f"{profile}（无手 {options['idle_after']:g} 秒后降到 {options['idle_fps']:g} FPS）"
+
+    def set_power(self, profile):
+        self.app.identify.governor.set_profile(profile)
+        self.set_log("功耗档位：" + self.power_label(profile))
+
+    def dump_metrics(self):
+        path, _ = QFileDialog.getSaveFileName(self, "导出性能指标", "metrics.json", "JSON (*.json)")
+        if path:
+            try:
+                self.app.identify.metrics.dump(path)
+                self.set_log("性能指标已导出：" + path)
+            except OSError as e:
+                self.show_error(f"导出失败: {e}")
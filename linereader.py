@@ -0,0 +1,105 @@
+"""按行拆分网络数据的缓冲读取，服务端与客户端共用
+
+旧实现每读一个字节调用一次 recv(1)，并用 bytes += 拼接，每条消息都是逐字节的系统调用
+加平方级的拷贝。这里改为大块读入一个复用的 bytearray，在其中查找换行符拆出完整行
+（一次读入可包含多行），行直接从缓冲区解码，单行长度上限只比较下标、不拷贝数据。
+- LineBuffer：与 IO 无关的缓冲区，asyncio 的 data_received 用 feed() 写入；
+- LineReader：包装阻塞 socket，recv_into 直接读进缓冲区的空闲部分。
+子类可重写 LineBuffer.take() 按其他格式拆分消息（见 protocol.MessageBuffer）。
+"""
+LINE_LIMIT = 32 * 1024  # 单行最大字节数（不含换行符）
+
+
+class LineTooLong(ValueError):
+    """单行超过长度上限"""
+
+
+class LineBuffer:
+    """行缓冲区：数据位于 buffer[start:end]，按需扩容，最大为 limit 加一块"""
+
+    def __init__(self, limit=LINE_LIMIT, chunk_size=4096):
+        self.limit = limit
+        self.chunk_size = chunk_size  # 每次至少留出的空闲空间，也是初始大小
+        self.buffer = bytearray()
+        self.start = 0
+        self.end = 0
+
+    @property
+    def pending(self):
+        """尚未组成完整行的字节数"""
+        return self.end - self.start
+
+    def next_line(self):
+        """取出下一行（不含换行符）并解码，没有完整行时返回 None"""
+        index = self.buffer.find(b'\n', self.start, self.end)
+        if index < 0:
+            if self.end - self.start > self.limit:
+                raise LineTooLong(f"单行超过 {self.limit} 字节")
+            return None
+        if index - self.start > self.limit:
+            raise LineTooLong(f"单行超过 {self.limit} 字节")
+        start, self.start = self.start, index + 1  # 先越过这一行，解码失败时不会反复读到它
+        line = str(memoryview(self.buffer)[start:index], 'utf8')
+        if self.start == self.end:
+            self.start = self.end = 0
+        return line
+
+    def take(self):
+        """取出下一条完整的消息，没有时返回 None；默认即 next_line()"""
+        return self.next_line()
+
+    def writable(self):
+        """返回可写入的空闲区域（memoryview，用完需释放），调用方写入 n 字节后调用 commit(n)
+
+        空闲空间不足一块时先把未完成的行移到开头，仍不足再扩容。
+        """
+        if len(self.buffer) - self.end < self.chunk_size:
+            if self.start:
+                pending = self.end - self.start
+                self.buffer[:pending] = self.buffer[self.start:self.end]
+                self.start, self.end = 0, pending
+            size = len(self.buffer)
+            if size - self.end < self.chunk_size and size < self.limit + self.chunk_size:
+                self.buffer.extend(bytes(min(max(size, self.chunk_size), self.limit + self.chunk_size - size)))
+        return memoryview(self.buffer)[self.end:]
+
+    def commit(self, size):
+        self.end += size
+
+    def feed(self, data):
+        """写入收到的一段数据，逐个产出其中的完整消息"""
+        data = memoryview(data)
+        while data:
+            with self.writable() as space:
+                size = min(len(space), len(data))
+                space[:size] = data[:size]
+            self.commit(size)
+            data = data[size:]
+            message = self.take()
+            while message is not None:
+                yield message
+                message = self.take()
+
+
+class LineReader:
+    """阻塞 socket 的按行读取，buffer 为 LineBuffer 子类时按其格式读取消息"""
+
+    def __init__(self, sock, limit=LINE_LIMIT, chunk_size=4096, buffer=None):
+        self.socket = sock
+        self.buffer = buffer or LineBuffer(limit, chunk_size)
+
+    def readline(self):
+        """读取一行（不含换行符）或一条消息；连接断开时抛出 ConnectionError，超长时抛出 LineTooLong
+
+        socket 设置了超时时 recv_into 可能抛出 socket.timeout，已读入的数据保留在缓冲区，
+        可直接重试。
+        """
+        line = self.buffer.take()
+        while line is None:
+            with self.buffer.writable() as space:
+                size = self.socket.recv_into(space)
+            if not size:
+                raise ConnectionError("连接已断开")
+            self.buffer.commit(size)
+            line = self.buffer.take()
+        return line
@@ -0,0 +1,97 @@
+"""会议成员索引，服务端共用
+
+原来成员保存在列表中，按名字查找、判断重名、找接收者、控制权交接都要遍历全部连接，
+控制者出栈时还会在循环里反复构造 [c.name for c in clients]。这里改为：
+- by_name：用户名 -> 连接，按加入顺序排列，查找、加入、离开都是 O(1)；
+- 角色集合：receiver / controller 各一个按加入顺序的集合，广播指令只遍历接收者；
+- 控制者栈：离开的成员不立即从栈中删除，出栈或查看栈顶时跳过，每个名字最多被跳过一次，
+  均摊 O(1)；离开的人积压过多时整体清理一次，栈的长度不会无限增长。
+成员名列表在成员变化时才重新生成。
+"""
+
+
+class Members:
+    """按用户名索引的会议成员；迭代时按加入顺序给出连接
+
+    连接需要有 name 与 type 属性，type 为 'receiver' 或 'controller'，修改角色要通过
+    set_type()，角色集合才能保持一致。
+    """
+
+    def __init__(self):
+        self.by_name = {}
+        self.roles = {'receiver': {}, 'controller': {}}  # dict 当作有序集合使用
+        self.stack = []  # 控制者栈（用户名），可能含已离开的成员
+        self._names = None
+
+    def __len__(self):
+        return len(self.by_name)
+
+    def __iter__(self):
+        return iter(self.by_name.values())
+
+    def __contains__(self, name):
+        return name in self.by_name
+
+    def get(self, name):
+        return self.by_name.get(name)
+
+    @property
+    def names(self):
+        """按加入顺序的成员名元组"""
+        if self._names is None:
+            self._names = tuple(self.by_name)
+        return self._names
+
+    @property
+    def receivers(self):
+        return self.roles['receiver'].keys()
+
+    @property
+    def controllers(self):
+        return self.roles['controller'].keys()
+
+    def add(self, client):
+        if client.name in self.by_name:
+            raise ValueError(f"成员已存在: {client.name}")
+        self.by_name[client.name] = client
+        self.roles.setdefault(client.type, {})[client] = None
+        self._names = None
+
+    def remove(self, client):
+        """移除连接，不在会议中时忽略；返回是否移除"""
+        if self.by_name.get(client.name) is not client:
+            return False
+        del self.by_name[client.name]
+        for members in self.roles.values():
+            members.pop(client, None)
+        self._names = None
+        if len(self.stack) > 2 * len(self.by_name) + 16:
+            self.stack = [name for name in self.stack if name in self.by_name]
+        return True
+
+    def set_type(self, client, type):
+        if client.name in self.by_name:
+            self.roles.get(client.type, {}).pop(client, None)
+            self.roles.setdefault(type, {})[client] = None
+        client.type = type
+
+    def push(self, name):
+        """成员入栈，已在栈顶时不重复入栈"""
+        if name in self.by_name and (not self.stack or self.stack[-1] != name):
+            self.stack.append(name)
+
+    def pop(self):
+        """弹出当前控制者，并跳过栈顶已离开的成员"""
+        if self.stack:
+            self.stack.pop()
+        self._skip_departed()
+
+    def top(self):
+        """当前控制者的用户名，栈为空时为 ''"""
+        self._skip_departed()
+        return self.stack[-1] if self.stack else ''
+
+    def _skip_departed(self):
+        stack, by_name = self.stack, self.by_name
+        while stack and stack[-1] not in by_name:
+            stack.pop()
@@ -0,0 +1,247 @@
+import bisect
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Identify.run 每帧依次经过的阶段
+STAGES = ('read', 'preprocess', 'detect', 'draw', 'features', 'display', 'gru', 'decision')
+# Prometheus 直方图的桶上界（秒）
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+# 计数器名称 -> 说明
+COUNTERS = {
+    'frames_total': "处理完成的帧数",
+    'frames_dropped': "读取失败的帧数",
+    'frames_skipped': "推理跟不上时被丢弃的过期帧数",
+    'frames_no_hand': "未检测到手的帧数",
+    'frames_gated': "画面静止而跳过手部检测的帧数",
+    'detect_seconds_saved': "跳过检测估计节省的检测时间（秒）",
+    'roi_hits': "在手部裁剪区域内检测到手的帧数",
+    'roi_misses': "裁剪区域跟丢、退回整幅检测的帧数",
+    'model_swaps': "运行中热替换模型的次数",
+    'pause_releases': "长时间暂停而释放摄像头与检测器的次数",
+    'frames_idle': "无手降频期间处理的帧数",
+    'idle_catchup_steps': "降频跳过的帧以零输入补推 GRU 的步数",
+    'gru_steps_skipped': "隐藏状态已收敛、零输入直接复用缓存输出的帧数",
+}
+
+
+class StageTimer:
+    """识别流水线的分阶段计时
+
+    每帧开始时调用 start()，每个阶段结束时调用 lap(stage)，记录距上一次
+    lap 的耗时（秒），end_frame() 记录整帧耗时。keep_samples 为 True 时保留全部样本
+    供基准测试统计；某些帧会跳过部分阶段，整帧耗时要用 frame_samples，不能把各阶段相加。
+    """
+
+    def __init__(self, keep_samples=False):
+        self.samples = {stage: [] for stage in STAGES} if keep_samples else None
+        self.frame_samples = [] if keep_samples else None
+        self.last = 0.0
+        self.frame_start = 0.0
+        self.frames = 0
+
+    def start(self):
+        self.last = self.frame_start = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        if self.samples is not None:
+            self.samples[stage].append(now - self.last)
+        self.last = now
+        return now
+
+    def end_frame(self):
+        self.frames += 1
+        if self.frame_samples is not None:
+            self.frame_samples.append(time.perf_counter() - self.frame_start)
+
+
+class RollingHistogram:
+    """最近 window 个样本的环形缓冲区，外加累计的 Prometheus 分桶计数"""
+
+    def __init__(self, window=1024):
+        self.window = [0.0] * window
+        self.index = 0
+        self.filled = 0
+        self.buckets = [0] * (len(BUCKETS) + 1)  # 最后一个桶为 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.window[self.index] = value
+        self.index = (self.index + 1) % len(self.window)
+        self.filled = min(self.filled + 1, len(self.window))
+        self.buckets[bisect.bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantiles(self, qs=(0.5, 0.95, 0.99)):
+        """滚动窗口内的分位数（秒）"""
+        values = sorted(self.window[:self.filled])
+        if not values:
+            return {q: 0.0 for q in qs}
+        return {q: values[min(int(q * len(values)), len(values) - 1)] for q in qs}
+
+
+class PipelineMetrics(StageTimer):
+    """常驻的流水线指标：分阶段滚动直方图、计数器与实时帧率
+
+    由识别线程写入，界面、导出和 HTTP 端点通过 snapshot()/to_prometheus() 读取。
+    """
+
+    def __init__(self, window=1024, keep_samples=False):
+        super().__init__(keep_samples)
+        self.lock = threading.Lock()
+        self.histograms = {stage: RollingHistogram(window) for stage in STAGES}
+        self.frame_histogram = RollingHistogram(window)
+        self.age_histogram = RollingHistogram(window)  # 采集到判定完成的帧龄
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.gestures = {}
+        self.gauges = {}
+        self.fps = 0.0
+        self.fps_frames = 0
+        self.fps_time = time.perf_counter()
+
+    def lap(self, stage):
+        last = self.last
+        now = super().lap(stage)
+        with self.lock:
+            self.histograms[stage].observe(now - last)
+        return now
+
+    def end_frame(self):
+        super().end_frame()
+        now = time.perf_counter()
+        with self.lock:
+            self.frame_histogram.observe(now - self.frame_start)
+            self.counters['frames_total'] += 1
+            self.fps_frames += 1
+            if now - self.fps_time >= 1.0:
+                self.fps = self.fps_frames / (now - self.fps_time)
+                self.fps_frames = 0
+                self.fps_time = now
+
+    def observe_age(self, seconds):
+        with self.lock:
+            self.age_histogram.observe(seconds)
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def set_gauge(self, name, value):
+        with self.lock:
+            self.gauges[name] = value
+
+    def gesture(self, name):
+        with self.lock:
+            self.gestures[name] = self.gestures.get(name, 0) + 1
+
+    def _summaries(self):
+        """各阶段以及整帧耗时、帧龄的滚动直方图"""
+        return list(self.histograms.items()) + [('frame', self.frame_histogram), ('age', self.age_histogram)]
+
+    def current_fps(self):
+        """最近一秒的帧率；循环停顿超过 2 秒时按停顿期间实际完成的帧数计算"""
+        elapsed = time.perf_counter() - self.fps_time
+        if elapsed < 2.0:
+            return self.fps
+        return self.fps_frames / elapsed
+
+    def snapshot(self):
+        """当前指标的字典形式，延迟单位为毫秒"""
+        with self.lock:
+            stages = {}
+            for stage, hist in self._summaries():
+                q = hist.quantiles()
+                stages[stage] = dict(p50=round(q[0.5] * 1e3, 3), p95=round(q[0.95] * 1e3, 3),
+                                     p99=round(q[0.99] * 1e3, 3), count=hist.count)
+            return dict(time=time.time(), fps=round(self.current_fps(), 2), counters=dict(self.counters),
+                        gestures=dict(self.gestures), gauges=dict(self.gauges), stages_ms=stages)
+
+    def dump(self, path):
+        with open(path, 'w', encoding='utf8') as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+        return path
+
+    def to_prometheus(self):
+        """Prometheus 文本格式"""
+        lines = []
+        with self.lock:
+            lines.append('# HELP gesture_stage_seconds 各阶段耗时')
+            lines.append('# TYPE gesture_stage_seconds histogram')
+            for stage, hist in self.histograms.items():
+                cumulative = 0
+                for le, n in zip(BUCKETS + ('+Inf',), hist.buckets):
+                    cumulative += n
+                    lines.append(f'gesture_stage_seconds_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+                lines.append(f'gesture_stage_seconds_sum{{stage="{stage}"}} {hist.sum:.6f}')
+                lines.append(f'gesture_stage_seconds_count{{stage="{stage}"}} {hist.count}')
+            lines.append('# HELP gesture_stage_latency_seconds 最近窗口内的各阶段耗时分位数')
+            lines.append('# TYPE gesture_stage_latency_seconds summary')
+            for stage, hist in self._summaries():
+                for q, value in hist.quantiles().items():
+                    lines.append(f'gesture_stage_latency_seconds{{stage="{stage}",quantile="{q}"}} {value:.6f}')
+            for name, value in self.counters.items():
+                metric = f'gesture_{name}' if name.endswith('_total') else f'gesture_{name}_total'
+                lines.append(f'# HELP {metric} {COUNTERS.get(name, name)}')
+                lines.append(f'# TYPE {metric} counter')
+                lines.append(f'{metric} {value}')
+            lines.append('# HELP gesture_gestures_emitted_total 触发的手势次数')
+            lines.append('# TYPE gesture_gestures_emitted_total counter')
+            for name, value in self.gestures.items():
+                lines.append(f'gesture_gestures_emitted_total{{gesture="{name}"}} {value}')
+            lines.append('# HELP gesture_fps 当前实际帧率')
+            lines.append('# TYPE gesture_fps gauge')
+            lines.append(f'gesture_fps {self.current_fps():.2f}')
+            for name, value in self.gauges.items():
+                lines.append(f'# TYPE gesture_{name} gauge')
+                lines.append(f'gesture_{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsServer(threading.Thread):
+    """本机 HTTP 端点：/metrics 为 Prometheus 文本，/metrics.json 为 JSON 快照"""
+
+    def __init__(self, metrics, host='127.0.0.1', port=9108):
+        super().__init__(daemon=True)
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self.httpd = None
+
+    def run(self):
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/metrics':
+                    body = metrics.to_prometheus().encode('utf8')
+                    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+                elif self.path == '/metrics.json':
+                    body = json.dumps(metrics.snapshot(), ensure_ascii=False).encode('utf8')
+                    content_type = 'application/json; charset=utf-8'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            self.httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        except OSError as e:
+            print(f"指标端点启动失败: {e}")
+            return
+        print(f"指标端点: http://{self.host}:{self.port}/metrics")
+        self.httpd.serve_forever()
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
@@ -0,0 +1,62 @@
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """hands.process 之前的低成本运动门控
+
+    把画面缩到 width 宽的灰度小图，与上一帧逐像素做差，变化像素比例低于
+    threshold 视为静止。画面静止且最近 hold 帧都没有手时跳过检测，由调用方
+    送入"无手"的全零特征；一旦出现运动立即恢复检测。每 refresh 帧强制检测一次。
+    """
+
+    def __init__(self, enabled=True, width=64, pixel_delta=12, threshold=0.004, hold=15, refresh=30):
+        self.enabled = enabled
+        self.width = width
+        self.pixel_delta = pixel_delta  # 灰度差超过该值的像素视为变化
+        self.threshold = threshold  # 变化像素比例阈值
+        self.hold = hold
+        self.refresh = refresh
+        self.previous = None
+        self.diff = None
+        self.since_hand = hold  # 距离上次检测到手的帧数
+        self.since_detect = 0
+        self.checked = 0
+        self.skipped = 0
+        self.detect_ema = 0.0  # 检测耗时的指数滑动平均（秒），用于估算节省的时间
+
+    def motion(self, image):
+        """返回本帧相对上一帧的变化像素比例"""
+        h, w = image.shape[:2]
+        size = (self.width, max(int(h * self.width / w), 1))
+        gray = cv2.cvtColor(cv2.resize(image, size, interpolation=cv2.INTER_LINEAR), cv2.COLOR_BGR2GRAY)
+        if self.previous is None or self.previous.shape != gray.shape:
+            self.previous = gray
+            self.diff = np.empty_like(gray)
+            return 1.0
+        cv2.absdiff(gray, self.previous, dst=self.diff)
+        self.previous = gray
+        return np.count_nonzero(self.diff > self.pixel_delta) / self.diff.size
+
+    def should_detect(self, image):
+        """判断本帧是否需要运行手部检测"""
+        if not self.enabled:
+            return True
+        self.checked += 1
+        moving = self.motion(image) >= self.threshold
+        if moving or self.since_hand < self.hold or self.since_detect >= self.refresh:
+            self.since_detect = 0
+            return True
+        self.since_detect += 1
+        self.skipped += 1
+        return False
+
+    def update(self, has_hand, detect_seconds=None):
+        """检测后反馈结果：是否有手以及本次检测耗时"""
+        self.since_hand = 0 if has_hand else self.since_hand + 1
+        if detect_seconds is not None:
+            self.detect_ema = detect_seconds if self.detect_ema == 0 else 0.9 * self.detect_ema + 0.1 * detect_seconds
+
+    @property
+    def skip_ratio(self):
+        return self.skipped / self.checked if self.checked else 0.0
@@ -0,0 +1,188 @@
+"""纯 NumPy 的 GRU 推理后端
+
+模型只有两层 hidden=30 的 GRU 加一个 Linear 和 PReLU，用 NumPy 逐步计算即可。
+权重从 model.pt 导出一次，缓存为同目录的 model.npz（记录 model.pt 的 sha256，
+model.pt 更新后自动重新导出）。只有导出时需要 torch，推理与加载缓存都不会导入 torch。
+
+用法:
+    python numpy_gru.py            # 与 torch 对比输出，model.npz 过期时才重新导出
+    python numpy_gru.py --export   # 无论是否过期都重新导出 model.npz
+"""
+import argparse
+import hashlib
+import os
+
+import numpy as np
+
+from batching import ZERO_TOLERANCE, BatchEngine
+
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model.pt')
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+class NumpyGRU:
+    """与 GRU / GRULegacy 的 forward 数值一致的 NumPy 实现
+
+    forward((x, h_0)) 中 x 为 (batch, seq, in_dim)，h_0 为 (num_layer, batch, hidden)，
+    返回 (out, h_t)，与 torch 版本相同。门的排列与 torch.nn.GRU 一致：r、z、n。
+    """
+
+    def __init__(self, weights):
+        self.num_layer = int(weights['num_layer'])
+        self.w_ih = [np.ascontiguousarray(weights[f'weight_ih_l{k}'].T) for k in range(self.num_layer)]
+        self.w_hh = [np.ascontiguousarray(weights[f'weight_hh_l{k}'].T) for k in range(self.num_layer)]
+        self.b_ih = [weights[f'bias_ih_l{k}'] for k in range(self.num_layer)]
+        self.b_hh = [weights[f'bias_hh_l{k}'] for k in range(self.num_layer)]
+        self.w_out = np.ascontiguousarray(weights['linear_weight'].T)
+        self.b_out = weights['linear_bias']
+        self.prelu = weights['prelu_weight']
+        self.in_dim = self.w_ih[0].shape[0]
+        self.hidden_dim = self.w_hh[0].shape[0]
+        self.num_classes = self.w_out.shape[1]
+
+    def __call__(self, inputs):
+        return self.forward(inputs)
+
+    def forward(self, inputs):
+        x, h_0 = inputs
+        x = np.asarray(x, dtype=np.float32)
+        H = self.hidden_dim
+        h_t = np.empty((self.num_layer, x.shape[0], H), dtype=np.float32)
+        layer_input = x
+        for k in range(self.num_layer):
+            h = np.asarray(h_0[k], dtype=np.float32)
+            gi_all = layer_input @ self.w_ih[k] + self.b_ih[k]  # 所有时间步的输入投影一次算完
+            outputs = []
+            for t in range(x.shape[1]):
+                gi = gi_all[:, t]
+                gh = h @ self.w_hh[k] + self.b_hh[k]
+                r = _sigmoid(gi[:, :H] + gh[:, :H])
+                z = _sigmoid(gi[:, H:2 * H] + gh[:, H:2 * H])
+                n = np.tanh(gi[:, 2 * H:] + r * gh[:, 2 * H:])
+                h = n + z * (h - n)  # 即 (1 - z) * n + z * h
+                outputs.append(h)
+            h_t[k] = h
+            layer_input = np.stack(outputs, axis=1)  # 层间 dropout 只在训练时生效
+        out = h_t[-1] @ self.w_out + self.b_out
+        out = np.where(out >= 0, out, self.prelu * out)
+        return out, h_t
+
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def export_weights(model_path=MODEL_PATH, npz_path=None):
+    """从 model.pt 导出权重到 .npz，需要 torch"""
+    from GRU import load_model
+
+    npz_path = npz_path or os.path.splitext(model_path)[0] + '.npz'
+    model = load_model(model_path)
+    gru, linear, prelu = model.lstm, model.classes[0], model.relu
+    weights = dict(num_layer=np.int64(model.num_layer), source_sha256=np.array(file_hash(model_path)),
+                   linear_weight=linear.weight, linear_bias=linear.bias, prelu_weight=prelu.weight)
+    for k in range(model.num_layer):
+        for name in ('weight_ih', 'weight_hh', 'bias_ih', 'bias_hh'):
+            weights[f'{name}_l{k}'] = getattr(gru, f'{name}_l{k}')
+    weights = {key: value.detach().cpu().numpy().astype(np.float32) if hasattr(value, 'detach') else value
+               for key, value in weights.items()}
+    np.savez(npz_path, **weights)
+    print(f"权重已导出到 {npz_path}")
+    return npz_path
+
+
+def load_npz(npz_path):
+    """直接读取 .npz 权重，不与 model.pt 比对"""
+    with np.load(npz_path) as data:
+        return NumpyGRU(dict(data))
+
+
+def load_numpy_model(model_path=MODEL_PATH, npz_path=None):
+    """读取缓存的 .npz 权重，缓存缺失或与 model.pt 不一致时重新导出"""
+    npz_path = npz_path or os.path.splitext(model_path)[0] + '.npz'
+    if os.path.exists(npz_path):
+        with np.load(npz_path) as data:
+            weights = dict(data)
+        if not os.path.exists(model_path) or str(weights['source_sha256']) == file_hash(model_path):
+            return NumpyGRU(weights)
+        print(f"{npz_path} 与 {model_path} 不一致，重新导出")
+    export_weights(model_path, npz_path)
+    return load_npz(npz_path)
+
+
+class NumpyInferenceEngine(BatchEngine):
+    """NumPy 后端的批量推理引擎，接口与 inference.InferenceEngine 相同"""
+
+    def __init__(self, model, batch_window=0.002, zero_tolerance=ZERO_TOLERANCE):
+        super().__init__(model, batch_window, zero_tolerance)
+        self.h_t = np.zeros((self.num_layers, 0, self.hidden_dim), dtype=np.float32)
+        self.x = np.zeros((0, 1, self.in_dim), dtype=np.float32)
+
+    def _grow(self):
+        self.h_t = np.concatenate((self.h_t, np.zeros((self.num_layers, 1, self.hidden_dim), np.float32)), axis=1)
+        self.x = np.concatenate((self.x, np.zeros((1, 1, self.in_dim), np.float32)))
+
+    def _zero(self, slot):
+        self.h_t[:, slot] = 0
+
+    def _write(self, slot, features):
+        self.x[slot, 0] = features
+
+    def _hidden(self, slot):
+        return self.h_t[:, slot].copy()
+
+    def _run(self, x, h):
+        return self.model((x, h))
+
+    def _forward(self, slots):
+        if len(slots) == self.h_t.shape[1]:
+            out, self.h_t = self.model((self.x, self.h_t))
+            return out[slots]
+        out, h_t = self.model((self.x[slots], self.h_t[:, slots]))
+        self.h_t[:, slots] = h_t
+        return out
+
+
+def verify(model_path=MODEL_PATH, batch=4, steps=200, seed=0):
+    """用随机序列逐步对比 torch 与 NumPy 的输出，返回最大绝对误差"""
+    import torch
+    from GRU import load_model
+
+    reference = load_model(model_path)
+    model = load_numpy_model(model_path)
+    rng = np.random.default_rng(seed)
+    h_torch = torch.zeros(model.num_layer, batch, model.hidden_dim)
+    h_numpy = np.zeros((model.num_layer, batch, model.hidden_dim), dtype=np.float32)
+    error = 0.0
+    with torch.no_grad():
+        for _ in range(steps):
+            x = rng.normal(0, 0.5, (batch, 1, model.in_dim)).astype(np.float32)
+            out_torch, h_torch = reference((torch.from_numpy(x), h_torch))
+            out_numpy, h_numpy = model((x, h_numpy))
+            error = max(error, float(np.abs(out_torch.numpy() - out_numpy).max()),
+                        float(np.abs(h_torch.numpy() - h_numpy).max()))
+        # 多步序列一次输入
+        x = rng.normal(0, 0.5, (batch, 16, model.in_dim)).astype(np.float32)
+        out_torch, _ = reference((torch.from_numpy(x), torch.zeros(model.num_layer, batch, model.hidden_dim)))
+        out_numpy, _ = model((x, np.zeros((model.num_layer, batch, model.hidden_dim), np.float32)))
+        error = max(error, float(np.abs(out_torch.numpy() - out_numpy).max()))
+    return error
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="导出 NumPy 权重并与 torch 对比")
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--tolerance', type=float, default=1e-4)
+    parser.add_argument('--export', action='store_true', help="无论是否过期都重新导出 model.npz")
+    args = parser.parse_args()
+
+    if args.export:
+        export_weights(args.model)
+    error = verify(args.model)
+    print(f"torch 与 NumPy 输出最大误差: {error:.2e}")
+    if error > args.tolerance:
+        raise SystemExit(f"误差超过 {args.tolerance}")
@@ -1,89 +1,136 @@
+import argparse
 import threading
 import cv2
 import time
-import platform
 import os
-from GRU import *
-import torch
-import mediapipe as mp
+from batching import ZERO_TOLERANCE
+from decision import DECISIONS, make_decision
+from features import HANDS_OPTIONS, FeatureBuilder
+from governor import PROFILES, IdleGovernor
+from budget import FrameBudget
+from capture import CaptureThread
+from metrics import PipelineMetrics
+from motion import MotionGate
+from registry import BACKENDS, ModelRegistry
+from roi import HandRoiTracker
+from sources import CameraSource, CaptureProfile, make_source
 import numpy as np
 
 
 class Identify:
-    def __init__(self, win):
+    def __init__(self, win, engine=None, source=None, metrics=None, threaded_capture=None, budget=None,
+                 gate=None, roi=None, decision=None, backend=None, registry=None, release_after=30.0, governor=None):
         self.win = win
         self.isEnd = False
-        self.cap = None
+        self.source = source or CameraSource()  # 帧来源，默认为本机摄像头
+        if threaded_capture is None:
+            threaded_capture = isinstance(self.source, CameraSource)  # 实时来源默认使用独立采集线程
+        if threaded_capture:
+            self.source = CaptureThread(self.source)
+        self.engine = engine  # 多路摄像头共享的推理引擎，为 None 时独占一个模型
+        # 独占模型时由注册表加载，权重文件变化或调用 swap_model 时热替换
+        self.registry = registry or ModelRegistry(backend or os.getenv("GRU_BACKEND", "torch"))
+        self.metrics = metrics or PipelineMetrics()  # 分阶段耗时、计数器与帧率
+        self.budget = budget or FrameBudget()  # 检测分辨率与帧间隔控制
+        self.gate = gate or MotionGate()  # 静止画面跳过手部检测
+        self.roi = roi or HandRoiTracker(enabled=False)  # 在上一帧手的附近裁剪检测，高分辨率摄像头上开启
+        self.decision = decision or make_decision()  # 手势判定逻辑，见 decision.DECISIONS
+        # 长时间无手时降低处理帧率，档位见 governor.PROFILES，可在界面中切换
+        self.governor = governor or IdleGovernor(os.getenv("POWER_PROFILE", "balanced"))
+        self.hands = None  # MediaPipe 检测器，可由 startup.Startup 提前创建
+        self.roi_hands = None  # 裁剪区域使用的第二个检测器，仅在开启裁剪检测时创建
+        self.release_after = release_after  # 暂停超过该秒数释放摄像头与检测器，None 表示一直保留
+        self.resumed_at = None  # 最近一次恢复识别的时间，用于统计恢复到首帧的耗时
+        self.detector_lock = threading.Lock()
 
     def start(self):
         threading.Thread(target=self.run, daemon=True).start()
 
-    def init_camera(self):
-        """初始化摄像头，返回是否成功"""
-        print("正在初始化摄像头...")
-        camera_ids = self._get_camera_ids()
-        backend_candidates = self._get_backend_candidates()
-
-        for camera_id in camera_ids:
-            for backend in backend_candidates:
-                if self._try_open_camera(camera_id, backend):
-                    return True
-
-        print("所有摄像头初始化尝试均失败")
-        return False
-
-    def _get_camera_ids(self):
-        env_ids = os.getenv("CAMERA_INDEX")
-        if env_ids:
-            try:
-                return [int(item.strip()) for item in env_ids.split(",") if item.strip() != ""]
-            except ValueError:
-                print("CAMERA_INDEX 无法解析，使用默认摄像头索引")
-        if platform.system() == 'Linux':
-            return [0, 1, 2, '/dev/video0']
-        return [0, 1, 2]
-
-    def _get_backend_candidates(self):
-        if platform.system() == 'Windows':
-            return [cv2.CAP_DSHOW, cv2.CAP_MSMF, cv2.CAP_ANY, None]
-        if platform.system() == 'Darwin':
-            return [cv2.CAP_AVFOUNDATION, cv2.CAP_ANY, None]
-        return [cv2.CAP_V4L2, cv2.CAP_ANY, None]
-
-    def _try_open_camera(self, camera_id, backend):
-        try:
-            backend_label = "default" if backend is None else backend
-            print(f"尝试打开摄像头: {camera_id}, 后端: {backend_label}")
-            if backend is None:
-                self.cap = cv2.VideoCapture(camera_id)
-            else:
-                self.cap = cv2.VideoCapture(camera_id, backend)
-
-            if not self.cap.isOpened():
-                print("摄像头无法打开")
-                self.cap.release()
+    def prepare_model(self):
+        """加载并预热模型，返回 (engine, version)；已加载时直接返回，可在启动阶段提前调用"""
+        if self.engine is not None:
+            return self.engine, None
+        engine, version = self.registry.current()
+        if engine is None:
+            self.registry.load()
+            engine, version = self.registry.current()
+        return engine, version
+
+    def prepare_detector(self):
+        """创建并预热 MediaPipe 手部检测器；已创建时直接返回，正在创建时等待其完成"""
+        with self.detector_lock:
+            if self.hands is None:
+                import mediapipe as mp
+                hands = mp.solutions.hands.Hands(**HANDS_OPTIONS)
+                hands.process(np.zeros((480, 640, 3), dtype=np.uint8))  # 首次调用会初始化计算图
+                self.hands = hands
+            if self.roi.enabled and self.roi_hands is None:
+                import mediapipe as mp
+                # 裁剪区域使用独立的检测器实例，两者各自的跟踪状态都保持在同一坐标系下
+                self.roi_hands = mp.solutions.hands.Hands(**HANDS_OPTIONS)
+            return self.hands
+
+    def close_detector(self):
+        with self.detector_lock:
+            if self.hands is not None:
+                self.hands.close()
+                self.hands = None
+            if self.roi_hands is not None:
+                self.roi_hands.close()
+                self.roi_hands = None
+
+    def _wait_running(self, timeout=None):
+        """等待恢复识别，返回是否已恢复；超时或结束时返回 False"""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while not self.isEnd:
+            remaining = 0.5 if deadline is None else min(0.5, deadline - time.perf_counter())
+            if remaining <= 0:
                 return False
+            if self.win.eventRunning.wait(remaining):
+                return True
+        return False
 
-            for _ in range(5):
-                ret, frame = self.cap.read()
-                if ret and frame is not None:
-                    print(f"摄像头初始化成功！分辨率: {frame.shape[1]}x{frame.shape[0]}")
-                    return True
-                time.sleep(0.1)
-
-            self.cap.release()
-            print("摄像头打开但无法读取帧")
-            return False
+    def _pause(self):
+        """识别暂停时等待恢复，返回摄像头与检测器是否被释放后重新打开
 
-        except Exception as e:
-            print(f"尝试失败: {e}")
-            if self.cap:
-                self.cap.release()
+        短暂停保留全部状态；超过 release_after 秒释放摄像头（指示灯熄灭、不再占用 USB 带宽）
+        与 MediaPipe 检测器（包括裁剪检测用的第二个实例），模型很小所以保留。恢复时并行重新打开摄像头（使用缓存的配置）与检测器。
+        """
+        if self._wait_running(self.release_after) or self.isEnd:
+            self.resumed_at = time.perf_counter()
             return False
+        print(f"识别暂停超过 {self.release_after}s，释放摄像头与手部检测器")
+        self.source.release()
+        self.close_detector()
+        self.metrics.count('pause_releases')
+        if not self._wait_running():
+            return True
+        self.resumed_at = time.perf_counter()
+        detector = threading.Thread(target=self.prepare_detector, daemon=True)
+        detector.start()
+        if not self.source.open():
+            print("恢复识别时无法重新打开摄像头")
+        detector.join()
+        print(f"已恢复识别，重新打开摄像头与检测器用时 {time.perf_counter() - self.resumed_at:.2f}s")
+        return True
+
+    def swap_model(self, path=None, backend=None):
+        """后台加载新模型，加载完成后的下一帧切换，返回是否已开始加载"""
+        return self.registry.request_swap(path, backend)
+
+    def _detector_input(self, image):
+        """按检测预算缩小画面并转为 RGB，预览与绘制仍使用原分辨率"""
+        detect_size = self.budget.detect_size(image.shape[1], image.shape[0])
+        if detect_size is not None:
+            # INTER_AREA 在非整数倍缩放时要慢一个数量级，检测器内部还会再缩放，双线性足够
+            image = cv2.resize(image, detect_size, interpolation=cv2.INTER_LINEAR)
+        rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        rgb.flags.writeable = False
+        return rgb
 
     def run(self):
-        # 初始化摄像头
-        if not self.init_camera():
+        # 初始化帧来源
+        if not self.source.open():
             print("错误：无法打开摄像头！")
             print("请检查：")
             print("  1. 摄像头是否已连接")
@@ -91,41 +138,29 @@ class Identify:
             print("  3. 摄像头是否被其他程序占用")
             return
         
-        movement = {0: "点击", 1: "平移", 2: "缩放", 3: "抓取", 4: "旋转", 5: "无", 6: "截图", 7: '放大'}
-        S = 0  # 每帧的处理时间
-        device = torch.device('cpu')  # 初始化于cpu上处理
-        
-        if torch.cuda.is_available():
-            device = torch.device('cuda:0')
-            print("使用 CUDA 加速")
-        else:
-            print("使用 CPU 模式")
-
         # 加载模型
-        try:
-            model_path = os.path.join(os.path.dirname(__file__), 'model.pt')
-            model = torch.load(model_path, map_location='cpu').to(device)
-            print("模型加载成功")
-        except Exception as e:
-            print(f"模型加载失败: {e}")
-            self.cap.release()
-            return
-        
-        hiddem_dim = 30  # 隐藏层大小
-        num_layers = 2  # GRU层数
-
-        h_t = torch.zeros(num_layers, 1, hiddem_dim)
-        h_t = h_t.to(device)
-
-        last_gesture = '无'
-        prin_time = time.time()
-
+        engine, version = self.engine, None
+        if engine is None:
+            try:
+                engine, version = self.prepare_model()
+                print("模型加载成功")
+            except Exception as e:
+                print(f"模型加载失败: {e}")
+                self.source.release()
+                return
+            self.registry.start()
+        stream = engine.add_stream()
+        builder = FeatureBuilder()
+
+        decision = self.decision
+        decision.reset(time.time())
+
+        import mediapipe as mp  # 延迟导入，启动阶段由 startup.Startup 在后台线程完成
         mp_drawing = mp.solutions.drawing_utils
         mp_hands = mp.solutions.hands
         
         # 获取高宽比，添加安全检查
-        width = self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)
-        height = self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)
+        width, height = self.source.size()
         if width > 0 and height > 0:
             ratio = height / width
         else:
@@ -134,129 +169,211 @@ class Identify:
         print(f"摄像头分辨率: {int(width)}x{int(height)}")
 
         try:
-            with mp_hands.Hands(
-                    static_image_mode=False,
-                    max_num_hands=2,
-                    min_detection_confidence=0.65,
-                    min_tracking_confidence=0.5) as hands:
-                
-                start_time = time.time()
-                frame_count = 0
-                fps_time = time.time()
+            hands = self.prepare_detector()
+            roi_hands = self.roi_hands
+            
+            start_time = time.time()
+
+            while self.source.isOpened():
+                if self.isEnd:
+                    break
 
-                while self.cap.isOpened():
+                if not self.win.eventRunning.is_set():
+                    released = self._pause()
                     if self.isEnd:
                         break
-                    
-                    self.win.eventRunning.wait()
+                    if released:
+                        hands = self.prepare_detector()
+                        roi_hands = self.roi_hands
+                        self.roi.reset()
+                        start_time = time.time()
+                        continue
 
-                    in_dim = torch.zeros(126)
+                wait_time = max(self.budget.interval, self.governor.interval) - (time.time() - start_time)
+                if wait_time > 0:
+                    time.sleep(wait_time)
+                start_time = time.time()
 
-                    wait_time = S - (time.time() - start_time)
-                    if wait_time > 0:
-                        time.sleep(wait_time)
-                    start_time = time.time()
+                timer = self.metrics
+                timer.start()
+                success, image = self.source.read()
+                timer.lap('read')
+                if not success or image is None:
+                    if not self.source.isOpened():
+                        break  # 视频/图片来源已播放完
+                    print("无法读取摄像头帧")
+                    timer.count('frames_dropped')
+                    time.sleep(0.1)
+                    continue
+                if self.source.skipped:
+                    timer.count('frames_skipped', self.source.skipped)
+                catchup = self.governor.catchup(self.source.skipped)
+                if self.governor.idle:
+                    timer.count('frames_idle')
+                if self.resumed_at is not None:
+                    timer.set_gauge('resume_seconds', round(time.perf_counter() - self.resumed_at, 4))
+                    self.resumed_at = None
+                captured = self.source.capture_time or timer.frame_start
+
+                image = cv2.flip(image, 1)
+                detected = self.gate.should_detect(image)
+                if detected:
+                    crop = self.roi.crop(image)
+                    rgb = self._detector_input(image if crop is None else crop)
+                detect_start = timer.lap('preprocess')
+
+                results = None
+                if detected:
+                    if crop is not None:
+                        results = roi_hands.process(rgb)
+                        if results.multi_hand_landmarks:
+                            self.roi.remap(results, image.shape)
+                            self.roi.hit()
+                            timer.count('roi_hits')
+                        else:
+                            # 跟丢了，本帧退回整幅检测
+                            self.roi.miss()
+                            timer.count('roi_misses')
+                            results = hands.process(self._detector_input(image))
+                    else:
+                        results = hands.process(rgb)
+                    self.roi.update(results, image.shape)
+                detect_time = timer.lap('detect') - detect_start
+                has_hand = results is not None and bool(results.multi_hand_landmarks)
+                if detected:
+                    self.gate.update(has_hand, detect_time)
+                else:
+                    # 画面静止且近期无手，跳过检测，按"无手"处理
+                    timer.count('frames_gated')
+                    timer.count('detect_seconds_saved', self.gate.detect_ema)
+                if self.governor.update(has_hand, time.perf_counter()):
+                    # 有手时立即恢复全速，下一帧不再等待
+                    timer.set_gauge('power_idle', int(self.governor.idle))
+
+                if has_hand:
+                    for hand_landmarks in results.multi_hand_landmarks:
+                        mp_drawing.draw_landmarks(image, hand_landmarks, mp_hands.HAND_CONNECTIONS)
+                else:
+                    timer.count('frames_no_hand')
+                timer.lap('draw')
+                features = builder.build(results) if has_hand else builder.clear()
+                timer.lap('features')
+
+                if self.win.eventRunning.is_set():
+                    self.win.flash_img(image, ratio)
+                timer.lap('display')
+
+                now = time.time()
+                if decision.blocked(now):
+                    features = builder.zeros
+
+                if version is not None and self.registry.version != version:
+                    # 模型已热替换：迁移到新引擎，隐藏状态从零开始
+                    stream.close()
+                    engine, version = self.registry.current()
+                    stream = engine.add_stream()
+                    decision.reset(now)
+                    timer.count('model_swaps')
+                    timer.set_gauge('model_version', version)
+
+                for _ in range(catchup):
+                    # 降频跳过的帧里没有手，补推零输入使隐藏状态按帧数推进
+                    stream.infer(builder.zeros)
+                if catchup:
+                    timer.count('idle_catchup_steps', catchup)
+                rel = stream.infer(features)
+                if stream.cached:
+                    timer.count('gru_steps_skipped')
+                timer.lap('gru')
+                if rel is None:
+                    continue
+                gesture = decision.update(rel, now, has_hand)
+                if gesture:
+                    self.win.set_gesture(gesture)
+                    if decision.reset_hidden:
+                        stream.reset()
+                    timer.gesture(gesture)
+                done = timer.lap('decision')
+                timer.observe_age(done - captured)
+                timer.end_frame()
+                timer.set_gauge('gate_skip_ratio', round(self.gate.skip_ratio, 4))
+                if detected and self.budget.observe(detect_time, done - timer.frame_start):
+                    timer.set_gauge('detect_width', self.budget.width)
+                    timer.set_gauge('frame_interval_seconds', self.budget.interval)
 
-                    success, image = self.cap.read()
-                    if not success or image is None:
-                        print("无法读取摄像头帧")
-                        time.sleep(0.1)
-                        continue
-                    
-                    # 计算 FPS
-                    frame_count += 1
-                    if time.time() - fps_time >= 1.0:
-                        # print(f"FPS: {frame_count}")
-                        frame_count = 0
-                        fps_time = time.time()
-
-                    image = cv2.cvtColor(cv2.flip(image, 1), cv2.COLOR_BGR2RGB)
-
-                    image.flags.writeable = False
-                    results = hands.process(image)
-
-                    image.flags.writeable = True
-                    image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
-
-                    if results.multi_hand_landmarks:
-                        if len(results.multi_handedness) == 1 and results.multi_handedness[0].classification.__getitem__(0).index == 1:
-                            for hand_landmarks in results.multi_hand_landmarks:
-                                mp_drawing.draw_landmarks(image, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-                                index_1 = []
-                                for k in range(0, 21):
-                                    index_1.append(hand_landmarks.landmark[k].x)
-                                    index_1.append(hand_landmarks.landmark[k].y)
-                                    index_1.append(hand_landmarks.landmark[k].z)
-                                for k_1 in range(0, 63):
-                                    index_1.append(0)
-                            in_dim = torch.from_numpy(np.array(index_1))
-                            
-                        elif len(results.multi_handedness) == 1 and results.multi_handedness[0].classification.__getitem__(0).index == 0:
-                            for hand_landmarks in results.multi_hand_landmarks:
-                                mp_drawing.draw_landmarks(image, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-                                index_0 = []
-                                for k_1 in range(0, 63):
-                                    index_0.append(0)
-                                for k in range(0, 21):
-                                    index_0.append(hand_landmarks.landmark[k].x)
-                                    index_0.append(hand_landmarks.landmark[k].y)
-                                    index_0.append(hand_landmarks.landmark[k].z)
-                            in_dim = torch.from_numpy(np.array(index_0))
-                            
-                        elif len(results.multi_handedness) == 2 and results.multi_handedness[0].classification.__getitem__(0).index == 1:
-                            index_1_first = []
-                            for hand_landmarks in results.multi_hand_landmarks:
-                                mp_drawing.draw_landmarks(image, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-                                for k in range(0, 21):
-                                    index_1_first.append(hand_landmarks.landmark[k].x)
-                                    index_1_first.append(hand_landmarks.landmark[k].y)
-                                    index_1_first.append(hand_landmarks.landmark[k].z)
-                            in_dim = torch.from_numpy(np.array(index_1_first))
-                            
-                        elif len(results.multi_handedness) == 2 and results.multi_handedness[0].classification.__getitem__(0).index == 0:
-                            results.multi_hand_landmarks.reverse()
-                            index_0_first = []
-                            for hand_landmarks in results.multi_hand_landmarks:
-                                mp_drawing.draw_landmarks(image, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-                                for k in range(0, 21):
-                                    index_0_first.append(hand_landmarks.landmark[k].x)
-                                    index_0_first.append(hand_landmarks.landmark[k].y)
-                                    index_0_first.append(hand_landmarks.landmark[k].z)
-                            in_dim = torch.from_numpy(np.array(index_0_first))
-
-                    if self.win.eventRunning.isSet():
-                        self.win.flash_img(image, ratio)
-
-                    in_dim = in_dim.unsqueeze(dim=0)
-                    in_dim = in_dim.unsqueeze(dim=0)
-                    in_dim = in_dim.to(torch.float32).to(device)
-                    h_t = h_t.to(torch.float32).to(device)
-                    
-                    if time.time() - prin_time < 2:
-                        in_dim = torch.zeros(1, 1, 126).to(device)
-
-                    rel, h_t = model((in_dim, h_t))
-                    rel = torch.sigmoid(rel)
-                    confidence, rel = rel.max(1)
-
-                    cfd = {'点击': 0.90, '平移': 0.90, '缩放': 0.99, '抓取': 0.985, '旋转': 0.99, '无': 0, '截图': 0.99, '放大': 0.9}
-                    if confidence > cfd[movement[rel.item()]]:
-                        now_gesture = last_gesture
-                        last_gesture = movement[rel.item()]
-                        if not (now_gesture == last_gesture):
-                            if time.time() - prin_time > 2:
-                                self.win.set_gesture(movement[rel.item()])
-                                prin_time = time.time()
-                                h_t = torch.zeros(num_layers, 1, hiddem_dim).to(device)
-                                
         except Exception as e:
             print(f"运行时错误: {e}")
             import traceback
             traceback.print_exc()
         finally:
-            if self.cap:
-                self.cap.release()
+            self.close_detector()
+            stream.close()
+            if version is not None:
+                self.registry.stop()
+            self.source.release()
             print("摄像头已释放")
 
     def break_loop(self):
         self.isEnd = True
+
+
+class HeadlessWin:
+    """无界面运行时代替 Window，只记录识别出的手势"""
+
+    def __init__(self):
+        self.eventRunning = threading.Event()
+        self.eventRunning.set()
+        self.gestures = []
+
+    def flash_img(self, image, ratio):
+        pass
+
+    def set_gesture(self, msg: str):
+        self.gestures.append(msg)
+        print("识别结果:", msg)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="无界面运行手势识别")
+    parser.add_argument('source', nargs='?', default='camera',
+                        help="camera、synthetic、图片目录或视频文件路径")
+    parser.add_argument('--realtime', action='store_true', help="按视频原始帧率播放")
+    parser.add_argument('--loop', action='store_true', help="循环播放")
+    parser.add_argument('--threaded', action='store_true', default=None, help="使用独立采集线程（摄像头默认开启）")
+    parser.add_argument('--camera-profile', default=os.getenv("CAMERA_PROFILE"),
+                        help="摄像头采集参数，例如 MJPG:1280x720@30（默认 MJPG:640x480@30，缓冲区 1 帧）")
+    parser.add_argument('--release-after', type=float, default=30.0,
+                        help="暂停超过该秒数释放摄像头与检测器，负数表示一直保留")
+    parser.add_argument('--detect-ms', type=float, default=20.0, help="检测耗时预算（毫秒）")
+    parser.add_argument('--cpu', type=float, default=1.0, help="识别循环占用单核 CPU 的上限（0~1）")
+    parser.add_argument('--detect-width', type=int, default=640, help="初始检测宽度")
+    parser.add_argument('--no-motion-gate', action='store_true', help="关闭静止画面跳过检测")
+    parser.add_argument('--roi', action='store_true', help="开启手部区域裁剪检测")
+    parser.add_argument('--power', default=os.getenv("POWER_PROFILE", "balanced"), choices=list(PROFILES),
+                        help="功耗档位：performance 始终全速，balanced / eco 长时间无手后降低帧率")
+    parser.add_argument('--decision', default='streaming', choices=sorted(DECISIONS), help="手势判定逻辑")
+    parser.add_argument('--backend', default=os.getenv("GRU_BACKEND", "torch"), choices=BACKENDS,
+                        help="GRU 推理后端：torch、TorchScript 变体 script / int8、不导入 torch 的 numpy")
+    parser.add_argument('--model', help="模型文件，默认按后端选择 model.json 或 model.pt")
+    parser.add_argument('--zero-tol', type=float, default=ZERO_TOLERANCE,
+                        help="无手时隐藏状态与零输入不动点的距离不超过该容差后跳过 GRU 推理，0 表示关闭")
+    parser.add_argument('--no-watch', action='store_true', help="不监视模型文件变化（默认变化后热替换）")
+    args = parser.parse_args()
+    try:
+        profile = CaptureProfile.parse(args.camera_profile)
+        registry = ModelRegistry(args.backend, args.model, watch=not args.no_watch,
+                                 zero_tolerance=args.zero_tol or None)
+    except ValueError as e:
+        parser.error(str(e))
+
+    identify = Identify(HeadlessWin(), source=make_source(args.source, args.realtime, args.loop, profile),
+                        threaded_capture=args.threaded,
+                        budget=FrameBudget(args.detect_ms, args.cpu, start_width=args.detect_width),
+                        gate=MotionGate(enabled=not args.no_motion_gate),
+                        roi=HandRoiTracker(enabled=args.roi), decision=make_decision(args.decision),
+                        registry=registry,
+                        release_after=None if args.release_after < 0 else args.release_after,
+                        governor=IdleGovernor(args.power))
+    start = time.time()
+    identify.run()
+    print(f"耗时 {time.time() - start:.2f}s，识别结果: {identify.win.gestures}")
@@ -0,0 +1,121 @@
+"""会议消息的编解码：文本行协议与带版本的二进制帧协议
+
+文本协议（版本 1）为空格分隔的 UTF-8 行，例如 "command 放大"，成员名中含空格时会被拆错。
+二进制帧（版本 2）为定长头加长度前缀的载荷：
+
+    magic(1) version(1) kind(1) seq(4) timestamp(8) length(4) | payload(length)
+
+- magic 为 0xB2，UTF-8 中不会以该字节开头，接收方据此逐条区分二进制帧与文本行；
+- seq 为发送方递增的序号，timestamp 为发送时的 time.time()；
+- payload 为字段数(2)、各字段的字符数(2 × 字段数)，再接所有字段拼接后的 UTF-8；
+  解码时整体解码一次，再按字符数切片，不做字符串拆分。
+
+协商：客户端加入会议（发送用户名）后再发送一行 "protocol 2"。新服务端回复 protocol 消息后
+双方改用二进制帧发送；旧服务端把它当作未知消息忽略，双方继续使用文本。两种格式的接收
+方都能同时处理，切换过程中不会丢消息，旧的文本客户端不受影响。
+"""
+import struct
+import time
+from collections import namedtuple
+from functools import lru_cache
+from itertools import accumulate
+
+from linereader import LineBuffer, LineTooLong
+
+VERSION = 2
+MAGIC = 0xB2
+HEADER = struct.Struct('!BBBIdI')
+COUNT = struct.Struct('!H')
+# 消息类型 <-> 类型字节
+KINDS = {
+    'command': 1,
+    'exchange_control': 2,
+    'switch_control': 3,
+    'ping': 4,
+    'pong': 5,
+    'member_list': 6,
+    'change_controller': 7,
+    'control_switched': 8,
+    'duplicate_name': 9,
+    'protocol': 10,
+}
+KIND_NAMES = {code: kind for kind, code in KINDS.items()}
+
+# kind 为消息类型，args 为参数元组；文本消息的 text 为原始行，二进制消息为 None
+Message = namedtuple('Message', 'kind args seq timestamp text')
+
+
+def encode_text(kind, *args):
+    """编码为文本行（旧协议），与原来的 'kind ' + ' '.join(args) 写法一致"""
+    return (' '.join((kind,) + args) + '\n').encode('utf8')
+
+
+@lru_cache(maxsize=256)
+def lengths_struct(count):
+    """字段数 + count 个字段长度的 Struct"""
+    return struct.Struct(f'!{count + 1}H')
+
+
+def encode_frame(kind, *args, seq=0, timestamp=None):
+    """编码为二进制帧"""
+    payload = lengths_struct(len(args)).pack(len(args), *map(len, args)) + ''.join(args).encode('utf8')
+    header = HEADER.pack(MAGIC, VERSION, KINDS[kind], seq & 0xFFFFFFFF,
+                         time.time() if timestamp is None else timestamp, len(payload))
+    return header + payload
+
+
+def encode(kind, *args, binary=False, seq=0):
+    return encode_frame(kind, *args, seq=seq) if binary else encode_text(kind, *args)
+
+
+def parse_line(line):
+    """把文本行解析为 Message"""
+    kind, _, rest = line.partition(' ')
+    return Message(kind, tuple(rest.split(' ')) if rest else (), None, None, line)
+
+
+def decode_payload(kind, seq, timestamp, payload):
+    """解码二进制帧的载荷（memoryview），返回 Message；载荷格式错误时抛出 ValueError"""
+    try:
+        count, = COUNT.unpack_from(payload, 0)
+        lengths = lengths_struct(count)
+        ends = lengths.unpack_from(payload, 0)[1:]
+    except struct.error as e:
+        raise ValueError(f"二进制帧载荷格式错误: {e}") from None
+    text = str(payload[lengths.size:], 'utf8')
+    if count == 1:
+        args = (text,)
+    else:
+        ends = tuple(accumulate(ends))
+        if (ends[-1] if ends else 0) != len(text):
+            raise ValueError(f"二进制帧字段长度之和与载荷不一致: {ends[-1] if ends else 0} != {len(text)}")
+        args = tuple(text[start:end] for start, end in zip((0,) + ends, ends))
+    return Message(KIND_NAMES.get(kind, kind), args, seq, timestamp, None)
+
+
+class MessageBuffer(LineBuffer):
+    """同时接受文本行与二进制帧的缓冲区，take() 返回 Message"""
+
+    def take(self):
+        if self.start < self.end and self.buffer[self.start] == MAGIC:
+            return self.next_frame()
+        line = self.next_line()
+        return None if line is None else parse_line(line)
+
+    def next_frame(self):
+        if self.end - self.start < HEADER.size:
+            return None
+        _, version, kind, seq, timestamp, length = HEADER.unpack_from(self.buffer, self.start)
+        if version != VERSION:
+            raise ValueError(f"不支持的协议版本: {version}")
+        if length > self.limit:
+            raise LineTooLong(f"消息超过 {self.limit} 字节")
+        start = self.start + HEADER.size
+        end = start + length
+        if end > self.end:
+            return None
+        self.start = end
+        message = decode_payload(kind, seq, timestamp, memoryview(self.buffer)[start:end])
+        if self.start == self.end:
+            self.start = self.end = 0
+        return message
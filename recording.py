@@ -0,0 +1,176 @@
+"""关键点录制与回放
+
+录制格式为一个目录，每列一个 .npy 文件，可用 np.load(mmap_mode='r') 直接映射：
+
+    header.json     版本、数据类型、帧数、分辨率、帧率、来源视频
+    landmarks.npy   (T, 2, 21, 3) float16/float32，按检测顺序存放，缺失的手为 0
+    handedness.npy  (T, 2) int8，每只手的 handedness index，缺失为 -1
+    num_hands.npy   (T,) uint8
+    timestamps.npy  (T,) float64，帧时间戳（秒），即帧序号索引
+
+回放时跳过摄像头与 MediaPipe，直接把关键点送入 FeatureBuilder 和 GRU。
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+
+from decision import DECISIONS, make_decision
+from features import HANDS_OPTIONS, NUM_LANDMARKS, FeatureBuilder
+from sources import VideoFileSource
+
+FORMAT_VERSION = 1
+CACHE_DIR = os.getenv("LANDMARK_CACHE", os.path.join(os.path.dirname(os.path.abspath(__file__)), '.landmark_cache'))
+
+
+class LandmarkRecorder:
+    """逐帧收集 hands.process 的结果，最后一次性写盘"""
+
+    def __init__(self, dtype='float32'):
+        self.dtype = np.dtype(dtype)
+        self.landmarks = []
+        self.handedness = []
+        self.timestamps = []
+
+    def append(self, results, timestamp):
+        frame = np.zeros((2, NUM_LANDMARKS, 3), dtype=np.float32)
+        handedness = [-1, -1]
+        if results.multi_hand_landmarks:
+            for i, hand_landmarks in enumerate(results.multi_hand_landmarks[:2]):
+                frame[i] = [(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark]
+                handedness[i] = results.multi_handedness[i].classification[0].index
+        self.landmarks.append(frame)
+        self.handedness.append(handedness)
+        self.timestamps.append(timestamp)
+
+    def save(self, path, **info):
+        os.makedirs(path, exist_ok=True)
+        handedness = np.array(self.handedness, dtype=np.int8).reshape(-1, 2)
+        np.save(os.path.join(path, 'landmarks.npy'),
+                np.array(self.landmarks, dtype=self.dtype).reshape(-1, 2, NUM_LANDMARKS, 3))
+        np.save(os.path.join(path, 'handedness.npy'), handedness)
+        np.save(os.path.join(path, 'num_hands.npy'), (handedness >= 0).sum(axis=1).astype(np.uint8))
+        np.save(os.path.join(path, 'timestamps.npy'), np.array(self.timestamps, dtype=np.float64))
+        header = dict(version=FORMAT_VERSION, dtype=self.dtype.name, frames=len(self.timestamps), **info)
+        # header 最后写入，作为录制完整的标志
+        with open(os.path.join(path, 'header.json'), 'w', encoding='utf8') as f:
+            json.dump(header, f, ensure_ascii=False, indent=2)
+        return Recording(path)
+
+
+class Recording:
+    """内存映射方式打开的录制数据"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, 'header.json'), encoding='utf8') as f:
+            self.header = json.load(f)
+        if self.header.get('version') != FORMAT_VERSION:
+            raise ValueError(f"不支持的录制格式版本: {self.header.get('version')}")
+        self.landmarks = np.load(os.path.join(path, 'landmarks.npy'), mmap_mode='r')
+        self.handedness = np.load(os.path.join(path, 'handedness.npy'), mmap_mode='r')
+        self.num_hands = np.load(os.path.join(path, 'num_hands.npy'), mmap_mode='r')
+        self.timestamps = np.load(os.path.join(path, 'timestamps.npy'), mmap_mode='r')
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def frame(self, i):
+        """返回第 i 帧的 (landmarks[:n], 第一只手的 handedness index)"""
+        n = self.num_hands[i]
+        return self.landmarks[i, :n], self.handedness[i, 0]
+
+    def index_at(self, timestamp):
+        """按时间戳查找帧序号"""
+        return int(np.searchsorted(self.timestamps, timestamp, side='right')) - 1
+
+
+def content_hash(path, chunk_size=1 << 20):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def record_video(video_path, out_path, dtype='float32'):
+    """用 MediaPipe 处理整段视频并保存关键点，预处理与 Identify.run 一致"""
+    import mediapipe as mp
+
+    source = VideoFileSource(video_path)
+    if not source.open():
+        raise IOError(f"无法打开视频文件: {video_path}")
+    recorder = LandmarkRecorder(dtype)
+    fps = source.fps
+    width, height = source.size()
+    try:
+        with mp.solutions.hands.Hands(**HANDS_OPTIONS) as hands:
+            index = 0
+            while source.isOpened():
+                success, image = source.read()
+                if not success:
+                    break
+                image = cv2.cvtColor(cv2.flip(image, 1), cv2.COLOR_BGR2RGB)
+                image.flags.writeable = False
+                recorder.append(hands.process(image), index / fps)
+                index += 1
+    finally:
+        source.release()
+    return recorder.save(out_path, source=os.path.basename(video_path), fps=fps, width=width, height=height)
+
+
+def load_or_record(video_path, dtype='float32', cache_dir=None):
+    """按视频内容哈希查找缓存的录制，没有则现场录制"""
+    key = f"{content_hash(video_path)}-{np.dtype(dtype).name}"
+    path = os.path.join(cache_dir or CACHE_DIR, key)
+    if os.path.exists(os.path.join(path, 'header.json')):
+        return Recording(path)
+    print(f"录制关键点: {video_path}")
+    return record_video(video_path, path, dtype)
+
+
+def replay(recording, engine, decision=None):
+    """把录制的关键点送入 FeatureBuilder 与 GRU，返回 [(帧序号, 时间戳, 手势)]"""
+    builder = FeatureBuilder()
+    decision = decision or make_decision()
+    stream = engine.add_stream()
+    events = []
+    try:
+        decision.reset(float(recording.timestamps[0]) if len(recording) else 0.0)
+        for i in range(len(recording)):
+            now = float(recording.timestamps[i])
+            landmarks, first_index = recording.frame(i)
+            features = builder.build_from_array(landmarks, first_index)
+            if decision.blocked(now):
+                features = builder.zeros
+            gesture = decision.update(stream.infer(features), now, bool(recording.num_hands[i]))
+            if gesture:
+                if decision.reset_hidden:
+                    stream.reset()
+                events.append((i, now, gesture))
+    finally:
+        stream.close()
+    return events
+
+
+if __name__ == '__main__':
+    from registry import BACKENDS, create_engine
+
+    parser = argparse.ArgumentParser(description="录制视频的关键点并回放识别")
+    parser.add_argument('videos', nargs='+', help="视频文件，例如 videos/*.mkv")
+    parser.add_argument('--dtype', default='float32', choices=['float16', 'float32'])
+    parser.add_argument('--decision', default='streaming', choices=sorted(DECISIONS), help="手势判定逻辑")
+    parser.add_argument('--backend', default=os.getenv("GRU_BACKEND", "torch"), choices=BACKENDS, help="GRU 推理后端")
+    args = parser.parse_args()
+
+    engine = create_engine(args.backend)
+    for video in args.videos:
+        rec = load_or_record(video, args.dtype)
+        start = time.perf_counter()
+        events = replay(rec, engine, make_decision(args.decision))
+        print(f"{video}: {len(rec)} 帧，回放 {time.perf_counter() - start:.3f}s，"
+              f"识别结果: {[g for _, _, g in events]}")
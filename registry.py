@@ -0,0 +1,213 @@
+"""模型注册表：按后端加载推理引擎，并支持不停机热替换
+
+Identify 每帧查询 registry.version，版本变化时把自己的 stream 迁移到新引擎
+（隐藏状态随之清零）。新模型在后台线程加载并预热一次推理，完成后才原子地
+替换 engine，帧循环不会因此停顿；加载失败时继续使用旧模型。
+触发方式：监视的权重文件发生变化（watch=True），或调用 request_swap()。
+注册表加载的权重都读入模型自己的内存，不映射被监视的文件：python weights.py 重新转换时
+正在运行的旧模型不受影响，直到新模型加载完成、整体替换。
+"""
+import os
+import threading
+import time
+
+import numpy as np
+
+from batching import ZERO_TOLERANCE
+from decision import MOVEMENT
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(ROOT, 'model.pt')
+HEADER_PATH = os.path.join(ROOT, 'model.json')
+BACKENDS = ('torch', 'script', 'int8', 'numpy')
+# 各后端能读取的模型文件
+EXTENSIONS = {'torch': ('.json', '.pt'), 'script': ('.pt',), 'int8': ('.pt',), 'numpy': ('.pt', '.npz')}
+
+
+def default_path(backend):
+    """各后端读取的文件，也是热替换时监视的文件
+
+    numpy / script / int8 以 model.pt 为源文件，缓存的 model.npz 与变体文件过期时自动重新导出。
+    """
+    if backend in ('numpy', 'script', 'int8'):
+        return MODEL_PATH
+    return HEADER_PATH if os.path.exists(HEADER_PATH) else MODEL_PATH
+
+
+def check_source(backend, path):
+    """后端与模型文件不匹配时抛出 ValueError，而不是加载到一半才失败"""
+    if backend not in EXTENSIONS:
+        raise ValueError(f"未知的推理后端: {backend}，可选 {', '.join(BACKENDS)}")
+    if not path.endswith(EXTENSIONS[backend]):
+        hint = "，script / int8 变体由 model.pt 导出" if backend in ('script', 'int8') else ''
+        raise ValueError(f"{backend} 后端不能加载 {os.path.basename(path)}，"
+                         f"需要 {' / '.join(EXTENSIONS[backend])} 文件{hint}")
+
+
+def create_engine(backend='torch', path=None):
+    """按后端加载模型并创建推理引擎
+
+    torch 为原始 eager 模型，script / int8 为 variants.py 导出的 TorchScript 变体（仅 CPU），
+    numpy 后端全程不导入 torch。path 为空时使用 default_path(backend)。
+    """
+    path = path or default_path(backend)
+    check_source(backend, path)
+    if backend == 'numpy':
+        from numpy_gru import NumpyInferenceEngine, load_npz, load_numpy_model
+        print("使用 NumPy 推理后端")
+        model = load_npz(path) if path.endswith('.npz') else load_numpy_model(path)
+        return NumpyInferenceEngine(model)
+
+    import torch
+    from inference import InferenceEngine
+    if backend in ('script', 'int8'):
+        from variants import load_variant
+        print(f"使用 {backend} 模型变体")
+        return InferenceEngine(load_variant(backend, path))
+    device = torch.device('cpu')  # 初始化于cpu上处理
+    if torch.cuda.is_available():
+        device = torch.device('cuda:0')
+        print("使用 CUDA 加速")
+    else:
+        print("使用 CPU 模式")
+    return InferenceEngine(load_torch_model(path), device)
+
+
+def load_torch_model(path=None):
+    """加载安全的 state_dict 格式（weights.py 生成的 .json 头）；给出 .pt 时才反序列化 pickle"""
+    path = path or default_path('torch')
+    if path.endswith('.json'):
+        from weights import load_weights
+        model = load_weights(path, mmap=False)  # 参数使用自己的内存，不随文件改写而变化
+        if model.labels != [MOVEMENT[i] for i in sorted(MOVEMENT)]:
+            print(f"警告：模型类别顺序 {model.labels} 与 decision.MOVEMENT 不一致")
+        return model
+    from GRU import load_model
+    print(f"加载 pickle 格式的 {os.path.basename(path)}（可运行 python weights.py 转换）")
+    return load_model(path)
+
+
+def warm_up(engine):
+    """用全零输入推理一次，让首帧不再承担内存分配与算子初始化的开销；
+    顺便求出零输入不动点，无手快速路径不必在识别循环里求解"""
+    stream = engine.add_stream()
+    try:
+        stream.infer(np.zeros(engine.in_dim, dtype=np.float32))
+    finally:
+        stream.close()
+    engine.fixed_point()
+
+
+class ModelRegistry:
+    """持有当前推理引擎，后台加载新模型后原子替换"""
+
+    def __init__(self, backend='torch', path=None, watch=True, interval=1.0, zero_tolerance=ZERO_TOLERANCE):
+        if zero_tolerance is not None and zero_tolerance <= 0:
+            raise ValueError(f"零输入收敛容差必须为正数: {zero_tolerance}")
+        self.backend = backend
+        self.path = path or default_path(backend)
+        check_source(self.backend, self.path)
+        self.zero_tolerance = zero_tolerance  # 零输入快速路径的收敛容差，None 表示关闭
+        self.watch = watch
+        self.interval = interval  # 检查文件变化的间隔（秒）
+        self.engine = None
+        self.version = 0
+        self.lock = threading.Lock()
+        self.load_lock = threading.Lock()  # 启动线程与识别线程可能同时请求初始加载
+        self.loading = None  # 正在后台加载的线程
+        self.mtime = None
+        self.thread = None
+        self.isEnd = False
+
+    def load(self):
+        """同步加载初始模型，返回引擎；已加载时直接返回"""
+        with self.load_lock:
+            if self.engine is None:
+                engine = create_engine(self.backend, self.path)
+                warm_up(engine)
+                self._install(engine)
+            return self.engine
+
+    def current(self):
+        """返回 (engine, version)，Identify 每帧调用"""
+        with self.lock:
+            return self.engine, self.version
+
+    def _install(self, engine, backend=None, path=None):
+        """替换当前引擎；backend / path 为新引擎实际加载的来源，此后监视该文件"""
+        engine.zero_tolerance = self.zero_tolerance
+        with self.lock:
+            if backend:
+                self.backend = backend
+            if path:
+                self.path = path
+            self.engine = engine
+            self.version += 1
+            self.mtime = self._stat()
+
+    def _stat(self, path=None):
+        try:
+            return os.stat(path or self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def request_swap(self, path=None, backend=None):
+        """在后台加载 path（默认当前文件）并替换当前模型，已有加载任务时返回 False
+
+        加载成功后才切换到新的后端与文件；失败时继续使用并监视原来的模型。
+        后端与文件不匹配时立即抛出 ValueError。
+        """
+        with self.lock:
+            if self.loading is not None:
+                return False
+            path = path or (default_path(backend) if backend else self.path)
+            backend = backend or self.backend
+            check_source(backend, path)
+            self.loading = threading.Thread(target=self._swap, args=(backend, path), daemon=True)
+            self.loading.start()
+            return True
+
+    def _swap(self, backend, path):
+        start = time.perf_counter()
+        try:
+            engine = create_engine(backend, path)
+            warm_up(engine)
+        except Exception as e:
+            print(f"新模型加载失败，继续使用当前模型: {e}")
+            if path == self.path:
+                self.mtime = self._stat()  # 同一个坏文件不再反复重试
+        else:
+            self._install(engine, backend, path)
+            print(f"模型已替换为 {os.path.basename(path)}（版本 {self.version}），"
+                  f"后台加载耗时 {time.perf_counter() - start:.2f}s")
+        finally:
+            with self.lock:
+                self.loading = None
+
+    def start(self):
+        """启动文件监视线程"""
+        if self.watch and self.thread is None:
+            self.isEnd = False
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    def run(self):
+        changed = None
+        while not self.isEnd:
+            time.sleep(self.interval)
+            mtime = self._stat()
+            if mtime is None or mtime == self.mtime:
+                changed = None
+                continue
+            # 连续两次检查的修改时间相同才认为写入完成，避免加载写了一半的文件
+            if mtime == changed:
+                changed = None
+                self.request_swap()
+            else:
+                changed = mtime
+
+    def stop(self):
+        self.isEnd = True
+        if self.thread:
+            self.thread.join()
+            self.thread = None
@@ -0,0 +1,86 @@
+class HandRoiTracker:
+    """在上一帧手的附近裁剪画面，缩小检测器输入
+
+    根据最近检测到的关键点计算带边距的正方形裁剪框（像素坐标）。手仍在框内
+    时框保持不动，让检测器的跟踪状态保持一致；手接近边缘时才重新计算。
+    裁剪区域上检测到的关键点用 remap 换算回整幅画面的归一化坐标，
+    特征构建与绘制都无需改动。裁剪区域没有检测到手时由调用方退回整幅检测。
+    """
+
+    def __init__(self, enabled=True, padding=0.6, min_size=0.3, margin=0.1, max_area=0.6, cooldown=15):
+        self.enabled = enabled
+        self.padding = padding  # 关键点外接框每边扩展的比例
+        self.min_size = min_size  # 裁剪框最小边长，占画面短边的比例
+        self.margin = margin  # 关键点距框边缘小于该比例时重新计算
+        self.max_area = max_area  # 裁剪框面积超过画面该比例时直接整幅检测
+        self.cooldown = cooldown  # 跟丢后暂停裁剪的帧数
+        self.box = None  # (x0, y0, x1, y1) 像素坐标
+        self.wait = 0
+        self.hits = 0
+        self.misses = 0
+
+    def crop(self, image):
+        """返回当前裁剪框内的画面，没有跟踪目标时返回 None"""
+        if not self.enabled or self.box is None:
+            return None
+        x0, y0, x1, y1 = self.box
+        return image[y0:y1, x0:x1]
+
+    def remap(self, results, shape):
+        """把裁剪区域上的归一化关键点原地换算为整幅画面的归一化坐标"""
+        height, width = shape[:2]
+        x0, y0, x1, y1 = self.box
+        sx, sy = (x1 - x0) / width, (y1 - y0) / height
+        ox, oy = x0 / width, y0 / height
+        for hand_landmarks in results.multi_hand_landmarks:
+            for lm in hand_landmarks.landmark:
+                lm.x = ox + lm.x * sx
+                lm.y = oy + lm.y * sy
+                lm.z = lm.z * sx  # z 与 x 同尺度
+
+    def hit(self):
+        self.hits += 1
+
+    def miss(self):
+        self.misses += 1
+        self.box = None
+        self.wait = self.cooldown
+
+    def reset(self):
+        self.box = None
+
+    def update(self, results, shape):
+        """根据本帧（整幅坐标下）的关键点更新裁剪框"""
+        if not self.enabled:
+            return
+        if results is None or not results.multi_hand_landmarks:
+            self.box = None
+            return
+        if self.wait > 0:
+            self.wait -= 1
+            return
+        height, width = shape[:2]
+        xs = [lm.x * width for hand in results.multi_hand_landmarks for lm in hand.landmark]
+        ys = [lm.y * height for hand in results.multi_hand_landmarks for lm in hand.landmark]
+        left, right, top, bottom = min(xs), max(xs), min(ys), max(ys)
+
+        if self.box is not None:
+            x0, y0, x1, y1 = self.box
+            m = self.margin * (x1 - x0)
+            if left > x0 + m and right < x1 - m and top > y0 + m and bottom < y1 - m:
+                return  # 手仍在框内，保持不动
+
+        side = max(right - left, bottom - top) * (1 + 2 * self.padding)
+        side = min(max(side, self.min_size * min(width, height)), min(width, height))
+        if side * side > self.max_area * width * height:
+            self.box = None
+            return
+        cx, cy = (left + right) / 2, (top + bottom) / 2
+        x0 = int(min(max(cx - side / 2, 0), width - side))
+        y0 = int(min(max(cy - side / 2, 0), height - side))
+        self.box = (x0, y0, x0 + int(side), y0 + int(side))
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
@@ -1,22 +1,24 @@
 import socket
 from threading import Thread, Lock
-from typing import List
+
+from linereader import LineReader
+from members import Members
 
 
 class ServerSocket(Thread):
-    def __init__(self, host, port):
+    def __init__(self, host, port, backlog=10):
         super().__init__(daemon=True)  # 设置为守护线程
         self.HOST = host
         self.PORT = port
-        self.clients: List[ClientServer] = []
-        self.controller_stack = []
+        self.backlog = backlog
+        self.clients = Members()  # 按用户名与角色索引的成员，含控制者栈
         self.lock = Lock()  # 线程锁保护共享数据
 
     def run(self):
         ss = socket.socket()
         ss.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)  # 允许端口重用
         ss.bind((self.HOST, self.PORT))
-        ss.listen(10)
+        ss.listen(self.backlog)
         print("服务端已启动")
 
         while True:
@@ -27,33 +29,21 @@ class ServerSocket(Thread):
             except Exception as e:
                 print(f"接受连接时出错: {e}")
 
+    @property
+    def controller_stack(self):
+        return self.clients.stack
+
     def push(self, name: str):
         with self.lock:
-            if name in [c.name for c in self.clients]:
-                if (not self.controller_stack) or self.controller_stack[-1] != name:
-                    self.controller_stack.append(name)
+            self.clients.push(name)
 
     def pop(self):
         with self.lock:
-            if len(self.controller_stack) > 1:
-                self.controller_stack.pop()
-                if self.controller_stack[-1] not in [c.name for c in self.clients]:
-                    self._pop_internal()  # 递归检查
-            else:
-                self.controller_stack.clear()
-
-    def _pop_internal(self):
-        """内部递归弹出（已持有锁）"""
-        if len(self.controller_stack) > 1:
-            self.controller_stack.pop()
-            if self.controller_stack[-1] not in [c.name for c in self.clients]:
-                self._pop_internal()
-        else:
-            self.controller_stack.clear()
+            self.clients.pop()
 
     def top(self):
         with self.lock:
-            controller_name = self.controller_stack[-1] if self.controller_stack else ' '
+            controller_name = self.clients.top() or ' '
             for c in self.clients:
                 c.try_send('change_controller ' + controller_name)
 
@@ -63,6 +53,7 @@ class ClientServer(Thread):
         Thread.__init__(self, daemon=True)
         self.server = server
         self.socket = ss
+        self.reader = LineReader(ss)
         self.addr = addr
         self.type = 'unknown'
         self.name = ''
@@ -76,26 +67,8 @@ class ClientServer(Thread):
     def controller_stack(self):
         return self.server.controller_stack
 
-    def read(self, size: int):
-        buf = b''
-        while len(buf) < size:
-            data = self.socket.recv(size - len(buf))
-            if not data:
-                raise ConnectionError("连接已断开")
-            buf += data
-        return buf
-
-    def readline(self, size: int = 32 * 1024):
-        buf = b''
-        while len(buf) < size:
-            data = self.socket.recv(1)
-            if not data:
-                raise ConnectionError("连接已断开")
-            buf += data
-            if buf[-1] == 10:  # '\n'
-                break
-        buf = buf[:-1]
-        return buf.decode('utf8')
+    def readline(self):
+        return self.reader.readline()
 
     def run(self):
         try:
@@ -111,9 +84,8 @@ class ClientServer(Thread):
         """清理资源"""
         with self.server.lock:
             if self.controlling:
-                self.server._pop_internal()
-            if self in self.clients:
-                self.clients.remove(self)
+                self.clients.pop()
+            self.clients.remove(self)
         self.get_list()
         try:
             self.socket.close()
@@ -137,14 +109,16 @@ class ClientServer(Thread):
             return
 
         self.name = self.readline()
-        if not self.is_name_useable(self.name):
+        with self.server.lock:
+            useable = self.name not in self.clients  # 检查与加入在同一次加锁中完成
+            if useable:
+                self.clients.add(self)
+        if not useable:
             self.try_send("duplicate_name")
             print("拒绝重名用户加入：", self.name)
             return
             
         print(self.name, "已加入会议")
-        with self.server.lock:
-            self.clients.append(self)
         self.get_list()
 
         while True:
@@ -167,37 +141,33 @@ class ClientServer(Thread):
 
     def get_list(self):
         with self.server.lock:
-            member_list = 'member_list ' + ' '.join([c.name for c in self.clients])
+            member_list = 'member_list ' + ' '.join(self.clients.names)
             for c in self.clients:
                 c.try_send(member_list)
 
     def is_name_useable(self, name):
         with self.server.lock:
-            for c in self.clients:
-                if c.name == name:
-                    return False
-            return True
+            return name not in self.clients
 
     def exchange_control(self):
+        clients = self.clients
         with self.server.lock:
             if self.type == 'receiver':
                 print("接收者入栈")
-                self.server.push(self.name)
-                for c in self.clients:
-                    if c.type == 'controller':
-                        c.type = 'receiver'
-                self.type = 'controller'
+                clients.push(self.name)  # 已持有锁，不能再调用 server.push
+                for c in list(clients.controllers):
+                    clients.set_type(c, 'receiver')
+                clients.set_type(self, 'controller')
                 self.controlling = True
             elif self.type == 'controller':
                 print("控制者出栈")
-                self.server._pop_internal()
-                self.type = 'receiver'
+                clients.pop()
+                clients.set_type(self, 'receiver')
                 self.controlling = False
-                if self.controller_stack:
-                    for c in self.clients:
-                        if c.name == self.controller_stack[-1]:
-                            c.type = 'controller'
-                            c.controlling = True
+                c = clients.get(clients.top())
+                if c is not None:
+                    clients.set_type(c, 'controller')
+                    c.controlling = True
 
         self.server.top()
         print(self.controller_stack)
@@ -211,9 +181,8 @@ class ClientServer(Thread):
     def send_to_receiver(self, msg: str):
         print("搜索并发送给接收者...")
         with self.server.lock:
-            for c in self.clients:
-                if c.type == 'receiver':
-                    c.try_send(msg)
+            for c in self.clients.receivers:
+                c.try_send(msg)
 
     def send(self, data):
         if type(data) == str:
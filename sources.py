@@ -0,0 +1,465 @@
+import glob
+import json
+import os
+import platform
+import threading
+import time
+
+import cv2
+import numpy as np
+
+
+class FrameSource:
+    """帧来源接口，Identify 只通过它获取画面
+
+    接口沿用 cv2.VideoCapture 的 read/isOpened/release 习惯，read 返回
+    (success, BGR 图像)。来源耗尽后 isOpened 返回 False，识别循环随之结束。
+    """
+
+    capture_time = None  # 最近一帧的采集时间（time.perf_counter），None 表示即读即采
+    skipped = 0  # 最近一次 read 跳过的过期帧数
+
+    def open(self):
+        """打开来源，返回是否成功"""
+        return True
+
+    def read(self):
+        raise NotImplementedError
+
+    def isOpened(self):
+        return False
+
+    def release(self):
+        pass
+
+    def size(self):
+        """返回 (宽, 高)，未知时为 (0, 0)"""
+        return 0, 0
+
+
+CAMERA_CACHE = os.getenv("CAMERA_CACHE", os.path.join(os.path.dirname(os.path.abspath(__file__)), '.camera.json'))
+
+
+class CaptureProfile:
+    """摄像头采集参数：FOURCC、目标分辨率、帧率与驱动缓冲区大小
+
+    MJPG 在 USB 摄像头上可以用更高的分辨率/帧率传输，解码也比 YUYV 转换便宜；
+    缓冲区设为 1 时驱动只保留最新一帧，读到的画面不会滞后。
+    驱动不支持的设置会被忽略，实际协商结果以 open 后读回的值为准。
+    """
+
+    def __init__(self, fourcc='MJPG', width=640, height=480, fps=30, buffer_size=1):
+        self.fourcc = fourcc
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.buffer_size = buffer_size
+
+    @classmethod
+    def parse(cls, spec):
+        """解析 "MJPG:1280x720@30" 形式的描述，省略的部分使用默认值
+
+        也接受只有 FOURCC（"MJPG"）或只有分辨率、帧率（"1280x720"、"@60"）的写法，
+        无法解析时抛出 ValueError，说明正确格式。
+        """
+        profile = cls()
+        if not spec:
+            return profile
+        spec = spec.strip()
+        fourcc, sep, rest = spec.partition(':')
+        if not sep:
+            # 没有冒号：以数字或 @ 开头的是分辨率 / 帧率，否则是 FOURCC
+            fourcc, rest = ('', spec) if spec[:1].isdigit() or spec[:1] == '@' else (spec, '')
+        if fourcc and len(fourcc) != 4:
+            raise ValueError(f"摄像头参数 {spec!r} 中的 FOURCC 必须为 4 个字符，例如 MJPG、YUYV")
+        try:
+            size, _, fps = rest.partition('@')
+            if size:
+                width, height = (int(v) for v in size.lower().split('x'))
+                profile.width, profile.height = width, height
+            if fps:
+                profile.fps = float(fps)
+        except ValueError:
+            raise ValueError(f"无法解析摄像头参数 {spec!r}，格式为 FOURCC:宽x高@帧率，各部分可省略，"
+                             f"例如 MJPG、MJPG:1280x720@30、1280x720、@60") from None
+        if fourcc:
+            profile.fourcc = fourcc
+        return profile
+
+    def key(self):
+        return f"{self.fourcc}:{self.width}x{self.height}@{self.fps}"
+
+    def apply(self, cap, fourcc=None, width=None, height=None, fps=None):
+        """把参数写入 VideoCapture，缓存中已验证的值优先"""
+        fourcc = fourcc or self.fourcc
+        if fourcc:
+            cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+        if width or self.width:
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, width or self.width)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height or self.height)
+        if fps or self.fps:
+            cap.set(cv2.CAP_PROP_FPS, fps or self.fps)
+        if self.buffer_size:
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size)
+
+
+def _device_key(camera_id):
+    """把摄像头编号归一为物理设备：0 与 /dev/video0（或指向它的链接）是同一台设备"""
+    if isinstance(camera_id, str):
+        name = os.path.basename(os.path.realpath(camera_id))
+        if name.startswith('video') and name[5:].isdigit():
+            return int(name[5:])
+    return camera_id
+
+
+def _fourcc_name(cap):
+    code = int(cap.get(cv2.CAP_PROP_FOURCC))
+    name = ''.join(chr((code >> 8 * i) & 0xFF) for i in range(4))
+    return name if name.isprintable() else None
+
+
+class CameraSource(FrameSource):
+    """本机摄像头
+
+    上次成功的 (编号, 后端, 分辨率, FOURCC) 保存在 CAMERA_CACHE 中并最先尝试；
+    缓存失效时按物理设备分组并行探测：同一设备的不同写法（0 与 /dev/video0）和不同后端
+    在同一组内依次尝试，避免抢占设备。多个设备都能打开时按候选顺序选优先级最高的，
+    而不是最先打开的，与原来依次尝试 0、1、2 的结果一致。
+    """
+
+    def __init__(self, profile=None, cache_path=CAMERA_CACHE):
+        self.cap = None
+        if profile is None:
+            try:
+                profile = CaptureProfile.parse(os.getenv("CAMERA_PROFILE"))
+            except ValueError as e:
+                print(f"{e}，使用默认采集参数")
+                profile = CaptureProfile()
+        self.profile = profile
+        self.cache_path = cache_path
+        self.config = None  # 当前使用的配置，与缓存内容相同
+
+    def open(self):
+        """初始化摄像头，返回是否成功"""
+        print("正在初始化摄像头...")
+        start = time.perf_counter()
+        cached = self._load_cache()
+        if cached:
+            cap = self._try_open_camera(cached['camera_id'], cached['backend'], cached)
+            if cap is not None:
+                self.cap = cap
+                self._save_cache(cached['camera_id'], cached['backend'])
+                print(f"使用缓存的摄像头配置，用时 {time.perf_counter() - start:.2f}s")
+                return True
+            print("缓存的摄像头配置不可用，重新探测")
+
+        candidates = [(camera_id, backend) for camera_id in self._get_camera_ids()
+                      for backend in self._get_backend_candidates()
+                      if not cached or (camera_id, backend) != (cached['camera_id'], cached['backend'])]
+        found = self._probe(candidates)
+        if found is None:
+            print("所有摄像头初始化尝试均失败")
+            return False
+        camera_id, backend, self.cap = found
+        self._save_cache(camera_id, backend)
+        print(f"摄像头探测完成，用时 {time.perf_counter() - start:.2f}s")
+        return True
+
+    def _probe(self, candidates):
+        """按物理设备分组并行探测，返回成功者中候选顺序最靠前的 (编号, 后端, cap)
+
+        只需等优先级更高的组探测完毕；某组成功后，优先级更低的组不再尝试新的组合，
+        已经打开的随即释放。
+        """
+        groups = {}
+        for camera_id, backend in candidates:
+            groups.setdefault(_device_key(camera_id), []).append((camera_id, backend))
+        groups = list(groups.values())
+        results = [None] * len(groups)
+        done = [threading.Event() for _ in groups]
+        best = [len(groups)]  # 目前成功的最靠前的组
+        lock = threading.Lock()
+
+        def worker(index, items):
+            try:
+                for camera_id, backend in items:
+                    if best[0] < index:
+                        return  # 优先级更高的设备已经成功
+                    cap = self._try_open_camera(camera_id, backend)
+                    if cap is None:
+                        continue
+                    with lock:
+                        if best[0] > index:
+                            best[0] = index
+                            results[index] = (camera_id, backend, cap)
+                            return
+                    cap.release()
+                    return
+            finally:
+                done[index].set()
+
+        for index, items in enumerate(groups):
+            threading.Thread(target=worker, args=(index, items), daemon=True).start()
+        winner = None
+        for index in range(len(groups)):
+            done[index].wait()
+            if results[index] is not None:
+                winner = index
+                break
+        with lock:
+            for index, result in enumerate(results):
+                if result is not None and index != winner:
+                    result[2].release()  # 优先级更低但先打开的设备
+                    results[index] = None
+        return None if winner is None else results[winner]
+
+    def _load_cache(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return None
+        try:
+            with open(self.cache_path, encoding='utf8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if cached.get('profile') != self.profile.key():
+            return None  # 采集参数改变后重新协商
+        return cached
+
+    def _save_cache(self, camera_id, backend):
+        cap = self.cap
+        self.config = dict(camera_id=camera_id, backend=backend, profile=self.profile.key(),
+                           width=int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                           height=int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                           fps=cap.get(cv2.CAP_PROP_FPS), fourcc=_fourcc_name(cap))
+        print(f"摄像头配置: 编号 {camera_id}，后端 {backend}，{self.config['width']}x{self.config['height']}"
+              f" {self.config['fourcc']} {self.config['fps']:.0f}fps")
+        if not self.cache_path:
+            return
+        try:
+            with open(self.cache_path, 'w', encoding='utf8') as f:
+                json.dump(self.config, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"无法保存摄像头配置: {e}")
+
+    def _get_camera_ids(self):
+        env_ids = os.getenv("CAMERA_INDEX")
+        if env_ids:
+            try:
+                return [int(item.strip()) for item in env_ids.split(",") if item.strip() != ""]
+            except ValueError:
+                print("CAMERA_INDEX 无法解析，使用默认摄像头索引")
+        if platform.system() == 'Linux':
+            return [0, 1, 2, '/dev/video0']
+        return [0, 1, 2]
+
+    def _get_backend_candidates(self):
+        if platform.system() == 'Windows':
+            return [cv2.CAP_DSHOW, cv2.CAP_MSMF, cv2.CAP_ANY, None]
+        if platform.system() == 'Darwin':
+            return [cv2.CAP_AVFOUNDATION, cv2.CAP_ANY, None]
+        return [cv2.CAP_V4L2, cv2.CAP_ANY, None]
+
+    def _try_open_camera(self, camera_id, backend, cached=None):
+        """打开摄像头并协商采集参数，能读到帧时返回 cap，否则返回 None"""
+        cap = None
+        try:
+            backend_label = "default" if backend is None else backend
+            print(f"尝试打开摄像头: {camera_id}, 后端: {backend_label}")
+            if backend is None:
+                cap = cv2.VideoCapture(camera_id)
+            else:
+                cap = cv2.VideoCapture(camera_id, backend)
+
+            if not cap.isOpened():
+                print("摄像头无法打开")
+                cap.release()
+                return None
+
+            if cached:
+                self.profile.apply(cap, cached.get('fourcc'), cached.get('width'), cached.get('height'),
+                                   cached.get('fps'))
+            else:
+                self.profile.apply(cap)
+
+            for _ in range(5):
+                ret, frame = cap.read()
+                if ret and frame is not None:
+                    print(f"摄像头初始化成功！分辨率: {frame.shape[1]}x{frame.shape[0]}")
+                    return cap
+                time.sleep(0.1)
+
+            cap.release()
+            print("摄像头打开但无法读取帧")
+            return None
+
+        except Exception as e:
+            print(f"尝试失败: {e}")
+            if cap:
+                cap.release()
+            return None
+
+    def read(self):
+        return self.cap.read()
+
+    def isOpened(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    def release(self):
+        if self.cap:
+            self.cap.release()
+
+    def size(self):
+        return (int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+
+
+class _PacedSource(FrameSource):
+    """按帧率节流的来源基类，realtime 为 False 时尽快输出"""
+
+    def __init__(self, fps=None, realtime=False, loop=False):
+        self.fps = fps
+        self.realtime = realtime
+        self.loop = loop
+        self.opened = False
+        self.next_time = 0.0
+
+    def _pace(self):
+        if not self.realtime or not self.fps:
+            return
+        now = time.perf_counter()
+        if self.next_time > now:
+            time.sleep(self.next_time - now)
+        self.next_time = max(self.next_time, now) + 1.0 / self.fps
+
+    def isOpened(self):
+        return self.opened
+
+    def release(self):
+        self.opened = False
+
+
+class VideoFileSource(_PacedSource):
+    """视频文件来源，例如 videos/*.mkv 教程视频"""
+
+    def __init__(self, path, realtime=False, loop=False):
+        super().__init__(realtime=realtime, loop=loop)
+        self.path = path
+        self.cap = None
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.path)
+        self.opened = self.cap.isOpened()
+        if not self.opened:
+            print(f"无法打开视频文件: {self.path}")
+            return False
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30
+        self.next_time = 0.0
+        return True
+
+    def read(self):
+        self._pace()
+        success, frame = self.cap.read()
+        if not success and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            success, frame = self.cap.read()
+        if not success:
+            self.opened = False  # 播放结束
+        return success, frame
+
+    def release(self):
+        super().release()
+        if self.cap:
+            self.cap.release()
+
+    def size(self):
+        if self.cap is None:
+            return 0, 0
+        return (int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+
+
+class ImageDirSource(_PacedSource):
+    """图片序列来源，按文件名排序逐张读取"""
+
+    EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+    def __init__(self, directory, fps=30, realtime=False, loop=False):
+        super().__init__(fps=fps, realtime=realtime, loop=loop)
+        self.directory = directory
+        self.files = []
+        self.index = 0
+        self.shape = (0, 0)
+
+    def open(self):
+        self.files = sorted(f for f in glob.glob(os.path.join(self.directory, '*'))
+                            if f.lower().endswith(self.EXTENSIONS))
+        self.index = 0
+        self.opened = bool(self.files)
+        if not self.opened:
+            print(f"目录中没有图片: {self.directory}")
+            return False
+        first = cv2.imread(self.files[0])
+        if first is not None:
+            self.shape = (first.shape[1], first.shape[0])
+        return True
+
+    def read(self):
+        self._pace()
+        if self.index >= len(self.files):
+            if not self.loop:
+                self.opened = False
+                return False, None
+            self.index = 0
+        frame = cv2.imread(self.files[self.index])
+        self.index += 1
+        return frame is not None, frame
+
+    def size(self):
+        return self.shape
+
+
+class SyntheticSource(_PacedSource):
+    """合成画面来源：噪声背景上移动的色块，相同 seed 输出完全一致"""
+
+    def __init__(self, width=640, height=480, frames=300, fps=30, realtime=False, seed=0):
+        super().__init__(fps=fps, realtime=realtime)
+        self.width = width
+        self.height = height
+        self.frames = frames  # None 表示无限输出
+        self.seed = seed
+        self.count = 0
+        self.background = None
+
+    def open(self):
+        rng = np.random.default_rng(self.seed)
+        self.background = rng.integers(0, 64, (self.height, self.width, 3), dtype=np.uint8)
+        self.count = 0
+        self.opened = True
+        return True
+
+    def read(self):
+        self._pace()
+        if self.frames is not None and self.count >= self.frames:
+            self.opened = False
+            return False, None
+        frame = self.background.copy()
+        t = self.count / (self.fps or 30)
+        cx = int((0.5 + 0.35 * np.sin(t)) * self.width)
+        cy = int((0.5 + 0.35 * np.cos(0.7 * t)) * self.height)
+        cv2.circle(frame, (cx, cy), max(self.height // 8, 1), (80, 160, 220), -1)
+        self.count += 1
+        return True, frame
+
+    def size(self):
+        return self.width, self.height
+
+
+def make_source(spec, realtime=False, loop=False, profile=None):
+    """按描述创建帧来源：'camera'、'synthetic'、图片目录或视频文件路径"""
+    if spec is None or spec == 'camera':
+        return CameraSource(profile)
+    if spec == 'synthetic':
+        return SyntheticSource(realtime=realtime)
+    if os.path.isdir(spec):
+        return ImageDirSource(spec, realtime=realtime, loop=loop)
+    return VideoFileSource(spec, realtime=realtime, loop=loop)
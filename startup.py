@@ -0,0 +1,52 @@
+"""启动编排：窗口先显示，重组件在后台线程并行加载
+
+- model：导入 torch（numpy 后端不导入）、加载权重并预热一次推理；
+- detector：导入 MediaPipe、创建 Hands 并用空白帧预热。
+各任务完成时通过 progress 回调报告进度（GUI 中经信号转到主线程显示）。
+用户在加载完成前点击加入时，Identify.run 会等待正在进行的加载而不是重复加载。
+"""
+import threading
+import time
+
+TASK_LABELS = {'model': "模型", 'detector': "手部检测器"}
+
+
+class Startup:
+    def __init__(self, identify, progress=None):
+        self.identify = identify
+        self.progress = progress or print
+        self.tasks = {'model': identify.prepare_model, 'detector': identify.prepare_detector}
+        self.seconds = {}  # 各任务耗时
+        self.errors = {}
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+        self.start_time = None
+        self.total_seconds = None
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        self.progress(f"正在后台加载{'、'.join(TASK_LABELS[name] for name in self.tasks)}...")
+        for name, task in self.tasks.items():
+            threading.Thread(target=self._run, args=(name, task), daemon=True).start()
+        return self
+
+    def _run(self, name, task):
+        start = time.perf_counter()
+        try:
+            task()
+        except Exception as e:
+            self.errors[name] = e
+            self.progress(f"{TASK_LABELS[name]}加载失败: {e}")
+        with self.lock:
+            self.seconds[name] = time.perf_counter() - start
+            done = len(self.seconds)
+        if name not in self.errors:
+            self.progress(f"{TASK_LABELS[name]}就绪，用时 {self.seconds[name]:.2f}s（{done}/{len(self.tasks)}）")
+        if done == len(self.tasks):
+            self.total_seconds = time.perf_counter() - self.start_time
+            self.progress(f"启动完成，用时 {self.total_seconds:.2f}s" if not self.errors else "启动完成，部分组件加载失败")
+            self.ready.set()
+
+    def wait(self, timeout=None):
+        """等待全部任务结束，返回是否全部成功"""
+        return self.ready.wait(timeout) and not self.errors
@@ -0,0 +1,96 @@
+"""torch 模型变体：eager / TorchScript 冻结 / 动态 int8 量化
+
+- eager：GRU.load_model 加载的原始模型；
+- script：torch.jit.trace 后 freeze 的 TorchScript 模型；
+- int8：GRU 与 Linear 做动态 int8 量化后再 trace + freeze。
+导出文件与 model.pt 同目录（model.script.pt / model.int8.pt），附带的元数据记录
+model.pt 的 sha256 与 torch 版本，不一致时重新导出。变体只在 CPU 上运行。
+
+用法:
+    python variants.py                 # 导出全部变体
+    python -m benchmarks.bench_variants  # 在录制关键点上对比精度与单步延迟
+"""
+import argparse
+import json
+import os
+import warnings
+
+import torch
+import torch.nn as nn
+
+from GRU import load_model
+from numpy_gru import MODEL_PATH, file_hash
+
+VARIANTS = ('eager', 'script', 'int8')
+
+
+class CompiledModel:
+    """包装 TorchScript 模块，补上推理引擎需要的 in_dim / hidden_dim / num_layer"""
+
+    def __init__(self, module, meta):
+        self.module = module
+        self.in_dim = meta['in_dim']
+        self.hidden_dim = meta['hidden_dim']
+        self.num_layer = meta['num_layer']
+        self.num_classes = meta['num_classes']
+
+    def to(self, device):
+        if torch.device(device).type != 'cpu':
+            print("模型变体只支持 CPU，忽略设备设置")
+        return self
+
+    def __call__(self, inputs):
+        return self.module(inputs)
+
+
+def variant_path(variant, model_path=MODEL_PATH):
+    return f"{os.path.splitext(model_path)[0]}.{variant}.pt"
+
+
+def export_variant(variant, model_path=MODEL_PATH, path=None):
+    """导出 script 或 int8 变体，返回文件路径"""
+    if variant not in ('script', 'int8'):
+        raise ValueError(f"无法导出的模型变体: {variant}")
+    path = path or variant_path(variant, model_path)
+    model = load_model(model_path)
+    if variant == 'int8':
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            model = torch.ao.quantization.quantize_dynamic(model, {nn.GRU, nn.Linear}, dtype=torch.qint8)
+    meta = dict(variant=variant, in_dim=model.in_dim, hidden_dim=model.hidden_dim, num_layer=model.num_layer,
+                source_sha256=file_hash(model_path), torch=torch.__version__)
+    example = (torch.zeros(1, 1, model.in_dim), torch.zeros(model.num_layer, 1, model.hidden_dim))
+    with torch.no_grad(), warnings.catch_warnings():
+        warnings.simplefilter('ignore')  # batch_size = x.shape[0] 会触发 TracerWarning，trace 后批大小仍可变
+        module = torch.jit.freeze(torch.jit.trace(model, (example,)))
+        meta['num_classes'] = int(module(example)[0].shape[1])
+    torch.jit.save(module, path, _extra_files={'meta.json': json.dumps(meta)})
+    print(f"{variant} 变体已导出到 {path}")
+    return path
+
+
+def load_variant(variant='eager', model_path=MODEL_PATH):
+    """加载指定变体，变体文件缺失或过期时先导出"""
+    if variant == 'eager':
+        return load_model(model_path)
+    if variant not in VARIANTS:
+        raise ValueError(f"未知的模型变体: {variant}")
+    path = variant_path(variant, model_path)
+    if os.path.exists(path):
+        extra = {'meta.json': ''}
+        module = torch.jit.load(path, map_location='cpu', _extra_files=extra)
+        meta = json.loads(extra['meta.json'])
+        if meta['source_sha256'] == file_hash(model_path) and meta['torch'] == torch.__version__:
+            return CompiledModel(module, meta)
+        print(f"{path} 已过期，重新导出")
+    export_variant(variant, model_path, path)
+    return load_variant(variant, model_path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="导出 TorchScript 与 int8 模型变体")
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('variants', nargs='*', default=['script', 'int8'], help="script / int8，默认全部导出")
+    args = parser.parse_args()
+    for name in args.variants:
+        export_variant(name, args.model)
@@ -0,0 +1,125 @@
+"""安全的模型权重格式：纯 state_dict + JSON 头
+
+model.pt 是整体 pickle 的模块，加载时要执行任意 pickle 代码，且依赖 GRU 模块中的类。
+这里把权重拆成两个文件：
+    model.json      头信息：结构、in_dim、hidden_dim、num_layer、num_classes、类别顺序
+    model.state.pt  只含张量的 state_dict，用 torch.load(weights_only=True, mmap=True) 加载
+加载时按头信息构建 GRU / GRULegacy，再以 assign=True 直接使用内存映射的张量。
+mmap / assign 需要 torch 2.1 及以上，更早的版本退回普通加载（读入内存后拷贝进参数）。
+
+已加载的模型可能正映射着 model.state.pt，转换时两个文件都先写到同目录的临时目录，再用
+os.replace() 替换：旧文件的映射仍指向原来的内容，不会在推理途中被改写或截断。
+加载时只比较文件大小，完整的 sha256 校验用 verify=True（转换后的自检会这样做）。
+
+用法:
+    python weights.py              # 把 model.pt 转换为 model.json + model.state.pt
+"""
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import tempfile
+
+import torch
+
+from GRU import GRU, GRULegacy, load_model
+
+FORMAT_VERSION = 1
+HEADER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model.json')
+ARCHITECTURES = {'GRU': GRU, 'GRULegacy': GRULegacy}
+# torch 2.1 起 torch.load 支持 mmap、load_state_dict 支持 assign
+MMAP_LOAD = 'mmap' in inspect.signature(torch.load).parameters
+ASSIGN_STATE = 'assign' in inspect.signature(torch.nn.Module.load_state_dict).parameters
+
+
+def convert(model_path, header_path=HEADER_PATH, labels=None):
+    """把 pickle 的 model.pt 转换为 JSON 头 + state_dict，返回头信息"""
+    if labels is None:
+        from decision import MOVEMENT
+        labels = [MOVEMENT[i] for i in sorted(MOVEMENT)]
+    model = load_model(model_path)
+    state = {key: value.contiguous() for key, value in model.state_dict().items()}
+    weights_path = os.path.splitext(header_path)[0] + '.state.pt'
+    # 临时目录中的文件名与最终文件相同，torch.save 写入的归档名不变
+    staging = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(header_path)))
+    try:
+        staged_weights = os.path.join(staging, os.path.basename(weights_path))
+        torch.save(state, staged_weights)
+        with open(staged_weights, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        header = dict(
+            version=FORMAT_VERSION,
+            architecture=type(model).__name__,
+            in_dim=model.in_dim,
+            hidden_dim=model.hidden_dim,
+            num_layer=model.num_layer,
+            num_classes=len(labels),
+            labels=labels,
+            weights=os.path.basename(weights_path),
+            sha256=digest,
+            size=os.path.getsize(staged_weights),
+        )
+        staged_header = os.path.join(staging, os.path.basename(header_path))
+        with open(staged_header, 'w', encoding='utf8') as f:
+            json.dump(header, f, ensure_ascii=False, indent=2)
+        # 先替换权重再替换头，监视 model.json 的注册表看到新头时权重已经就位
+        os.replace(staged_weights, weights_path)
+        os.replace(staged_header, header_path)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    print(f"已转换为 {header_path} + {weights_path}")
+    return header
+
+
+def load_header(header_path=HEADER_PATH):
+    with open(header_path, encoding='utf8') as f:
+        header = json.load(f)
+    if header.get('version') != FORMAT_VERSION:
+        raise ValueError(f"不支持的权重格式版本: {header.get('version')}")
+    return header
+
+
+def load_weights(header_path=HEADER_PATH, device=None, mmap=True, verify=False):
+    """按头信息构建模型并加载 state_dict，不执行任何 pickle 代码
+
+    mmap=True 时参数直接使用内存映射的张量（需要 torch 2.1+），False 时读入模型自己的内存；
+    verify=True 时完整计算 sha256，否则只核对文件大小（旧的头信息没有大小时仍计算 sha256）。
+    """
+    header = load_header(header_path)
+    model = ARCHITECTURES[header['architecture']](header['in_dim'], header['hidden_dim'], header['num_layer'],
+                                                  header['num_classes'])
+    weights_path = os.path.join(os.path.dirname(os.path.abspath(header_path)), header['weights'])
+    if verify or 'size' not in header:
+        with open(weights_path, 'rb') as f:
+            consistent = hashlib.sha256(f.read()).hexdigest() == header['sha256']
+    else:
+        consistent = os.path.getsize(weights_path) == header['size']
+    if not consistent:
+        raise ValueError(f"权重文件与头信息不一致: {weights_path}")
+    if mmap and MMAP_LOAD and ASSIGN_STATE:
+        state = torch.load(weights_path, map_location='cpu', weights_only=True, mmap=True)
+        model.load_state_dict(state, assign=True)  # 直接使用内存映射的张量，不再拷贝
+    else:
+        model.load_state_dict(torch.load(weights_path, map_location='cpu', weights_only=True))
+    model.labels = header['labels']
+    model.eval()
+    if device is not None:
+        model = model.to(device)
+    return model
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="把 model.pt 转换为安全的 state_dict 格式")
+    parser.add_argument('model', nargs='?', default=os.path.join(os.path.dirname(HEADER_PATH), 'model.pt'))
+    parser.add_argument('-o', '--output', default=HEADER_PATH, help="JSON 头的输出路径")
+    args = parser.parse_args()
+
+    header = convert(args.model, args.output)
+    reference = load_model(args.model)
+    model = load_weights(args.output, verify=True)
+    x = (torch.randn(4, 8, header['in_dim']), torch.zeros(header['num_layer'], 4, header['hidden_dim']))
+    with torch.no_grad():
+        error = (reference(x)[0] - model(x)[0]).abs().max().item()
+    print(f"与 model.pt 输出最大误差: {error:.2e}")